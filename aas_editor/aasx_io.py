@@ -0,0 +1,452 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import codecs
+import io
+import itertools
+import json
+import logging
+import re
+import zipfile
+from typing import Callable, Dict, IO, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Type
+
+import pyecma376_2
+from basyx.aas import model
+from basyx.aas.adapter import aasx
+from basyx.aas.adapter.json import AASFromJsonDecoder, StrictAASFromJsonDecoder
+from basyx.aas.adapter.xml import AASFromXmlDecoder, StrictAASFromXmlDecoder
+from basyx.aas.adapter.xml.xml_serialization import NS_AAS
+from basyx.aas.util import traversal
+from lxml import etree
+
+from aas_editor.file_container import ZipSupplementaryFileContainer, CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+JSON_IDENTIFIABLE_LISTS = ("assetAdministrationShells", "assets", "submodels", "conceptDescriptions")
+
+
+def readAasXmlFileInto(objStore: model.AbstractObjectStore, file: IO,
+                       failsafe: bool = True) -> Set[model.Identifier]:
+    """
+    Read an AAS XML file into the object store. Unlike aasx.read_aas_xml_file() the document tree
+    is not built at once: every identifiable is constructed and added as soon as its element is parsed,
+    then the element is freed.
+    :return: identifiers of the added objects
+    """
+    decoder = AASFromXmlDecoder if failsafe else StrictAASFromXmlDecoder
+    return _addIdentifiables(objStore, iterXmlIdentifiables(file, decoder), failsafe)
+
+
+def readAasJsonFileInto(objStore: model.AbstractObjectStore, file: IO,
+                        failsafe: bool = True) -> Set[model.Identifier]:
+    """
+    Read an AAS JSON file into the object store. Unlike aasx.read_aas_json_file() the file is
+    read in chunks and every identifiable is decoded and added as soon as it is read completely.
+    :return: identifiers of the added objects
+    """
+    decoder = AASFromJsonDecoder if failsafe else StrictAASFromJsonDecoder
+    return _addIdentifiables(objStore, iterJsonIdentifiables(file, decoder), failsafe)
+
+
+def _addIdentifiables(objStore: model.AbstractObjectStore, objs: Iterable[model.Identifiable],
+                      failsafe: bool) -> Set[model.Identifier]:
+    added: Set[model.Identifier] = set()
+    for obj in objs:
+        if obj.identification in added or obj.identification in objStore:
+            errorMsg = f"{obj} has a duplicate identifier already parsed in the document!"
+            if not failsafe:
+                raise KeyError(errorMsg)
+            logger.error(errorMsg + " skipping it...")
+            continue
+        objStore.add(obj)
+        added.add(obj.identification)
+    return added
+
+
+def iterXmlIdentifiables(file: IO, decoder: Type[AASFromXmlDecoder] = AASFromXmlDecoder) \
+        -> Iterator[model.Identifiable]:
+    """Parse the AAS XML file incrementally and yield identifiables in the order of the document"""
+    constructors: Dict[str, Callable[..., model.Identifiable]] = {
+        NS_AAS + "assetAdministrationShell": decoder.construct_asset_administration_shell,
+        NS_AAS + "asset": decoder.construct_asset,
+        NS_AAS + "submodel": decoder.construct_submodel,
+        NS_AAS + "conceptDescription": decoder.construct_concept_description,
+    }
+    for _, element in etree.iterparse(file, events=("end",), tag=tuple(constructors),
+                                      remove_blank_text=True, remove_comments=True):
+        # only elements of the top-level lists, e.g. <aas:submodels><aas:submodel>
+        parent = element.getparent()
+        if parent is None or parent.tag != element.tag + "s" \
+                or parent.getparent() is None or parent.getparent().getparent() is not None:
+            continue
+        try:
+            yield constructors[element.tag](element)
+        except (KeyError, ValueError) as e:
+            if not decoder.failsafe:
+                raise
+            logger.error(f"{type(e).__name__}: Failed to construct {element.tag}: {e}")
+        finally:
+            # free the parsed element and the already constructed previous ones
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def iterJsonIdentifiables(file: IO, decoder: Type[AASFromJsonDecoder] = AASFromJsonDecoder) \
+        -> Iterator[model.Identifiable]:
+    """Parse the AAS JSON file incrementally and yield identifiables in the order of the document"""
+    reader = _JsonReader(file, decoder())
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in JSON_IDENTIFIABLE_LISTS and reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    obj = reader.value()
+                    if isinstance(obj, model.Identifiable):
+                        yield obj
+                    elif decoder.failsafe:
+                        logger.error(f"Expected an identifiable in list '{key}', but found {obj!r}")
+                    else:
+                        raise TypeError(f"Expected an identifiable in list '{key}', but found {obj!r}")
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            reader.value()
+        if reader.expect(",}") == "}":
+            break
+
+
+class _JsonReader:
+    """
+    Reads a JSON text chunk by chunk and decodes it value by value.
+    Only the currently decoded value is held in memory.
+    """
+    _NON_WHITESPACE = re.compile(r"\S")
+    _STRUCTURE = re.compile(r'[{}\[\]"]')
+    _STRING_END = re.compile(r'["\\]')
+    _SCALAR_END = re.compile(r"[,}\]\s]")
+
+    def __init__(self, file: IO, decoder: json.JSONDecoder):
+        self._file = file
+        self._decoder = decoder
+        self._textDecoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer and drop the consumed text, return False at the end of file"""
+        chunk = self._file.read(CHUNK_SIZE)
+        if isinstance(chunk, bytes):
+            chunk = self._textDecoder.decode(chunk, final=not chunk)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it or '' at the end of file"""
+        while True:
+            match = self._NON_WHITESPACE.search(self._buffer, self._pos)
+            if match:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be one of the given ones"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise self._error(f"Expecting one of {chars!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode the next JSON value"""
+        if not self.peek():
+            raise self._error("Expecting value")
+        end = self._valueEnd()
+        value, valueEnd = self._decoder.raw_decode(self._buffer, self._pos)
+        if valueEnd != end:
+            self._pos = valueEnd
+            raise self._error("Unexpected data after value")
+        self._pos = end
+        return value
+
+    def _valueEnd(self) -> int:
+        """Return the end index of the value at the current position, read further chunks if needed"""
+        # offset is relative to self._pos, as _fill() drops the text before it
+        offset = 0
+        if self._buffer[self._pos] not in '{["':
+            while True:
+                match = self._SCALAR_END.search(self._buffer, self._pos + offset)
+                if match:
+                    return match.start()
+                offset = len(self._buffer) - self._pos
+                if not self._fill():
+                    return len(self._buffer)
+
+        depth = 0
+        inString = False
+        while True:
+            regex = self._STRING_END if inString else self._STRUCTURE
+            match = regex.search(self._buffer, self._pos + offset)
+            if match is None:
+                offset = len(self._buffer) - self._pos
+                if not self._fill():
+                    raise self._error("Unexpected end of file")
+                continue
+            char = match.group()
+            end = match.end()
+            if inString:
+                if char == "\\":
+                    if end == len(self._buffer):
+                        # the escaped character is in the next chunk
+                        offset = match.start() - self._pos
+                        if not self._fill():
+                            raise self._error("Unexpected end of file")
+                        continue
+                    end += 1
+                else:
+                    inString = False
+            elif char == '"':
+                inString = True
+            elif char in "{[":
+                depth += 1
+            else:
+                depth -= 1
+            offset = end - self._pos
+            if depth == 0 and not inString:
+                return end
+
+
+def _isPackageFile(fileName: Optional[str]) -> bool:
+    """Return True if the value of a File element refers to a file in the AASX package"""
+    # absolute URIs and network-path references don't refer to files in the package
+    return fileName is not None and not fileName.startswith('//') and ':' not in fileName.split('/')[0]
+
+
+def supplementaryFilesOf(submodel: model.Submodel) -> List[str]:
+    """Return names of the files in the AASX package referenced by File elements of the submodel"""
+    return [element.value for element in traversal.walk_submodel(submodel)
+            if isinstance(element, model.File) and _isPackageFile(element.value)]
+
+
+def readArchivePart(fileStore: ZipSupplementaryFileContainer, partName: str) -> model.DictObjectStore:
+    """
+    Parse the part of the archive of the file store. Like in AASXReader relative paths
+    of the File elements are resolved, so that the objects equal the objects read with AASXReader.
+    :raise KeyError if the archive has no part with the name
+    """
+    zipInfo = fileStore.archiveMember(partName)
+    if zipInfo is None:
+        raise KeyError(f"Part not found in {fileStore.archive}: {partName}")
+    objects = model.DictObjectStore()
+    with fileStore.openMember(zipInfo) as p:
+        if partName.lower().endswith(".json"):
+            readAasJsonFileInto(objects, p)
+        else:
+            readAasXmlFileInto(objects, p)
+    for obj in objects:
+        if not isinstance(obj, model.Submodel):
+            continue
+        for element in traversal.walk_submodel(obj):
+            if isinstance(element, model.File) and _isPackageFile(element.value):
+                element.value = pyecma376_2.package_model.part_realpath(element.value, partName)
+    return objects
+
+
+class RawPart(NamedTuple):
+    """Unchanged split part of the source archive, which is copied as it is"""
+    name: str
+    # names of the supplementary files referenced by the object of the part
+    supplementaryFiles: Tuple[str, ...]
+
+
+class PartRecordingAASXReader(aasx.AASXReader):
+    """AASXReader which remembers which objects were read from which part"""
+
+    def __init__(self, file):
+        super(PartRecordingAASXReader, self).__init__(file)
+        # part name -> objects parsed from the part
+        self.objectsOfParts: Dict[str, Tuple[model.Identifiable, ...]] = {}
+
+    def _parse_aas_part(self, part_name: str) -> model.DictObjectStore:
+        """Same as AASXReader._parse_aas_part() but parses the part incrementally"""
+        objects = model.DictObjectStore()
+        content_type = self.reader.get_content_type(part_name)
+        extension = part_name.split("/")[-1].split(".")[-1]
+        if content_type.split(";")[0] in ("text/xml", "application/xml") or content_type == "" and extension == "xml":
+            with self.reader.open_part(part_name) as p:
+                readAasXmlFileInto(objects, p)
+        elif content_type.split(";")[0] in ("text/json", "application/json") \
+                or content_type == "" and extension == "json":
+            with self.reader.open_part(part_name) as p:
+                readAasJsonFileInto(objects, p)
+        else:
+            logger.error("Could not determine part format of AASX part {} (Content Type: {}, extension: {}"
+                         .format(part_name, content_type, extension))
+        self.objectsOfParts[part_name] = tuple(objects)
+        return objects
+
+
+class IncrementalAASXWriter(aasx.AASXWriter):
+    """
+    AASXWriter which copies unchanged submodel split parts and supplementary files
+    compressed as they are from the source archive instead of serializing and
+    compressing them again.
+    """
+
+    # internals of AASXWriter which are updated for copied parts
+    WRITER_INTERNALS = ("_aas_part_names", "_supplementary_part_names")
+
+    def __init__(self, file, rawPartOf: Callable[[model.Identifier], Optional[RawPart]],
+                 progress: Optional[Callable[[int], None]] = None):
+        """
+        :param rawPartOf: callback returning the unchanged archive part of the object with the given identifier
+                          or None if the object was changed since it was read
+        :param progress: callback getting the number of written objects
+        """
+        super(IncrementalAASXWriter, self).__init__(file)
+        # parts are only copied if the SDK writer keeps its part names as expected, otherwise it is used as it is
+        self.incremental = all(hasattr(self, attr) for attr in self.WRITER_INTERNALS)
+        self.rawPartOf = rawPartOf
+        self.progress = progress
+        self.numOfWrittenObjects = 0
+        # split part name -> identifier of the object written to the part
+        self.splitParts: Dict[str, model.Identifier] = {}
+        self.numOfCopiedParts = 0
+
+    def write_aas_objects(self,
+                          part_name: str,
+                          object_ids: Iterable[model.Identifier],
+                          object_store: model.AbstractObjectStore,
+                          file_store: aasx.AbstractSupplementaryFileContainer,
+                          write_json: bool = False,
+                          split_part: bool = False,
+                          additional_relationships: Iterable[pyecma376_2.OPCRelationship] = ()) -> None:
+        """Same as AASXWriter.write_aas_objects() but reuses unchanged parts of the source archive"""
+        object_ids = list(object_ids)
+        if not self.incremental:
+            super(IncrementalAASXWriter, self).write_aas_objects(part_name, object_ids, object_store, file_store,
+                                                                 write_json, split_part, additional_relationships)
+            self.numOfWrittenObjects += len(object_ids)
+            if self.progress:
+                self.progress(self.numOfWrittenObjects)
+            return
+        objects: List[model.Identifiable] = []
+        supplementary_files: List[str] = []
+
+        if not split_part:
+            self._aas_part_names.append(part_name)
+
+        content_type = "application/json" if write_json else "application/xml"
+        sourcePart = self._sourcePart(part_name, object_ids, file_store) if split_part else None
+        if sourcePart is not None:
+            # copy the part without retrieving its object
+            zipInfo, rawPart = sourcePart
+            self._addContentType(part_name, content_type)
+            file_store.copyMember(zipInfo, self.writer, part_name.lstrip("/"))
+            self.numOfCopiedParts += 1
+            supplementary_files.extend(rawPart.supplementaryFiles)
+            numOfObjects = 1
+        else:
+            # Retrieve objects and scan for referenced supplementary files
+            for identifier in object_ids:
+                try:
+                    the_object = object_store.get_identifiable(identifier)
+                except KeyError:
+                    logger.error("Could not find object {} in ObjectStore".format(identifier))
+                    continue
+                objects.append(the_object)
+                if isinstance(the_object, model.Submodel):
+                    supplementary_files.extend(supplementaryFilesOf(the_object))
+
+            # Write part
+            with self.writer.open_part(part_name, content_type) as p:
+                if write_json:
+                    aasx.write_aas_json_file(io.TextIOWrapper(p, encoding='utf-8'), model.DictObjectStore(objects))
+                else:
+                    aasx.write_aas_xml_file(p, model.DictObjectStore(objects))
+            numOfObjects = len(objects)
+        if split_part and numOfObjects == 1:
+            self.splitParts[part_name] = object_ids[0]
+        self.numOfWrittenObjects += numOfObjects
+        if self.progress:
+            self.progress(self.numOfWrittenObjects)
+
+        # Write submodel's supplementary files to AASX file
+        supplementary_file_names = []
+        for file_name in supplementary_files:
+            try:
+                content_type = file_store.get_content_type(file_name)
+                hash = file_store.get_sha256(file_name)
+            except KeyError:
+                logger.warning("Could not find file {} in file store.".format(file_name))
+                continue
+            if self._supplementary_part_names.get(file_name) == hash:
+                continue
+            elif file_name in self._supplementary_part_names:
+                logger.error("Trying to write supplementary file {} to AASX twice with different contents"
+                             .format(file_name))
+            self._writeSupplementaryFile(file_name, content_type, file_store)
+            supplementary_file_names.append(pyecma376_2.package_model.normalize_part_name(file_name))
+            self._supplementary_part_names[file_name] = hash
+
+        # Add relationships from submodel to supplementary parts
+        self.writer.write_relationships(
+            itertools.chain(
+                (pyecma376_2.OPCRelationship("r{}".format(i),
+                                             aasx.RELATIONSHIP_TYPE_AAS_SUPL,
+                                             submodel_file_name,
+                                             pyecma376_2.OPCTargetMode.INTERNAL)
+                 for i, submodel_file_name in enumerate(supplementary_file_names)),
+                additional_relationships),
+            part_name)
+
+    def _sourcePart(self, partName: str, objectIds: List[model.Identifier], fileStore) \
+            -> Optional[Tuple[zipfile.ZipInfo, RawPart]]:
+        """Return zip entry and raw part of the source archive which can be copied to the given part"""
+        if len(objectIds) != 1 or not isinstance(fileStore, ZipSupplementaryFileContainer):
+            return None
+        rawPart = self.rawPartOf(objectIds[0])
+        # the part must have the same name, so that relative file paths in it stay valid
+        if rawPart is None or rawPart.name != partName:
+            return None
+        zipInfo = fileStore.archiveMember(partName)
+        return (zipInfo, rawPart) if zipInfo is not None else None
+
+    def _writeSupplementaryFile(self, name: str, contentType: str, fileStore):
+        if isinstance(fileStore, ZipSupplementaryFileContainer):
+            self._addContentType(name, contentType)
+            if fileStore.copyFile(name, self.writer):
+                self.numOfCopiedParts += 1
+                return
+        with self.writer.open_part(name, contentType) as p:
+            fileStore.write_file(name, p)
+
+    def _addContentType(self, name: str, contentType: str):
+        """Register content type of a part which is not written via open_part()"""
+        pyecma376_2.package_model.check_part_name(name)
+        if self.writer.content_types.get_content_type(name) != contentType:
+            self.writer.content_types.overrides[name] = contentType
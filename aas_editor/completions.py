@@ -0,0 +1,168 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt, QVariant, QAbstractItemModel, QObject
+from PyQt5.QtWidgets import QCompleter
+from basyx.aas.model import Identifiable, Key
+
+from aas_editor.package import Package
+from aas_editor.settings import DEFAULT_COMPLETIONS
+
+
+def _sortKey(completion: str) -> Tuple[str, str]:
+    return completion.lower(), completion
+
+
+class CompletionModel(QAbstractListModel):
+    """
+    Case insensitively sorted list of unique completions, which is shared by the completers of editors.
+    Completions are counted and only removed after they were removed as often as added.
+    """
+    # number of added or removed completions from which the model is rebuilt instead of changed row by row
+    BULK_SIZE = 100
+
+    def __init__(self, parent: QObject = None):
+        super(CompletionModel, self).__init__(parent)
+        self._completions: List[str] = []
+        self._sortKeys: List[Tuple[str, str]] = []
+        self._counts: Dict[str, int] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._completions)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self._completions[index.row()]
+        return QVariant()
+
+    def __contains__(self, completion: str) -> bool:
+        return completion in self._counts
+
+    def add(self, completions: Iterable[str]):
+        newCompletions = []
+        for completion in completions:
+            if completion in self._counts:
+                self._counts[completion] += 1
+            else:
+                self._counts[completion] = 1
+                newCompletions.append(completion)
+
+        if len(newCompletions) > self.BULK_SIZE:
+            self._rebuild(self._completions + newCompletions)
+            return
+        for completion in newCompletions:
+            sortKey = _sortKey(completion)
+            row = bisect_left(self._sortKeys, sortKey)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._completions.insert(row, completion)
+            self._sortKeys.insert(row, sortKey)
+            self.endInsertRows()
+
+    def remove(self, completions: Iterable[str]):
+        removedCompletions = []
+        for completion in completions:
+            count = self._counts.get(completion, 0)
+            if count > 1:
+                self._counts[completion] = count - 1
+            elif count == 1:
+                del self._counts[completion]
+                removedCompletions.append(completion)
+
+        if len(removedCompletions) > self.BULK_SIZE:
+            self._rebuild(completion for completion in self._completions if completion in self._counts)
+            return
+        for completion in removedCompletions:
+            row = bisect_left(self._sortKeys, _sortKey(completion))
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._completions[row]
+            del self._sortKeys[row]
+            self.endRemoveRows()
+
+    def _rebuild(self, completions: Iterable[str]):
+        self.beginResetModel()
+        self._completions = sorted(completions, key=_sortKey)
+        self._sortKeys = [_sortKey(completion) for completion in self._completions]
+        self.endResetModel()
+
+
+class IdentifierCompletions:
+    """Identifiers of the identifiables of the opened packages, served by one shared CompletionModel"""
+
+    def __init__(self):
+        self.model = CompletionModel()
+        self._packageIds: Dict[Package, Counter] = {}
+
+    def addPackage(self, package: Package):
+        if package in self._packageIds:
+            return
+        ids = Counter(obj.identification.id for obj in package.objStore)
+        self._packageIds[package] = ids
+        package.addIdentifierChangesConsumer(self)
+        self.model.add(ids.elements())
+
+    def removePackage(self, package: Package):
+        ids = self._packageIds.pop(package, None)
+        package.removeIdentifierChangesConsumer(self)
+        if ids:
+            self.model.remove(ids.elements())
+
+    def addObject(self, package: Package, obj: Identifiable):
+        self._change(package, added=(obj.identification.id,))
+
+    def removeObject(self, package: Package, obj: Identifiable):
+        self._change(package, removed=(obj.identification.id,))
+
+    def updateIdentifiers(self, package: Package):
+        """Apply the identifier changes logged in the package since the last update"""
+        if package not in self._packageIds:
+            return
+        changes = package.takeIdentifierChanges(self)
+        self._change(package,
+                     added=[change.newIdentifier.id for change in changes],
+                     removed=[change.oldIdentifier.id for change in changes])
+
+    def _change(self, package: Package, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        ids = self._packageIds.get(package)
+        if ids is None:
+            return
+        added = list(added)
+        ids.update(added)
+        removedIds = []
+        for identifier in removed:
+            if ids[identifier] > 0:
+                ids[identifier] -= 1
+                removedIds.append(identifier)
+            if ids[identifier] <= 0:
+                del ids[identifier]
+        self.model.add(added)
+        self.model.remove(removedIds)
+
+
+IDENTIFIER_COMPLETIONS = IdentifierCompletions()
+
+
+def completionsFor(objType, attr: str) -> Union[List[str], QAbstractItemModel]:
+    """Return completions for the attribute of the object type"""
+    if objType is Key and attr == "value":
+        return IDENTIFIER_COMPLETIONS.model
+    return DEFAULT_COMPLETIONS.get(objType, {}).get(attr, [])
+
+
+def createCompleter(completions: Union[List[str], QAbstractItemModel], parent: QObject) -> QCompleter:
+    """Return case insensitive completer, shared completion models are used without copying them"""
+    completer = QCompleter(completions, parent)
+    completer.setCaseSensitivity(Qt.CaseInsensitive)
+    if isinstance(completions, CompletionModel):
+        completer.setModelSorting(QCompleter.CaseInsensitivelySortedModel)
+    return completer
@@ -21,7 +21,7 @@ from basyx.aas.model.base import *
 from basyx.aas.model.concept import *
 from basyx.aas.model.submodel import *
 
-from aas_editor.settings import DEFAULT_COMPLETIONS
+from aas_editor.completions import completionsFor, createCompleter
 from aas_editor.utils.util import inheritors
 from aas_editor.additional.classes import DictItem
 from aas_editor.utils.util_type import issubtype, getTypeName, isoftype
@@ -82,11 +82,9 @@ class EditDelegate(ColorDelegate):
             widget = QCheckBox(parent)
         elif issubtype(objType, str):
             widget = LineEdit(parent)
-            completions = DEFAULT_COMPLETIONS.get(objType, {}).get(attr, [])
+            completions = completionsFor(objType, attr)
             if completions:
-                completer = QCompleter(parent, completions=completions)
-                completer.setCaseSensitivity(Qt.CaseInsensitive)
-                widget.setCompleter(completer)
+                widget.setCompleter(createCompleter(completions, parent))
         elif issubtype(objType, int):
             widget = LineEdit(parent)
             widget.setValidator(QIntValidator())
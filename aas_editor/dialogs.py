@@ -21,7 +21,8 @@ from PyQt5.QtGui import QPaintEvent, QPixmap
 from PyQt5.QtWidgets import QPushButton, QDialog, QDialogButtonBox, \
     QGroupBox, QWidget, QVBoxLayout, QMessageBox, QScrollArea, QFrame, QFormLayout
 
-from aas_editor.settings import DEFAULTS, DEFAULT_COMPLETIONS, ATTRIBUTE_COLUMN, OBJECT_ROLE, \
+from aas_editor.completions import completionsFor
+from aas_editor.settings import DEFAULTS, ATTRIBUTE_COLUMN, OBJECT_ROLE, \
     APPLICATION_NAME, CONTRIBUTORS, CONTACT, COPYRIGHT_YEAR, VERSION, DEFAULT_INHERITOR, APPLICATION_INFO, \
     DEVELOPER_WEB, APPLICATION_LINK, LICENSE
 from aas_editor.utils.util import inheritors, getReqParams4init, getParams4init, getDefaultVal, \
@@ -330,7 +331,7 @@ class ObjGroupBox(GroupBox):
     def initLayout(self):
         if self.reqParamsDict:
             for param in self.reqParamsDict:
-                self.kwargs["completions"] = DEFAULT_COMPLETIONS.get(self.objTypeHint, {}).get(param, [])
+                self.kwargs["completions"] = completionsFor(self.objTypeHint, param)
                 val = self.getVal4param(param)
                 widget = self.getInitialInputWidget(param, val, **self.kwargs)
                 self.insertInputWidget(widget, param)
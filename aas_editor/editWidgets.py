@@ -23,6 +23,7 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout, QDateTimeEdit, QCheckBox, QCom
     QDateEdit, QSpinBox, QHBoxLayout, QPlainTextEdit, QPushButton, QFileDialog
 from basyx.aas.model.datatypes import Date
 
+from aas_editor.completions import createCompleter
 from aas_editor.utils.util import inheritors
 from aas_editor.utils.util_classes import PreObject
 from aas_editor.utils.util_type import issubtype, getTypeName, isoftype
@@ -243,9 +244,7 @@ class StandardInputWidget(QWidget):
         elif issubtype(self.objType, str):
             widget = widgets.LineEdit(self)
             if kwargs.get("completions"):
-                completer = QCompleter(kwargs["completions"], self)
-                completer.setCaseSensitivity(Qt.CaseInsensitive)
-                widget.setCompleter(completer)
+                widget.setCompleter(createCompleter(kwargs["completions"], self))
         elif issubtype(self.objType, int):
             widget = widgets.LineEdit(self)
             if self.useValidators:
@@ -17,6 +17,7 @@ from aas_editor.settings.app_settings import *
 from aas_editor.settings.icons import APP_ICON, EXIT_ICON, SETTINGS_ICON
 from aas_editor.settings_dialog import SettingsDialog
 from aas_editor.widgets.compliance_tool import ComplianceToolDialog
+from aas_editor.widgets.type_validation import TypeValidationDialog
 from aas_editor.widgets import AddressLine
 from aas_editor import design
 from aas_editor.models import DetailedInfoTable, PacksTable
@@ -58,6 +59,10 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
                                       statusTip="Open compliance tool",
                                       triggered=lambda: ComplianceToolDialog(self).exec())
 
+        self.typeValidationAct = QAction("Type validation", self,
+                                         statusTip="Show type violations in the package of the selected item",
+                                         triggered=lambda: self.showTypeValidation())
+
         self.importToolAct = QAction("Table import tool", self,
                                       statusTip="Switch to table import mode",
                                       triggered=lambda: self.showImportApp())
@@ -81,6 +86,13 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
                                           statusTip=f"Set vertical orientation",
                                           triggered=lambda: self.setOrientation(QtCore.Qt.Vertical))
 
+    def showTypeValidation(self):
+        package = self.mainTreeView.currentIndex().data(PACKAGE_ROLE)
+        if package is None:
+            QMessageBox.information(self, "Type validation", "Select an item of the package to validate")
+            return
+        TypeValidationDialog(package, self.mainTreeView, self.mainTabWidget, parent=self).show()
+
     def showImportApp(self):
         from aas_editor.importApp import ImportApp
         ImportApp(parent=self).show()
@@ -143,6 +155,7 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
 
         self.menuTools = QMenu("&Tools", self.menubar)
         self.menuTools.addAction(self.complToolDialogAct)
+        self.menuTools.addAction(self.typeValidationAct)
         self.menuTools.addAction(self.importToolAct)
 
         self.menuHelp = QMenu("&Help", self.menubar)
@@ -236,6 +249,8 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
             self.currTheme = theme
 
     def closeEvent(self, a0: QCloseEvent) -> None:
+        self.mainTreeView.cancelLoading()
+        self.mainTreeView.waitForSaving()
         if not self.packTreeModel.openedFiles():
             self.writeSettings()
             a0.accept()
@@ -247,6 +262,7 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
 
             if reply == QMessageBox.Yes:
                 self.mainTreeView.saveAll()
+                self.mainTreeView.waitForSaving()
                 self.writeSettings()
                 a0.accept()
             elif reply == QMessageBox.No:
@@ -281,11 +297,8 @@ class EditorApp(QMainWindow, design.Ui_MainWindow):
         # try to open previously opened files
         openedAasFiles = AppSettings.OPENED_AAS_FILES.value()
         for file in openedAasFiles:
-            try:
-                self.mainTreeView.openPack(file)
-            except OSError:
-                pass
-            self.packTreeModel.setData(QModelIndex(), [], UNDO_ROLE)
+            # packages are added in background, undo must not close them
+            self.mainTreeView.openPack(file, undoable=False)
 
         # set previous tree states
         packTreeViewHeader = self.mainTreeView.header()
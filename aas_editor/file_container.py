@@ -0,0 +1,443 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import hashlib
+import io
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import weakref
+import zipfile
+from pathlib import Path
+from typing import Dict, IO, Iterator, List, NamedTuple, Optional, Union
+
+from basyx.aas.adapter.aasx import AbstractSupplementaryFileContainer
+
+CHUNK_SIZE = 1024 * 1024
+
+# local file header of a zip entry, see zipfile.structFileHeader
+_LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+_LOCAL_FILE_HEADER_NAME_LENGTH = 10
+_LOCAL_FILE_HEADER_EXTRA_LENGTH = 11
+# internals of ZipFile which are used to append compressed data as it is, see ZipFile.writestr()
+_RAW_COPY_ATTRS = ("_lock", "_writing", "_writecheck", "_didModify", "fp", "start_dir", "filelist", "NameToInfo")
+
+
+def rawCopySupported(dst: zipfile.ZipFile) -> bool:
+    """Return True if the ZipFile implementation has the internals needed by copyRawMember()"""
+    return all(hasattr(dst, attr) for attr in _RAW_COPY_ATTRS)
+
+
+def copyRawMember(src: IO[bytes], srcInfo: zipfile.ZipInfo, dst: zipfile.ZipFile, name: str):
+    """
+    Copy the compressed data of a zip entry into another zip file without decompressing
+    and compressing it again
+    :param src: binary file object of the source zip archive
+    :param srcInfo: zip entry of the source archive
+    :param dst: zip file opened for writing
+    :param name: name of the new zip entry
+    :raise ValueError if the entry is encrypted or dst has an open writing handle
+    :raise NotImplementedError if the ZipFile implementation is not supported, see rawCopySupported()
+    """
+    if not rawCopySupported(dst):
+        raise NotImplementedError("Zip entries can't be copied with this version of zipfile")
+    if srcInfo.flag_bits & 0x1:
+        raise ValueError(f"Encrypted zip entry can't be copied: {srcInfo.filename}")
+
+    src.seek(srcInfo.header_offset)
+    header = _LOCAL_FILE_HEADER.unpack(src.read(_LOCAL_FILE_HEADER.size))
+    src.seek(header[_LOCAL_FILE_HEADER_NAME_LENGTH] + header[_LOCAL_FILE_HEADER_EXTRA_LENGTH], io.SEEK_CUR)
+
+    zipInfo = zipfile.ZipInfo(name, date_time=srcInfo.date_time)
+    zipInfo.compress_type = srcInfo.compress_type
+    zipInfo.external_attr = srcInfo.external_attr
+    zipInfo.CRC = srcInfo.CRC
+    zipInfo.compress_size = srcInfo.compress_size
+    zipInfo.file_size = srcInfo.file_size
+    zip64 = zipInfo.file_size > zipfile.ZIP64_LIMIT or zipInfo.compress_size > zipfile.ZIP64_LIMIT
+
+    # same steps as in ZipFile.writestr(), but the data is written as it is
+    with dst._lock:
+        if dst._writing:
+            raise ValueError("Can't copy to zip file while there is an open writing handle on it")
+        dst._writecheck(zipInfo)
+        dst._didModify = True
+        dst.fp.seek(dst.start_dir)
+        zipInfo.header_offset = dst.fp.tell()
+        dst.fp.write(zipInfo.FileHeader(zip64))
+        remaining = zipInfo.compress_size
+        while remaining:
+            chunk = src.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                raise EOFError(f"Unexpected end of zip entry: {srcInfo.filename}")
+            dst.fp.write(chunk)
+            remaining -= len(chunk)
+        dst.start_dir = dst.fp.tell()
+        dst.filelist.append(zipInfo)
+        dst.NameToInfo[zipInfo.filename] = zipInfo
+
+
+class FileIndexEntry(NamedTuple):
+    name: str
+    contentType: str
+    # name of the zip entry for files of the archive
+    zipName: Optional[str]
+    sha: Optional[bytes]
+    # content for files held in memory
+    data: Optional[bytes]
+    # number of added files the file is stored for
+    refs: int = 1
+
+
+class _MemoryPart:
+    """Supplementary file held in memory"""
+    def __init__(self, data: bytes, contentType: str):
+        self.data = data
+        self.contentType = contentType
+        self.sha = hashlib.sha256(data).digest()
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def open(self) -> IO[bytes]:
+        return io.BytesIO(self.data)
+
+
+class _TempPart:
+    """Supplementary file spilled into a temporary file, which is deleted with the part"""
+    def __init__(self, file: IO[bytes], contentType: str, sha: Optional[bytes] = None):
+        self.contentType = contentType
+        fd, self.path = tempfile.mkstemp(prefix="aas_editor_")
+        sha256 = hashlib.sha256()
+        with os.fdopen(fd, "wb") as tempFile:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+                tempFile.write(chunk)
+        self.sha = sha if sha is not None else sha256.digest()
+        self.size = os.path.getsize(self.path)
+        weakref.finalize(self, os.remove, self.path)
+
+    @property
+    def data(self) -> bytes:
+        with self.open() as f:
+            return f.read()
+
+    def open(self) -> IO[bytes]:
+        return open(self.path, "rb")
+
+
+class _ZipPart:
+    """Supplementary file which stays in the zip archive and is read on demand"""
+    def __init__(self, container: 'ZipSupplementaryFileContainer', zipInfo: zipfile.ZipInfo, contentType: str):
+        self.container = container
+        self.zipInfo = zipInfo
+        self.contentType = contentType
+        self._sha = None
+
+    @property
+    def sha(self) -> bytes:
+        if self._sha is None:
+            sha = hashlib.sha256()
+            with self.open() as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    sha.update(chunk)
+            self._sha = sha.digest()
+        return self._sha
+
+    @property
+    def size(self) -> int:
+        return self.zipInfo.file_size
+
+    def open(self) -> IO[bytes]:
+        return self.container.openMember(self.zipInfo)
+
+
+class ZipSupplementaryFileContainer(AbstractSupplementaryFileContainer):
+    """
+    SupplementaryFileContainer which doesn't copy files of an AASX package into memory.
+    For files of the archive only their zip entries (offsets, sizes) are stored and
+    the contents are read or streamed when needed. Files added from other
+    sources are held in memory.
+    Added files with the same content as a stored file are not stored again,
+    the name of the stored file is returned instead. Such a file is only deleted
+    if it was deleted as often as it was added.
+    """
+
+    def __init__(self, archive: Union[str, Path, None] = None):
+        self._parts: Dict[str, Union[_MemoryPart, _TempPart, _ZipPart]] = {}
+        self._archive: Optional[Path] = Path(archive).absolute() if archive else None
+        self._zipFile: Optional[zipfile.ZipFile] = None
+        self._zipInfos: Dict[str, zipfile.ZipInfo] = {}
+        self._lock = threading.RLock()
+        # sha256 -> names of the stored files with the content
+        self._shaIndex: Dict[bytes, List[str]] = {}
+        # size -> names of the archive files, whose hash is not computed yet
+        self._unhashedIndex: Dict[int, List[str]] = {}
+        # name -> number of added files the file is stored for
+        self._refCounts: Dict[str, int] = {}
+        # number of bytes which were not stored again because of deduplication
+        self.savedBytes = 0
+        if self._archive:
+            self._zipInfos = {info.filename: info for info in self._openZipFile().infolist()}
+
+    @property
+    def archive(self) -> Optional[Path]:
+        return self._archive
+
+    def _openZipFile(self) -> zipfile.ZipFile:
+        with self._lock:
+            if self._zipFile is None:
+                self._zipFile = zipfile.ZipFile(self._archive, "r")
+            return self._zipFile
+
+    def openMember(self, zipInfo: zipfile.ZipInfo) -> IO[bytes]:
+        with self._lock:
+            return self._openZipFile().open(zipInfo)
+
+    def close(self):
+        """Close the archive file, it is reopened on the next read"""
+        with self._lock:
+            if self._zipFile is not None:
+                self._zipFile.close()
+                self._zipFile = None
+
+    def archiveMember(self, name: str) -> Optional[zipfile.ZipInfo]:
+        """Return zip entry of the archive with the given part name"""
+        return self._zipInfos.get(name.lstrip("/"))
+
+    def copyMember(self, zipInfo: zipfile.ZipInfo, dst: zipfile.ZipFile, name: str):
+        """
+        Copy the entry of the archive compressed as it is into the given zip file.
+        If the ZipFile implementation doesn't allow it, the entry is decompressed and compressed again.
+        """
+        if not rawCopySupported(dst):
+            self._writeMember(zipInfo, dst, name)
+            return
+        with self._lock:
+            with open(self._archive, "rb") as src:
+                copyRawMember(src, zipInfo, dst, name)
+
+    def _writeMember(self, zipInfo: zipfile.ZipInfo, dst: zipfile.ZipFile, name: str):
+        """Stream the entry of the archive into the given zip file via the public ZipFile API"""
+        newInfo = zipfile.ZipInfo(name, date_time=zipInfo.date_time)
+        newInfo.compress_type = zipInfo.compress_type
+        newInfo.external_attr = zipInfo.external_attr
+        newInfo.file_size = zipInfo.file_size
+        with self.openMember(zipInfo) as src, \
+                dst.open(newInfo, "w", force_zip64=zipInfo.file_size > zipfile.ZIP64_LIMIT) as f:
+            shutil.copyfileobj(src, f, CHUNK_SIZE)
+
+    def copyFile(self, name: str, dst: zipfile.ZipFile) -> bool:
+        """
+        Copy the file compressed as it is into the given zip file, if it is stored in the archive
+        :return: False if the file is not stored in the archive and must be written otherwise
+        """
+        part = self._parts[name]
+        if not isinstance(part, _ZipPart):
+            return False
+        self.copyMember(part.zipInfo, dst, name.lstrip("/"))
+        return True
+
+    def snapshot(self) -> 'ZipSupplementaryFileContainer':
+        """
+        Return a container with the current files, which is not affected by later changes of this one.
+        The container uses an own handle of the archive, so it can be read in another thread.
+        """
+        with self._lock:
+            container = ZipSupplementaryFileContainer()
+            container._archive = self._archive
+            container._zipInfos = self._zipInfos
+            container._refCounts = dict(self._refCounts)
+            for name, part in self._parts.items():
+                if isinstance(part, _ZipPart):
+                    zipPart = _ZipPart(container, part.zipInfo, part.contentType)
+                    zipPart._sha = part._sha
+                    part = zipPart
+                container._setPart(name, part)
+            return container
+
+    def fileIndex(self) -> List[FileIndexEntry]:
+        """Return a description of the files, from which the container can be restored with restoreFiles()"""
+        with self._lock:
+            index = []
+            for name, part in self._parts.items():
+                refs = self._refCounts.get(name, 1)
+                if isinstance(part, _ZipPart):
+                    index.append(FileIndexEntry(name, part.contentType, part.zipInfo.filename, part._sha, None, refs))
+                else:
+                    index.append(FileIndexEntry(name, part.contentType, None, part.sha, part.data, refs))
+            return index
+
+    def restoreFiles(self, index: List[FileIndexEntry]):
+        """
+        Add files described by fileIndex() of a container of the same archive
+        :raise KeyError if a file of the index is not in the archive
+        """
+        with self._lock:
+            for entry in index:
+                if entry.zipName is None:
+                    part = _MemoryPart(entry.data, entry.contentType)
+                else:
+                    part = _ZipPart(self, self._zipInfos[entry.zipName], entry.contentType)
+                    part._sha = entry.sha
+                self._setPart(entry.name, part)
+                self._refCounts[entry.name] = entry.refs
+
+    def _zipInfoOf(self, file: IO[bytes]) -> Optional[zipfile.ZipInfo]:
+        """Return zip entry of the file if the file is an opened member of the archive"""
+        if not isinstance(file, zipfile.ZipExtFile):
+            return None
+        return self._zipInfos.get(getattr(file, "name", None))
+
+    def add_file(self, name: str, file: IO[bytes], content_type: str) -> str:
+        zipInfo = self._zipInfoOf(file)
+        if zipInfo is not None:
+            part = _ZipPart(self, zipInfo, content_type)
+            newName = self._assignUniqueName(name, part)
+        else:
+            part = _MemoryPart(file.read(), content_type)
+            newName = self._deduplicate(name, part)
+            if newName is None:
+                newName = self._assignUniqueName(name, part)
+        self._refCounts[newName] = self._refCounts.get(newName, 0) + 1
+        return newName
+
+    def _setPart(self, name: str, part: Union[_MemoryPart, _TempPart, _ZipPart]):
+        if name in self._parts:
+            self._unindex(name, self._parts[name])
+        self._parts[name] = part
+        if isinstance(part, _ZipPart) and part._sha is None:
+            # archive files are hashed only if a file of the same size is added
+            self._unhashedIndex.setdefault(part.size, []).append(name)
+        else:
+            self._shaIndex.setdefault(part.sha, []).append(name)
+
+    def _unindex(self, name: str, part: Union[_MemoryPart, _TempPart, _ZipPart]):
+        # archive files may have been hashed after they were indexed, so both indexes are checked
+        sha = part._sha if isinstance(part, _ZipPart) else part.sha
+        for index, key in ((self._unhashedIndex, part.size), (self._shaIndex, sha)):
+            names = index.get(key)
+            if names and name in names:
+                names.remove(name)
+                if not names:
+                    del index[key]
+
+    def _namesOfContent(self, part: _MemoryPart) -> List[str]:
+        """Return names of the stored files with the same content as the part"""
+        for name in self._unhashedIndex.pop(part.size, ()):
+            self._shaIndex.setdefault(self._parts[name].sha, []).append(name)
+        return self._shaIndex.get(part.sha, [])
+
+    def _deduplicate(self, name: str, part: _MemoryPart) -> Optional[str]:
+        """
+        Return name of a stored file with the same content and content type, preferring the given name.
+        If only the content type differs, the part shares the content of the stored file.
+        """
+        names = sorted(self._namesOfContent(part), key=lambda existingName: existingName != name)
+        for existingName in names:
+            existingPart = self._parts[existingName]
+            if existingPart.contentType == part.contentType:
+                self.savedBytes += part.size
+                return existingName
+            if isinstance(existingPart, _MemoryPart) and existingPart.data is not part.data:
+                part.data = existingPart.data
+                self.savedBytes += part.size
+        return None
+
+    def _assignUniqueName(self, name: str, part: Union[_MemoryPart, _TempPart, _ZipPart]) -> str:
+        newName = name
+        i = 1
+        while newName in self._parts:
+            existingPart = self._parts[newName]
+            if existingPart.contentType == part.contentType and existingPart.sha == part.sha:
+                return newName
+            newName = self._appendCounter(name, i)
+            i += 1
+        self._setPart(newName, part)
+        return newName
+
+    @staticmethod
+    def _appendCounter(name: str, i: int) -> str:
+        split1 = name.split("/")
+        split2 = split1[-1].split(".")
+        index = -2 if len(split2) > 1 else -1
+        split2[index] = "{}_{:04d}".format(split2[index], i)
+        split1[-1] = ".".join(split2)
+        return "/".join(split1)
+
+    def get_content_type(self, name: str) -> str:
+        return self._parts[name].contentType
+
+    def get_sha256(self, name: str) -> bytes:
+        return self._parts[name].sha
+
+    def write_file(self, name: str, file: IO[bytes]) -> None:
+        with self._parts[name].open() as f:
+            shutil.copyfileobj(f, file, CHUNK_SIZE)
+
+    def open_file(self, name: str) -> IO[bytes]:
+        """Return a binary file-like object for streaming the file contents"""
+        return self._parts[name].open()
+
+    def delete_file(self, name: str) -> None:
+        """Delete the file, if no other added file is stored as it"""
+        refs = self._refCounts.pop(name, 1) - 1
+        if refs > 0:
+            self._refCounts[name] = refs
+            return
+        self._unindex(name, self._parts.pop(name))
+
+    def rebase(self, archive: Union[str, Path], newPath: Union[str, Path, None] = None):
+        """
+        Point files of the old archive to the same named entries of the given archive,
+        e.g. after the package was saved. Files which are not in the new archive are copied into
+        temporary files, so they don't have to be held in memory.
+        The container is only changed after the new archive was moved, so it stays usable if moving fails.
+        :param archive: new archive
+        :param newPath: path the new archive is moved to, e.g. the path of the old archive
+        """
+        with self._lock:
+            with zipfile.ZipFile(archive, "r") as newZipFile:
+                newZipInfos = {info.filename: info for info in newZipFile.infolist()}
+
+            # name -> new zip entry or content copied from the old archive
+            newParts: Dict[str, Union[zipfile.ZipInfo, _TempPart]] = {}
+            for name, part in self._parts.items():
+                if not isinstance(part, _ZipPart):
+                    continue
+                zipInfo = newZipInfos.get(part.zipInfo.filename)
+                if zipInfo is None:
+                    with part.open() as f:
+                        newParts[name] = _TempPart(f, part.contentType, part._sha)
+                else:
+                    newParts[name] = zipInfo
+
+            self.close()
+            if newPath:
+                os.replace(archive, newPath)
+            for name, newPart in newParts.items():
+                if isinstance(newPart, _TempPart):
+                    self._setPart(name, newPart)
+                else:
+                    self._parts[name].zipInfo = newPart
+            self._archive = Path(newPath if newPath else archive).absolute()
+            self._zipInfos = newZipInfos
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._parts
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._parts)
+
+    def __len__(self) -> int:
+        return len(self._parts)
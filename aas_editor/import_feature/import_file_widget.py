@@ -123,7 +123,10 @@ class ImportManageWidget(QWidget):
                 try:
                     aasFile = dialog.aasFileLine.text()
                     self.importApp.mainTreeView.closeAllFiles()
-                    ImportManageWidget.IMPORT_SETTINGS.mappingPackage = self.importApp.mainTreeView.openPack(aasFile)
+                    mappingPackage = self.importApp.mainTreeView.openPackAndWait(aasFile)
+                    if mappingPackage is None:
+                        continue
+                    ImportManageWidget.IMPORT_SETTINGS.mappingPackage = mappingPackage
                     self.importApp.packTreeModel.setData(QModelIndex(), [], settings.UNDO_ROLE)
                 except Exception as e:
                     dialogs.ErrorMessageBox.withTraceback(self, f"Could not open AAS File: {e}").exec()
@@ -19,7 +19,7 @@ from types import GeneratorType
 
 from PyQt5.QtCore import QVariant, Qt
 from PyQt5.QtWidgets import QMessageBox, QDialog
-from basyx.aas.adapter.aasx import DictSupplementaryFileContainer
+from basyx.aas.adapter.aasx import AbstractSupplementaryFileContainer
 from basyx.aas.model import AASReference, Referable
 
 from aas_editor import dialogs
@@ -32,6 +32,8 @@ from aas_editor.utils.util_type import isIterable
 
 
 class ImportTreeViewItem(PackTreeViewItem):
+    __slots__ = ()
+
     def __init__(self, obj, parent, **kwargs):
         StandardItem.__init__(self, obj, parent=parent, **kwargs)
         if isinstance(obj, Package):
@@ -49,7 +51,8 @@ class ImportTreeViewItem(PackTreeViewItem):
         except KeyError as e:
             print(e)
         self.obj = obj
-        self.populate()
+        # populate eagerly, so that all objects get the mapping attribute
+        self.fetchChildren()
 
     def populate(self):
         kwargs = {
@@ -64,7 +67,7 @@ class ImportTreeViewItem(PackTreeViewItem):
                 if isinstance(itemObj, GeneratorType):
                     packItem.obj = self.obj.objStore
         elif isIterable(self.obj):
-            if isinstance(self.obj, DictSupplementaryFileContainer):
+            if isinstance(self.obj, AbstractSupplementaryFileContainer):
                 self._populateFileContainer(self.obj, **kwargs)
             else:
                 self._populateIterable(self.obj, **kwargs)
@@ -23,10 +23,10 @@ from aas_editor.settings import ATTRIBUTE_COLUMN, OBJECT_ROLE, COLUMN_NAME_ROLE,
 
 
 class ImportTable(PacksTable):
-    def _addItem(self, parent: QModelIndex, itemTyp, kwargs):
+    def _createItem(self, itemTyp, kwargs):
         if itemTyp is PackTreeViewItem:
             itemTyp = ImportTreeViewItem
-        return super(ImportTable, self)._addItem(parent, itemTyp, kwargs)
+        return super(ImportTable, self)._createItem(itemTyp, kwargs)
 
     def data(self, index: QModelIndex, role: int = ...) -> Any:
         if role == Qt.EditRole:
@@ -69,11 +69,9 @@ class ImportTable(PacksTable):
 
             if preObject and result:
                 if role == Qt.EditRole:
-                    self.undo.pop()
-                    self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=role))
+                    self.undo.replaceLast(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=role))
                 elif role == CLEAR_ROW_ROLE:
-                    self.undo.pop()
-                    self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=ADD_ITEM_ROLE))
+                    self.undo.replaceLast(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=ADD_ITEM_ROLE))
 
             return result
         except Exception as e:
@@ -101,10 +101,8 @@ class DetailedInfoImportTable(DetailedInfoTable):
 
         if preObject and result:
             if role == Qt.EditRole:
-                self.undo.pop()
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=role))
+                self.undo.replaceLast(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=role))
             elif role == CLEAR_ROW_ROLE:
-                self.undo.pop()
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=ADD_ITEM_ROLE))
+                self.undo.replaceLast(SetDataItem(index=QPersistentModelIndex(index), value=preObject, role=ADD_ITEM_ROLE))
 
         return result
@@ -18,6 +18,7 @@
 
 # pyuic5 aas_editor/mainwindow_base.ui -o aas_editor/design.py
 
+from .undo_history import *
 from .item_standard import *
 from .item_detailed_info import *
 from .item_pack_treeview import *
@@ -25,17 +25,28 @@ from aas_editor.package import Package
 
 
 class DetailedInfoItem(StandardItem):
+    __slots__ = ()
+
     def __init__(self, obj, name="", parent=None, package: Package = None, **kwargs):
         super().__init__(obj, name, parent, **kwargs)
         if parent and not package:
             self.package = parent.data(settings.PACKAGE_ROLE)
         else:
             self.package = package
-        self.populate()
+
+    def _populatable(self) -> bool:
+        return not isinstance(self.obj, settings.TYPES_WITH_INSTANCES_NOT_TO_POPULATE) \
+               and type(self.obj) not in settings.TYPES_NOT_TO_POPULATE
+
+    def mayHaveChildren(self) -> bool:
+        if self.obj is None or not self._populatable():
+            return False
+        if isinstance(self.obj, dict) or isSimpleIterable(self.obj):
+            return not self._isEmpty(self.obj)
+        return True
 
     def populate(self):
-        if isinstance(self.obj, settings.TYPES_WITH_INSTANCES_NOT_TO_POPULATE) \
-                or type(self.obj) in settings.TYPES_NOT_TO_POPULATE:
+        if not self._populatable():
             return
 
         kwargs = {
@@ -51,17 +62,22 @@ class DetailedInfoItem(StandardItem):
         else:
             self._populateUnknown(self.obj, **kwargs)
 
+    def _populateDict(self, obj, **kwargs):
+        self._populatePaged(obj.items(), self._newDictChild, **kwargs)
+
     @staticmethod
-    def _populateDict(obj, **kwargs):
-        for i, key in enumerate(obj):
-            DetailedInfoItem(DictItem(key, obj[key]),
-                             name=f"{getTypeName(DictItem)} {i}", **kwargs)
+    def _newDictChild(keyValue, i, **kwargs):
+        key, value = keyValue
+        return DetailedInfoItem(DictItem(key, value),
+                                name=f"{getTypeName(DictItem)} {i}", **kwargs)
+
+    def _populateIterable(self, obj, **kwargs):
+        self._populatePaged(obj, self._newIterableChild, **kwargs)
 
     @staticmethod
-    def _populateIterable(obj, **kwargs):
-        for i, sub_item_obj in enumerate(obj):
-            DetailedInfoItem(sub_item_obj,
-                             name=f"{getTypeName(sub_item_obj.__class__)} {i}", **kwargs)
+    def _newIterableChild(sub_item_obj, i, **kwargs):
+        return DetailedInfoItem(sub_item_obj,
+                                name=f"{getTypeName(sub_item_obj.__class__)} {i}", **kwargs)
 
     @staticmethod
     def _populateUnknown(obj, **kwargs):
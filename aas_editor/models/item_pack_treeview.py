@@ -19,7 +19,7 @@
 from types import GeneratorType
 
 from PyQt5.QtCore import Qt
-from basyx.aas.adapter.aasx import DictSupplementaryFileContainer
+from basyx.aas.adapter.aasx import AbstractSupplementaryFileContainer
 from basyx.aas.model import AASReference
 
 from aas_editor.models import StandardItem
@@ -31,6 +31,8 @@ from aas_editor.package import Package, StoredFile
 
 
 class PackTreeViewItem(StandardItem):
+    __slots__ = ()
+
     def __init__(self, obj, parent, **kwargs):
         super().__init__(obj, parent=parent, **kwargs)
         if isinstance(obj, Package):
@@ -45,7 +47,13 @@ class PackTreeViewItem(StandardItem):
         except KeyError as e:
             print(e)
         self.obj = obj
-        self.populate()
+
+    def mayHaveChildren(self) -> bool:
+        if ClassesInfo.hasPackViewAttrs(type(self.obj)):
+            return True
+        if isIterable(self.obj):
+            return not self._isEmpty(self.obj)
+        return False
 
     def populate(self):
         kwargs = {
@@ -58,24 +66,26 @@ class PackTreeViewItem(StandardItem):
                 itemObj = getattr(self.obj, attr)
                 packItem = PackTreeViewItem(itemObj, name=attr, **kwargs)
                 if isinstance(itemObj, GeneratorType):
+                    # generator can only be iterated now
+                    packItem.fetchChildren()
                     packItem.obj = self.obj.objStore
         elif isIterable(self.obj):
-            if isinstance(self.obj, DictSupplementaryFileContainer):
+            if isinstance(self.obj, AbstractSupplementaryFileContainer):
                 self._populateFileContainer(self.obj, **kwargs)
             else:
                 self._populateIterable(self.obj, **kwargs)
 
-    @staticmethod
-    def _populateIterable(obj, **kwargs):
-        for sub_item_obj in obj:
-            PackTreeViewItem(sub_item_obj, **kwargs)
+    def _populateIterable(self, obj, **kwargs):
+        self._populatePaged(obj, self._newIterableChild, **kwargs)
 
     @staticmethod
-    def _populateFileContainer(fileContainer, **kwargs):
+    def _newIterableChild(sub_item_obj, i, **kwargs):
+        return PackTreeViewItem(sub_item_obj, **kwargs)
+
+    def _populateFileContainer(self, fileContainer, **kwargs):
         # populate file container
-        for name in fileContainer:
-            itemObj = StoredFile(name, fileContainer)
-            PackTreeViewItem(itemObj, **kwargs)
+        self._populatePaged((StoredFile(name, fileContainer) for name in fileContainer),
+                            self._newIterableChild, **kwargs)
 
     def _getEditRoleData(self, column, column_name):
         if column == ATTRIBUTE_COLUMN:
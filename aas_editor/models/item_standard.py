@@ -17,10 +17,13 @@
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
 import io
+import sys
 from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import QObject, QVariant
+from PyQt5.QtCore import QVariant
 
 from aas_editor.package import StoredFile
 from aas_editor import settings
@@ -34,26 +37,111 @@ from aas_editor.utils.util_classes import ClassesInfo
 MediaContent = namedtuple("MediaContent", ("value", "mime_type"))
 
 
-class StandardItem(QObject):
-    def __init__(self, obj, name=None, parent=None, new=True, typehint=None):
-        super().__init__(parent)
-        self.new = new
-        self.changed = False
+_NOT_COMPUTED = object()
 
-        # following attrs will be set during self.obj = obj
-        self.typecheck = None
-        self.doc = None
-        self.icon = QIcon()
 
-        self._obj = obj
-        self.objTypeName = getTypeName(type(self.obj))
-        self.updateIcon()
+class ChildPages:
+    """Objects of the children of an item, which are not created yet, see StandardItem.fetchPage()"""
+    __slots__ = ("objs", "start", "createChild", "kwargs")
+
+    def __init__(self, objs: List, createChild: Callable[..., 'StandardItem'], kwargs: dict):
+        self.objs = objs
+        # index of the first object without child item
+        self.start = 0
+        # createChild(obj, i, **kwargs) creates the child item of the i-th object
+        self.createChild = createChild
+        self.kwargs = kwargs
+
+    def __len__(self):
+        return len(self.objs) - self.start
+
+
+@lru_cache(maxsize=None)
+def _typeIcon(objType: type) -> QIcon:
+    try:
+        return QIcon(settings.TYPE_ICON_DICT[objType])
+    except KeyError:
+        icon = QIcon()
+        for cls in settings.TYPE_ICON_DICT:
+            try:
+                if issubclass(objType, cls):
+                    icon = QIcon(settings.TYPE_ICON_DICT[cls])
+            except TypeError:
+                continue
+        return icon
+
+
+@lru_cache(maxsize=None)
+def _mimeTypeIcon(mimeType: str) -> QIcon:
+    try:
+        return QIcon(settings.MIME_TYPE_ICON_DICT[mimeType])
+    except KeyError:
+        mimeType = mimeType.rsplit("/")[0]
+        return QIcon(settings.MIME_TYPE_ICON_DICT.get(mimeType, settings.FILE_ICON))
+
+
+@lru_cache(maxsize=None)
+def _typeName(objType: type) -> str:
+    return getTypeName(objType)
+
 
-        self.objName = name
-        self.doc = getAttrDoc(self.objName, self.parentObj)
+@lru_cache(maxsize=4096)
+def _attrDoc(parentType: type, attr: str) -> str:
+    return getAttrDoc(attr, doc=parentType.__doc__)
 
-        self.typehint = typehint if typehint else self.getTypeHint()
-        self.typecheck = checkType(self.obj, self.typehint)
+
+def _typehintName(typehint) -> str:
+    try:
+        hash(typehint)
+    except TypeError:
+        return _computeTypehintName(typehint)
+    return _cachedTypehintName(typehint)
+
+
+def _computeTypehintName(typehint) -> str:
+    try:
+        return getTypeHintName(typehint)
+    except TypeError as e:
+        print(e)
+        return str(typehint)
+
+
+_cachedTypehintName = lru_cache(maxsize=None)(_computeTypehintName)
+
+
+class StandardItem:
+    """
+    Node of the tree models. Only the object, its name and the tree structure are stored per node,
+    icon, doc and type names are derived on demand from caches shared by all nodes.
+    Data of the roles painted on every frame is cached per node until the node is changed, see clearCache().
+    """
+    __slots__ = ("_obj", "_objName", "_parent", "_children", "_numOfValidRows", "_row", "_populated",
+                 "_pages", "_typehint", "_roleCache", "new", "changed", "package")
+
+    CACHED_ROLES = frozenset((Qt.DisplayRole, Qt.ToolTipRole, Qt.StatusTipRole, settings.IS_LINK_ROLE))
+    PAGE_SIZE = settings.CHILDREN_PAGE_SIZE
+
+    def __init__(self, obj, name=None, parent=None, new=True, typehint=None):
+        self._parent = None
+        # child items in row order, rows of the first _numOfValidRows children are up to date
+        self._children: List['StandardItem'] = []
+        self._numOfValidRows = 0
+        self._row = 0
+        # children are created by populate() on first fetch, see StandardTable.fetchMore()
+        self._populated = False
+        # objects of the children of large iterables which are not created yet
+        self._pages: Optional[ChildPages] = None
+        # (role, column) -> data, created on first use
+        self._roleCache: Optional[Dict[tuple, Any]] = None
+        self.package = None
+        self.setParent(parent)
+
+        self.new = new
+        self.changed = False
+        self._obj = obj
+        self._objName = name
+        # typehint is computed on first use
+        self._typehint = typehint if typehint else _NOT_COMPUTED
 
     def __str__(self):
         return f"{getTypeName(type(self))}: {self.data(Qt.DisplayRole)}"
@@ -64,24 +152,12 @@ class StandardItem(QObject):
 
     @property
     def obj(self):
-        # try:
-        #     obj = getattr(self.parentObj, self.objName)
-        #     if not isinstance(obj, GeneratorType):
-        #         return obj
-        # except (TypeError, AttributeError):
-        #     pass
         return self._obj
 
     @obj.setter
     def obj(self, obj):
         self._obj = obj
-        try:
-            self.typecheck = checkType(self.obj, self.typehint)
-        except AttributeError:
-            pass
-        self.objTypeName = getTypeName(type(self.obj))
-        self.updateIcon()
-        self.doc = getAttrDoc(self.objName, self.parentObj)
+        self.clearCache()
 
     @property
     def objName(self) -> str:
@@ -90,7 +166,6 @@ class StandardItem(QObject):
     @objName.setter
     def objName(self, value):
         self._objName = value
-        self.doc = getAttrDoc(self.objName, self.parentObj)
 
     @property
     def objectName(self) -> str:
@@ -103,41 +178,61 @@ class StandardItem(QObject):
         else:
             return getTypeName(self.obj.__class__)
 
+    @property
+    def objTypeName(self) -> str:
+        return _typeName(type(self.obj))
+
+    @property
+    def doc(self) -> str:
+        parentObj = self.parentObj
+        if not self.objName or not parentObj:
+            return ""
+        return _attrDoc(type(parentObj), self.objName)
+
+    @property
+    def icon(self) -> QIcon:
+        if isinstance(self.obj, StoredFile):
+            return _mimeTypeIcon(self.obj.mime_type)
+        return _typeIcon(type(self.obj))
+
     @property
     def typehint(self):
+        if self._typehint is _NOT_COMPUTED:
+            self._typehint = self.getTypeHint()
         return self._typehint
 
     @typehint.setter
     def typehint(self, value):
         self._typehint = value
-        self.typecheck = checkType(self.obj, self.typehint)
-        self.updateTypehintName()
 
-    def updateTypehintName(self):
-        try:
-            self.typehintName = getTypeHintName(self.typehint)
-        except TypeError as e:
-            print(e)
-            self.typehintName = str(self.typehint)
+    @property
+    def typehintName(self) -> str:
+        return _typehintName(self.typehint)
 
-    def updateIcon(self):
-        if isinstance(self.obj, StoredFile):
-            try:
-                self.obj: StoredFile
-                mime_type: str = self.obj.mime_type
-                self.icon = QIcon(settings.MIME_TYPE_ICON_DICT[mime_type])
-            except KeyError:
-                mime_type = mime_type.rsplit("/")[0]
-                self.icon = QIcon(settings.MIME_TYPE_ICON_DICT.get(mime_type, settings.FILE_ICON))
-        else:
-            try:
-                self.icon = QIcon(settings.TYPE_ICON_DICT[type(self.obj)])
-            except KeyError:
-                for cls in settings.TYPE_ICON_DICT:
-                    if isinstance(self.obj, cls):
-                        self.icon = QIcon(settings.TYPE_ICON_DICT[cls])
+    @property
+    def typecheck(self) -> bool:
+        return checkType(self.obj, self.typehint)
+
+    def cachedData(self, key, compute: Callable[[], Any]):
+        """Return the cached data for the key, the data is computed and cached on first use"""
+        cache = self._roleCache
+        if cache is None:
+            cache = self._roleCache = {}
+        elif key in cache:
+            return cache[key]
+        value = cache[key] = compute()
+        return value
+
+    def clearCache(self):
+        """Drop the cached data, must be called if the displayed object or its state changed"""
+        self._roleCache = None
 
     def data(self, role, column=settings.ATTRIBUTE_COLUMN, column_name=""):
+        if role in self.CACHED_ROLES:
+            return self.cachedData((role, column), lambda: self._data(role, column, column_name))
+        return self._data(role, column, column_name)
+
+    def _data(self, role, column, column_name):
         # custom roles
         if role == settings.NAME_ROLE:
             return self.objectName
@@ -230,8 +325,14 @@ class StandardItem(QObject):
         tooltip = getLimitStr(tooltip)
         return tooltip if tooltip else QVariant()
 
-    def setParent(self, a0: 'QObject') -> None:
-        super().setParent(a0)
+    def parent(self) -> Optional['StandardItem']:
+        return self._parent
+
+    def setParent(self, a0: Optional['StandardItem']) -> None:
+        if self._parent is not None:
+            self._parent._detachChild(self)
+        self._parent = a0
+        self._attachTo(a0)
         if a0 is None:
             return
         if a0.data(settings.PACKAGE_ROLE):
@@ -269,9 +370,172 @@ class StandardItem(QObject):
         value = self.obj.value
         return isinstance(value, str) and value.startswith(("http", "www."))
 
+    def _attachTo(self, parent: Optional['StandardItem']):
+        if parent is not None:
+            self._row = len(parent._children)
+            if parent._numOfValidRows == self._row:
+                parent._numOfValidRows += 1
+            parent._children.append(self)
+
+    def _detachChild(self, child: 'StandardItem'):
+        row = self._rowOf(child)
+        del self._children[row]
+        self._numOfValidRows = min(self._numOfValidRows, row)
+
+    def _rowOf(self, child: 'StandardItem') -> int:
+        # rows are only shifted by removing children, so outdated rows are never lower than valid ones
+        if child._row >= self._numOfValidRows:
+            for row in range(self._numOfValidRows, len(self._children)):
+                self._children[row]._row = row
+            self._numOfValidRows = len(self._children)
+        return child._row
+
+    def insertChildren(self, row: int, children: List['StandardItem']):
+        for i, child in enumerate(children, row):
+            child._parent = self
+            child._row = i
+        self._children[row:row] = children
+        self._numOfValidRows = min(self._numOfValidRows, row)
+
+    def removeChildren(self, row: int, count: int):
+        for child in self._children[row:row + count]:
+            child._parent = None
+        del self._children[row:row + count]
+        self._numOfValidRows = min(self._numOfValidRows, row)
+
+    def newChildren(self) -> Tuple[List['StandardItem'], Optional[ChildPages]]:
+        """
+        Create child items for the current object, existing children are not changed.
+        As many children as exist now are created, all if all children exist now
+        :return: new children and the pages of the children not created yet
+        """
+        children, numOfValidRows, pages = self._children, self._numOfValidRows, self._pages
+        self._children, self._numOfValidRows, self._pages = [], 0, None
+        try:
+            self.populate()
+            self._fetchPages(len(children) if pages else sys.maxsize)
+            return self._children, self._pages
+        finally:
+            self._children, self._numOfValidRows, self._pages = children, numOfValidRows, pages
+
+    def adopt(self, item: 'StandardItem') -> bool:
+        """
+        Take over object, name and typehint of the equivalent item created by a newer populate of the parent
+        :return: True if the displayed data changed
+        """
+        changed = self._objName != item._objName or \
+            (self._typehint is not _NOT_COMPUTED and self._typehint != item.typehint)
+        self._obj = item._obj
+        self._objName = item._objName
+        self._typehint = item._typehint
+        if changed:
+            self.clearCache()
+        return changed
+
+    def children(self) -> List['StandardItem']:
+        """Return child items in row order"""
+        return self._children
+
+    def child(self, row: int) -> 'StandardItem':
+        return self._children[row]
+
+    def childCount(self) -> int:
+        """Return number of child items, children of not populated items are not counted"""
+        return len(self._children) if self._populated else 0
+
+    @property
+    def populated(self) -> bool:
+        return self._populated
+
+    @populated.setter
+    def populated(self, value: bool):
+        self._populated = value
+
+    @property
+    def pages(self) -> Optional[ChildPages]:
+        return self._pages
+
+    @pages.setter
+    def pages(self, pages: Optional[ChildPages]):
+        self._pages = pages if pages else None
+
+    def totalChildCount(self) -> int:
+        """Return number of child items including the not yet created children of a populated item"""
+        return self.childCount() + (len(self._pages) if self._populated and self._pages else 0)
+
+    def populate(self):
+        """Create child items"""
+
+    def _populatePaged(self, objs: Iterable, createChild: Callable[..., 'StandardItem'], **kwargs):
+        """
+        Create child items of the objects, createChild(obj, i, **kwargs) creates the item of the i-th object.
+        Only the first page is created, further pages are created by fetchPage()
+        """
+        self._pages = ChildPages(list(objs), createChild, kwargs)
+        self.fetchPage()
+
+    def fetchPage(self, size: int = None) -> int:
+        """
+        Create the next page of child items
+        :param size: number of items to create, default is PAGE_SIZE
+        :return: number of created items
+        """
+        pages = self._pages
+        if not pages:
+            self._pages = None
+            return 0
+        size = min(len(pages), self.PAGE_SIZE if size is None else size)
+        kwargs = dict(pages.kwargs, parent=self)
+        for i in range(pages.start, pages.start + size):
+            pages.createChild(pages.objs[i], i, **kwargs)
+        pages.start += size
+        if not pages:
+            self._pages = None
+        return size
+
+    def nextPageSize(self) -> int:
+        return min(len(self._pages), self.PAGE_SIZE) if self._pages else 0
+
+    def canFetchMore(self) -> bool:
+        """Return True if the item is not populated yet or not all its children are created"""
+        return not self._populated or bool(self._pages)
+
+    def fetchChildren(self):
+        """Populate the item if it is not populated yet"""
+        if not self._populated:
+            self.populate()
+            self._populated = True
+
+    def fetchLike(self, item: 'StandardItem'):
+        """Populate the item and create as many children as the equivalent item, all if it has all children"""
+        self.fetchChildren()
+        self._fetchPages(len(item._children) if item._pages else sys.maxsize)
+
+    def _fetchPages(self, count: int):
+        """Create further pages until there are at least count children"""
+        while len(self._children) < count and self._pages:
+            self.fetchPage(count - len(self._children))
+
+    def hasChildren(self) -> bool:
+        """Return if the item has children, without populating it"""
+        if self._populated:
+            return bool(self._children)
+        return self.mayHaveChildren()
+
+    def mayHaveChildren(self) -> bool:
+        """Return False if populate() would create no children, must be cheap"""
+        return True
+
+    @staticmethod
+    def _isEmpty(obj) -> bool:
+        try:
+            return len(obj) == 0
+        except TypeError:
+            return False
+
     def row(self):
-        if self.parent():
-            return self.parent().children().index(self)
+        if self._parent is not None:
+            return self._parent._rowOf(self)
         else:
             return 0
 
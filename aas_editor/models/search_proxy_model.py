@@ -44,6 +44,12 @@ class SearchProxyModel(QSortFilterProxyModel):
         if not pattern:
             return foundItems
 
+        # the filter only sees created items, so lazily populated items must be created first
+        iterSourceItems = getattr(self.sourceModel(), "iterItems", None)
+        if iterSourceItems:
+            for _ in iterSourceItems():
+                pass
+
         if matchCase:
             self.setFilterCaseSensitivity(Qt.CaseSensitive)
         else:
@@ -74,6 +80,8 @@ class SearchProxyModel(QSortFilterProxyModel):
             for row in range(self.rowCount(parent)):
                 childIndex = self.index(row, 0, parent)
                 yield childIndex
-                if self.rowCount(childIndex):
+                if self.hasChildren(childIndex):
+                    if self.canFetchMore(childIndex):
+                        self.fetchMore(childIndex)
                     yield from recurse(childIndex)
         yield from recurse(parent)
@@ -16,14 +16,16 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
-from typing import Any
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple, Type
 
 from PyQt5.QtCore import QModelIndex, QPersistentModelIndex
 from PyQt5.QtGui import QFont
 
 from aas_editor.models import DetailedInfoItem, StandardTable
+from aas_editor.package import Package
 from aas_editor.settings.app_settings import PACKAGE_ROLE, NAME_ROLE, OBJECT_ROLE, DEFAULT_COLUMNS_IN_DETAILED_INFO,\
-    PACK_ITEM_ROLE, DEFAULT_FONT
+    PACK_ITEM_ROLE, DEFAULT_FONT, MAX_UNUSED_DETAILED_TABLES
 
 
 class DetailedInfoTable(StandardTable):
@@ -42,3 +44,112 @@ class DetailedInfoTable(StandardTable):
             return QModelIndex(self.packItem)
         else:
             return super(DetailedInfoTable, self).data(index, role)
+
+    def livePackages(self) -> List[Package]:
+        return [self.package] if isinstance(self.package, Package) else []
+
+
+def _sourceItem(index: QModelIndex):
+    """Return the item of the index in the source model of its proxy models"""
+    index = QModelIndex(index)
+    while hasattr(index.model(), "mapToSource"):
+        index = index.model().mapToSource(index)
+    return index.internalPointer()
+
+
+class DetailedInfoTableCache:
+    """
+    Detailed info tables shared by all views showing the same pack item, e.g. tabs and detached windows.
+    Tables are reference counted, tables not shown by any view are kept for fast reopening and
+    the least recently used of them are removed if there are more than maxUnused.
+    """
+
+    def __init__(self, maxUnused: int):
+        self.maxUnused = maxUnused
+        # (table class, pack item) -> table
+        self._tables: Dict[Tuple[Type[DetailedInfoTable], Any], DetailedInfoTable] = {}
+        self._keys: Dict[DetailedInfoTable, Tuple[Type[DetailedInfoTable], Any]] = {}
+        self._refCounts: Dict[DetailedInfoTable, int] = {}
+        # number of the last package change applied to the table
+        self._changeIds: Dict[DetailedInfoTable, int] = {}
+        # tables not shown by any view, least recently used first
+        self._unused: "OrderedDict[DetailedInfoTable, None]" = OrderedDict()
+
+    def acquire(self, packItem: QModelIndex,
+                tableClass: Type[DetailedInfoTable] = DetailedInfoTable) -> DetailedInfoTable:
+        """
+        Return the table of the pack item, a table is created if there is no valid table of the item.
+        The table must be released if it is not shown anymore.
+        """
+        if not packItem.isValid():
+            return tableClass(packItem)
+
+        key = (tableClass, _sourceItem(packItem))
+        table = self._tables.get(key)
+        if table is not None and not self._isUpToDate(table, packItem):
+            self._forget(table)
+            table = None
+
+        if table is None:
+            table = tableClass(packItem)
+            self._tables[key] = table
+            self._keys[table] = key
+            self._refCounts[table] = 0
+        elif self._changeIds[table] != self._changeId(table):
+            # objects could be changed in other models meanwhile
+            table.refresh()
+        self._changeIds[table] = self._changeId(table)
+        self._refCounts[table] += 1
+        self._unused.pop(table, None)
+        return table
+
+    def release(self, table: DetailedInfoTable):
+        """Release the table acquired before, unused tables are kept until they are evicted"""
+        if table not in self._refCounts:
+            return
+        self._refCounts[table] -= 1
+        if self._refCounts[table] > 0:
+            return
+        if self._tables.get(self._keys[table]) is table and table.packItem.isValid():
+            self._unused[table] = None
+        else:
+            self._forget(table)
+        self._evict()
+
+    def clear(self):
+        """Remove all unused tables"""
+        for table in list(self._unused):
+            self._forget(table)
+
+    def __len__(self) -> int:
+        return len(self._refCounts)
+
+    @staticmethod
+    def _changeId(table: DetailedInfoTable) -> int:
+        return getattr(table.package, "changeId", 0)
+
+    @staticmethod
+    def _isUpToDate(table: DetailedInfoTable, packItem: QModelIndex) -> bool:
+        return table.packItem.isValid() and table.mainObj is packItem.data(OBJECT_ROLE)
+
+    def _forget(self, table: DetailedInfoTable):
+        """Remove the table from the cache, a table still in use is only kept until it is released"""
+        key = self._keys.get(table)
+        if self._tables.get(key) is table:
+            del self._tables[key]
+        self._unused.pop(table, None)
+        if self._refCounts.get(table, 0) <= 0:
+            self._keys.pop(table, None)
+            self._refCounts.pop(table, None)
+            self._changeIds.pop(table, None)
+
+    def _evict(self):
+        """Remove unused tables of removed pack items and the least recently used tables over the maximum"""
+        for table in [table for table in self._unused if not table.packItem.isValid()]:
+            self._forget(table)
+        while len(self._unused) > self.maxUnused:
+            table = next(iter(self._unused))
+            self._forget(table)
+
+
+DETAILED_INFO_TABLES = DetailedInfoTableCache(MAX_UNUSED_DETAILED_TABLES)
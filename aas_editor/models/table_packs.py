@@ -16,7 +16,7 @@ from PyQt5.QtGui import QFont
 from aas_editor.models import StandardTable
 from aas_editor.package import Package
 from aas_editor.settings.app_settings import PACKAGE_ROLE, DEFAULT_FONT, OPENED_PACKS_ROLE, OPENED_FILES_ROLE, \
-    DEFAULT_COLUMNS_IN_PACKS_TABLE, OBJECT_ROLE, COLUMN_NAME_ROLE
+    DEFAULT_COLUMNS_IN_PACKS_TABLE, OBJECT_ROLE, COLUMN_NAME_ROLE, ADD_ITEM_ROLE
 
 
 class PacksTable(StandardTable):
@@ -38,10 +38,15 @@ class PacksTable(StandardTable):
         files = set([pack.file for pack in self.openedPacks()])
         return files
 
+    def addPackWithoutUndo(self, pack: Package) -> bool:
+        """Add the package like ADD_ITEM_ROLE without recording an undo step, e.g. for packages opened at startup"""
+        if not self.setData(QModelIndex(), pack, ADD_ITEM_ROLE):
+            return False
+        self.undo.pop()
+        return True
+
     def data(self, index: QModelIndex, role: int = ...) -> Any:
-        if role == Qt.ForegroundRole:
-            return self._getFgColor(index)
-        elif role == OPENED_PACKS_ROLE:
+        if role == OPENED_PACKS_ROLE:
             return self.openedPacks()
         elif role == OPENED_FILES_ROLE:
             return self.openedFiles()
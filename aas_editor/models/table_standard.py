@@ -10,20 +10,26 @@
 
 import copy
 import traceback
-from collections import namedtuple, deque
+from contextlib import contextmanager
+from collections import deque
+from difflib import SequenceMatcher
 from enum import Enum
-from typing import Any, Iterable, Union, AbstractSet, List
+from typing import Any, Callable, Dict, Iterable, Union, AbstractSet, List, Optional, Tuple
 
 from PyQt5.QtCore import QAbstractItemModel, QVariant, QModelIndex, Qt, QItemSelection, QSize, \
     QPersistentModelIndex
 from PyQt5.QtGui import QFont
+from basyx.aas.model import Identifiable, Identifier
 
-from aas_editor.models import DetailedInfoItem, StandardItem, PackTreeViewItem
+from aas_editor.models import DetailedInfoItem, StandardItem, PackTreeViewItem, ChildPages
+from aas_editor.models.undo_history import SetDataItem, UndoHistory
+from aas_editor.completions import IDENTIFIER_COMPLETIONS
 from aas_editor.package import Package
 from aas_editor.settings.app_settings import NAME_ROLE, OBJECT_ROLE, ATTRIBUTE_COLUMN, \
-    VALUE_COLUMN, PACKAGE_ROLE, PACK_ITEM_ROLE, DEFAULT_FONT, ADD_ITEM_ROLE, CLEAR_ROW_ROLE, \
+    VALUE_COLUMN, PACKAGE_ROLE, PACK_ITEM_ROLE, DEFAULT_FONT, ADD_ITEM_ROLE, ADD_ITEMS_ROLE, CLEAR_ROW_ROLE, \
+    CLEAR_ROWS_ROLE, \
     DATA_CHANGE_FAILED_ROLE, IS_LINK_ROLE, TYPE_COLUMN, \
-    TYPE_CHECK_ROLE, TYPE_ROLE, UNDO_ROLE, REDO_ROLE, MAX_UNDOS, UPDATE_ROLE, TYPE_HINT_COLUMN, COLUMN_NAME_ROLE, \
+    TYPE_CHECK_ROLE, TYPE_ROLE, UNDO_ROLE, REDO_ROLE, MAX_UNDO_SIZE, UNDO_MERGE_INTERVAL, UPDATE_ROLE, TYPE_HINT_COLUMN, COLUMN_NAME_ROLE, \
     LINKED_ITEM_ROLE, COPY_ROLE
 from aas_editor.settings import NOT_GIVEN
 from aas_editor.settings.colors import LINK_BLUE, CHANGED_BLUE, RED, NEW_GREEN
@@ -33,25 +39,113 @@ from aas_editor.utils.util_classes import ClassesInfo
 from aas_editor.additional.classes import DictItem
 from aas_editor.utils.util_type import isIterable
 
-SetDataItem = namedtuple("SetDataItem", ("index", "value", "role"))
+def _itemKey(item: StandardItem):
+    """Return key of the item object, children of updated items are kept if their keys are unchanged"""
+    obj = item.obj
+    if isinstance(obj, DictItem):
+        # dict items are created anew on every populate
+        return DictItem, obj.key, id(obj.value)
+    return id(obj)
+
+
+def _diffOpcodes(oldKeys: List, newKeys: List) -> List[Tuple[str, int, int, int, int]]:
+    """Return opcodes like SequenceMatcher.get_opcodes(), common start and end are matched in linear time"""
+    start = 0
+    maxStart = min(len(oldKeys), len(newKeys))
+    while start < maxStart and oldKeys[start] == newKeys[start]:
+        start += 1
+    end = 0
+    maxEnd = maxStart - start
+    while end < maxEnd and oldKeys[-end - 1] == newKeys[-end - 1]:
+        end += 1
+    oldEnd, newEnd = len(oldKeys) - end, len(newKeys) - end
+
+    opcodes = []
+    if start:
+        opcodes.append(("equal", 0, start, 0, start))
+    if oldEnd > start or newEnd > start:
+        matcher = SequenceMatcher(None, oldKeys[start:oldEnd], newKeys[start:newEnd], autojunk=False)
+        opcodes.extend((tag, i1 + start, i2 + start, j1 + start, j2 + start)
+                       for tag, i1, i2, j1, j2 in matcher.get_opcodes())
+    if end:
+        opcodes.append(("equal", oldEnd, len(oldKeys), newEnd, len(newKeys)))
+    return opcodes
+
+
+class ItemIndex:
+    """Items of a model by a key, items of a key are kept in the order they were added"""
+
+    def __init__(self):
+        self._items: Dict[Any, Dict[StandardItem, None]] = {}
+
+    def add(self, key, item: StandardItem):
+        self._items.setdefault(key, {})[item] = None
+
+    def discard(self, key, item: StandardItem):
+        try:
+            items = self._items.get(key)
+        except TypeError:
+            return
+        if items is not None:
+            items.pop(item, None)
+            if not items:
+                del self._items[key]
+
+    def get(self, key) -> Iterable[StandardItem]:
+        try:
+            return self._items.get(key, ())
+        except TypeError:
+            return ()
+
+
+class FontKind(Enum):
+    PLAIN = 0
+    LINK = 1
+    ATTRIBUTE = 2
+    VALUE = 3
 
 
 class StandardTable(QAbstractItemModel):
+    # roles cached per item until the item is changed
+    CACHED_ROLES = StandardItem.CACHED_ROLES | {Qt.ForegroundRole, Qt.FontRole}
     currFont = QFont(DEFAULT_FONT)
+    # fonts shared by all items: (font kind, font family, point size) -> font
+    _sharedFonts: Dict[Tuple[FontKind, str, int], QFont] = {}
+    # levels below an item which are fetched to find the item of a child object,
+    # e.g. package, group of the package and identifiable below the root
+    MAX_FETCH_DEPTH = 3
 
     def __init__(self, columns=("Item",), rootItem: StandardItem = None):
         super(StandardTable, self).__init__()
         self._rootItem = rootItem if rootItem else DetailedInfoItem(None) # FIXME
+        self._rootItem.fetchChildren()
         self._columns = columns
         self.lastErrorMsg = ""
-        self.undo: deque[SetDataItem] = deque(maxlen=MAX_UNDOS)
-        self.redo: List[SetDataItem] = []
+        self.undo = self._newHistory()
+        self.redo = self._newHistory()
+        self._replaying = False
+        # changed items collected by an open transaction
+        self._transactionDepth = 0
+        self._changedItems: Dict[StandardItem, None] = {}
+        # indexes of the created items used by match()
+        self._objIndex = ItemIndex()
+        self._typeIndex = ItemIndex()
+        self._nameIndex = ItemIndex()
+        self._indexedKeys: Dict[StandardItem, tuple] = {}
+        self._indexItems(self._rootItem.children())
+        # populated items whose further pages are not fetched yet, used by views for their scroll range
+        self._pagedItems: Dict[StandardItem, None] = {}
+        self._addPagedItem(self._rootItem)
+        # cached data of changed items is dropped and changed items are reindexed on every change notification
+        self.dataChanged.connect(self._onDataChanged)
+        self.rowsInserted.connect(self._onRowsInserted)
+        self.rowsAboutToBeRemoved.connect(self._onRowsAboutToBeRemoved)
 
     def index(self, row: int, column: int = 0, parent: QModelIndex = QModelIndex()) -> QModelIndex:
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
         parentObj = self.objByIndex(parent)
-        return self.createIndex(row, column, parentObj.children()[row])
+        return self.createIndex(row, column, parentObj.child(row))
 
     def parent(self, child: QModelIndex) -> QModelIndex:
         if not child.isValid():
@@ -67,12 +161,10 @@ class StandardTable(QAbstractItemModel):
         if parentObj == self._rootItem or not parentObj:
             return QModelIndex()
 
-        grandParentObj = parentObj.parent()
-        row = grandParentObj.children().index(parentObj)
-        return self.createIndex(row, 0, parentObj)
+        return self.createIndex(parentObj.row(), 0, parentObj)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
-        return len(self.objByIndex(parent).children())
+        return self.objByIndex(parent).childCount()
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self._columns)
@@ -92,8 +184,125 @@ class StandardTable(QAbstractItemModel):
 
         return Qt.ItemIsEditable | Qt.ItemIsEnabled | Qt.ItemIsSelectable
 
-    def hasChildren(self, parent: QModelIndex = ...) -> bool:
-        return True if self.rowCount(parent) else False
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return self.objByIndex(parent).hasChildren()
+
+    def totalRowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Return number of rows including the rows not fetched yet of a fetched item"""
+        return self.objByIndex(parent).totalChildCount()
+
+    def pagedParents(self) -> List[QModelIndex]:
+        """Return indexes of the fetched items which have rows not fetched yet, the root item is the invalid index"""
+        parents = []
+        for item in list(self._pagedItems):
+            if not item.pages or not self._isAttached(item):
+                del self._pagedItems[item]
+            elif item is self._rootItem:
+                parents.append(QModelIndex())
+            else:
+                parents.append(self.createIndex(item.row(), 0, item))
+        return parents
+
+    def _addPagedItem(self, item: StandardItem):
+        if item.populated and item.pages:
+            self._pagedItems[item] = None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return self.objByIndex(parent).canFetchMore()
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        """
+        Create child items of the item, children are created when the item is expanded or visited.
+        Children of large collections are created page by page, the next page is fetched as the view scrolls
+        """
+        item = self.objByIndex(parent)
+        if item.populated:
+            self._fetchRows(parent, item.nextPageSize())
+            return
+        # created children are not counted until the item is marked as populated
+        item.populate()
+        numOfRows = len(item.children())
+        if numOfRows:
+            self.beginInsertRows(parent, 0, numOfRows - 1)
+        item.populated = True
+        self._addPagedItem(item)
+        if numOfRows:
+            self.endInsertRows()
+
+    def _fetchRows(self, parent: QModelIndex, count: int):
+        """Create the next count child items of the fetched item"""
+        item = self.objByIndex(parent)
+        count = min(count, len(item.pages) if item.pages else 0)
+        if count:
+            first = item.childCount()
+            self.beginInsertRows(parent, first, first + count - 1)
+            item.fetchPage(count)
+            self.endInsertRows()
+
+    def ensureFetched(self, parent: QModelIndex = QModelIndex()):
+        """Create all child items of the item if they were not created yet"""
+        while self.canFetchMore(parent):
+            self.fetchMore(parent)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Collect changes of item data and emit them as merged dataChanged signals when the outermost
+        transaction is closed, e.g. for bulk edits. Transactions can be nested.
+        """
+        self._transactionDepth += 1
+        try:
+            yield self
+        finally:
+            self._transactionDepth -= 1
+            if not self._transactionDepth:
+                self._emitChanges()
+
+    def notifyChanged(self, index: QModelIndex):
+        """
+        Drop cached data of the changed row and notify views about it.
+        In a transaction the notification is deferred until the transaction is closed.
+        """
+        if not index.isValid():
+            return
+        index = index.siblingAtColumn(0)
+        if not self._transactionDepth:
+            self.dataChanged.emit(index, index.siblingAtColumn(self.columnCount() - 1))
+            return
+        item = self.objByIndex(index)
+        item.clearCache()
+        if item in self._indexedKeys:
+            self._indexItem(item)
+        self._changedItems[item] = None
+
+    def _emitChanges(self):
+        """Emit one dataChanged signal per range of consecutive changed rows"""
+        changedItems, self._changedItems = self._changedItems, {}
+        rowsByParent: Dict[StandardItem, List[int]] = {}
+        for item in changedItems:
+            if self._isAttached(item):
+                rowsByParent.setdefault(item.parent(), []).append(item.row())
+
+        lastColumn = self.columnCount() - 1
+        for parentItem, rows in rowsByParent.items():
+            rows.sort()
+            first = last = rows[0]
+            for row in rows[1:] + [None]:
+                if row is not None and row <= last + 1:
+                    last = max(last, row)
+                    continue
+                self.dataChanged.emit(self.createIndex(first, 0, parentItem.child(first)),
+                                      self.createIndex(last, lastColumn, parentItem.child(last)))
+                if row is not None:
+                    first = last = row
+
+    def _isAttached(self, item: StandardItem) -> bool:
+        """Return True if the item is still a descendant of the root item"""
+        while item is not None:
+            if item is self._rootItem:
+                return True
+            item = item.parent()
+        return False
 
     def objByIndex(self, index: QModelIndex):
         if not index.isValid():
@@ -101,70 +310,205 @@ class StandardTable(QAbstractItemModel):
         return index.internalPointer()
 
     def iterItems(self, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        """Iterate over all items under the parent, not yet populated items are populated"""
         def recurse(parent: QModelIndex):
             for row in range(self.rowCount(parent)):
                 childIndex = self.index(row, 0, parent)
                 yield childIndex
-                child = self.objByIndex(childIndex)
-                if child.children():
+                if self.hasChildren(childIndex):
+                    self.ensureFetched(childIndex)
                     yield from recurse(childIndex)
+        self.ensureFetched(parent)
         yield from recurse(parent)
 
     def match(self, start: QModelIndex, role: int, value: Any, hits: int = ...,
               flags: Union[Qt.MatchFlags, Qt.MatchFlag] = ...) -> List[QModelIndex]:
+        """
+        Items are matched by OBJECT_ROLE (identity), TYPE_ROLE and DisplayRole of the name column,
+        i.e. the object name of the item, via indexes of the created items. Only for OBJECT_ROLE not yet created items are fetched,
+        if less than the given number of hits is found: the items along the parents of the referable,
+        at most MAX_FETCH_DEPTH levels below each of them. Other roles only match created items.
+        """
         kwargs = {}
         if hits is not ...:
             kwargs["hits"] = hits
         if flags is not ...:
             kwargs["flags"] = flags
 
-        if role == OBJECT_ROLE and hits != 0:
-            res = []
-            for item in self.iterItems(start):
-                print("match for:", item.data(NAME_ROLE))
-                try:
-                    if (item.data(OBJECT_ROLE) is value) or (item.data(OBJECT_ROLE) == value):
-                        res.append(item)
-                except AttributeError:
-                    continue
-                if hits == len(res):
-                    break
-            return res
-        elif role == TYPE_ROLE and hits != 0:
-            res = []
-            for item in self.iterItems(start):
-                print("match for:", item.data(NAME_ROLE))
-                try:
-                    if issubclass(value, item.data(TYPE_ROLE)):
-                        res.append(item)
-                except AttributeError:
-                    continue
-                if hits == len(res):
-                    break
-            return res
-        elif role == Qt.DisplayRole and hits != 0:
-            res = []
-            for item in self.iterItems(start):
-                print("match for:", item.data(NAME_ROLE))
-                try:
-                    if value == item.data(Qt.DisplayRole):
-                        res.append(item)
-                except AttributeError:
-                    continue
-                if hits == len(res):
-                    break
-            return res
+        if role in (OBJECT_ROLE, TYPE_ROLE, Qt.DisplayRole) and hits != 0:
+            limit = hits if isinstance(hits, int) and hits > 0 else None
+            startItem = self.objByIndex(start)
+            res = self._lookup(startItem, role, value, limit)
+            if limit and len(res) < limit and role == OBJECT_ROLE:
+                self._fetchParentsOf(value)
+                res = self._lookup(startItem, role, value, limit)
+            return [self.createIndex(item.row(), 0, item) for item in res]
         else:
             return super(StandardTable, self).match(start, role, value, **kwargs)
 
+    def _lookup(self, startItem: StandardItem, role: int, value: Any, limit: Optional[int]) -> List[StandardItem]:
+        """Return created items under the start item matching the value"""
+        if role == OBJECT_ROLE:
+            candidates = self._objIndex.get(id(value))
+        elif role == TYPE_ROLE:
+            # items whose object type is the value type or one of its base classes
+            try:
+                mro = value.__mro__
+            except AttributeError:
+                return []
+            candidates = [item for cls in mro for item in self._typeIndex.get(cls)]
+        else:
+            candidates = self._nameIndex.get(value) if isinstance(value, str) else ()
+
+        res = []
+        for item in candidates:
+            if startItem is self._rootItem or self._isDescendant(item, startItem):
+                res.append(item)
+                if limit and len(res) >= limit:
+                    break
+        return res
+
+    @staticmethod
+    def _isDescendant(item: StandardItem, ancestor: StandardItem) -> bool:
+        item = item.parent()
+        while item is not None:
+            if item is ancestor:
+                return True
+            item = item.parent()
+        return False
+
+    def _fetchParentsOf(self, obj):
+        """Fetch the items of the parents of the referable, so that the item of the referable is created"""
+        parents = []
+        parent = getattr(obj, "parent", None)
+        while parent is not None and all(parent is not p for p in parents):
+            parents.append(parent)
+            parent = getattr(parent, "parent", None)
+
+        # fetch downwards from the innermost parent with created items, else from the root
+        for i, parent in enumerate(parents):
+            parentItems = list(self._objIndex.get(id(parent)))
+            if parentItems:
+                break
+        else:
+            i, parentItems = len(parents), [self._rootItem]
+        path = list(reversed([obj] + parents[:i]))
+        for parentItem in parentItems:
+            for child in path:
+                parentIndex = QModelIndex() if parentItem is self._rootItem \
+                    else self.createIndex(parentItem.row(), 0, parentItem)
+                self._fetchObj(parentIndex, child)
+                self._fetchUntil(parentIndex, lambda: bool(self._lookup(parentItem, OBJECT_ROLE, child, 1)),
+                                 self.MAX_FETCH_DEPTH)
+                childItems = self._lookup(parentItem, OBJECT_ROLE, child, 1)
+                if not childItems:
+                    break
+                parentItem = childItems[0]
+
+    def _fetchObj(self, parent: QModelIndex, obj):
+        """Fetch the rows of the item up to the row of the object at once, if its row is not fetched yet"""
+        item = self.objByIndex(parent)
+        if not item.populated:
+            self.fetchMore(parent)
+        pages = item.pages
+        if pages:
+            for i in range(pages.start, len(pages.objs)):
+                if pages.objs[i] is obj:
+                    self._fetchRows(parent, i - pages.start + 1)
+                    return
+
+    def _fetchUntil(self, parent: QModelIndex, found: Callable[[], bool], maxDepth: int) -> bool:
+        """Fetch items under the parent breadth first until found() returns True, at most maxDepth levels deep"""
+        if found():
+            return True
+        queue = deque([(parent, 1)])
+        while queue:
+            index, depth = queue.popleft()
+            while self.canFetchMore(index):
+                self.fetchMore(index)
+                if found():
+                    return True
+            if depth >= maxDepth:
+                continue
+            for row in range(self.rowCount(index)):
+                child = self.index(row, 0, index)
+                if self.hasChildren(child):
+                    queue.append((child, depth + 1))
+        return found()
+
+    def _indexItems(self, items: Iterable[StandardItem]):
+        """Add the items and their created descendants to the indexes used by match()"""
+        items = list(items)
+        while items:
+            item = items.pop()
+            self._indexItem(item)
+            items.extend(item.children())
+
+    def _indexItem(self, item: StandardItem):
+        self._unindexItem(item)
+        # the name column shows the object name, it is indexed without computing the display data
+        keys = (id(item.obj), type(item.obj), item.objectName)
+        self._indexedKeys[item] = keys
+        self._objIndex.add(keys[0], item)
+        self._typeIndex.add(keys[1], item)
+        if isinstance(keys[2], str):
+            self._nameIndex.add(keys[2], item)
+
+    def _unindexItem(self, item: StandardItem):
+        keys = self._indexedKeys.pop(item, None)
+        if keys is not None:
+            self._objIndex.discard(keys[0], item)
+            self._typeIndex.discard(keys[1], item)
+            self._nameIndex.discard(keys[2], item)
+
+    def _unindexItems(self, items: Iterable[StandardItem]):
+        """Remove the items and their descendants from the indexes used by match()"""
+        items = list(items)
+        while items:
+            item = items.pop()
+            self._unindexItem(item)
+            items.extend(item.children())
+
+    def _onRowsInserted(self, parent: QModelIndex, first: int, last: int):
+        self._indexItems(self.objByIndex(parent).children()[first:last + 1])
+
+    def _onRowsAboutToBeRemoved(self, parent: QModelIndex, first: int, last: int):
+        self._unindexItems(self.objByIndex(parent).children()[first:last + 1])
+
     def addItem(self, obj: Union[Package, 'SubmodelElement', Iterable],
                 parent: QModelIndex = QModelIndex()):
+        return self.addItems((obj,), parent)[0]
+
+    def addItems(self, objs: Iterable[Union[Package, 'SubmodelElement', Iterable]],
+                 parent: QModelIndex = QModelIndex()) -> List[QModelIndex]:
+        """
+        Add the objects to the parent object. Their items are inserted as one row range after the created
+        rows and recorded as one undo step. If adding an object fails, the objects added before keep their items.
+        """
         parent = parent.siblingAtColumn(0)
+        # populate before changing the object, so that the new items aren't created twice.
+        # Further pages are not created, the new items are inserted after the created rows
+        if not self.objByIndex(parent).populated:
+            self.fetchMore(parent)
+        newItems = []
+        target = self._addTarget(parent)
+        try:
+            for obj in objs:
+                newItems.append(self._addObj(obj, parent, target))
+        finally:
+            indexes = self._addItems(parent, newItems)
+        return indexes
+
+    def _addTarget(self, parent: QModelIndex) -> Tuple[StandardItem, Any, str, Optional[str]]:
+        """Return parent item, parent object, parent name and attribute to add to, the same for all added objects"""
         parentItem = self.objByIndex(parent)
         parentObj = parentItem.data(OBJECT_ROLE)
-        parentObjCls = type(parentObj)
-        parentName = parent.data(NAME_ROLE)
+        return parentItem, parentObj, parent.data(NAME_ROLE), ClassesInfo.changedParentObject(type(parentObj))
 
+    def _addObj(self, obj, parent: QModelIndex,
+                target: Tuple[StandardItem, Any, str, Optional[str]]) -> Tuple[type, dict]:
+        """Add the object to the parent object, return type and kwargs of the item to create"""
+        parentItem, parentObj, parentName, changedParentAttr = target
         kwargs = {
             "obj": obj,
             "parent": parentItem,
@@ -173,12 +517,15 @@ class StandardTable(QAbstractItemModel):
             kwargs["parent"] = self._rootItem
             kwargs["new"] = False
             itemTyp = PackTreeViewItem
+            IDENTIFIER_COMPLETIONS.addPackage(obj)
         elif parentName in Package.addableAttrs():
             package: Package = parent.data(PACKAGE_ROLE)
             package.add(obj)
+            if isinstance(obj, Identifiable):
+                IDENTIFIER_COMPLETIONS.addObject(package, obj)
             itemTyp = PackTreeViewItem
-        elif ClassesInfo.changedParentObject(parentObjCls): #FIXME: Refactor
-            parentObj = getattr(parentObj, ClassesInfo.changedParentObject(parentObjCls))
+        elif changedParentAttr: #FIXME: Refactor
+            parentObj = getattr(parentObj, changedParentAttr)
             parentObj.add(obj)
             itemTyp = PackTreeViewItem
         elif isinstance(parentObj, AbstractSet):
@@ -193,16 +540,33 @@ class StandardTable(QAbstractItemModel):
         else:
             raise AttributeError(
                 f"Object couldn't be added: parent obj type is not appendable: {type(parentObj)}")
-        return self._addItem(parent, itemTyp, kwargs)
+        return itemTyp, kwargs
 
-    def _addItem(self, parent: QModelIndex, itemTyp, kwargs):
-        self.beginInsertRows(parent, self.rowCount(parent), self.rowCount(parent))
-        item = itemTyp(**kwargs)
+    def _addItems(self, parent: QModelIndex, newItems: List[Tuple[type, dict]]) -> List[QModelIndex]:
+        if not newItems:
+            return []
+        if newItems[0][1]["parent"] is self._rootItem:
+            # packages are always added to the root
+            parent = QModelIndex()
+        first = self.rowCount(parent)
+        self.beginInsertRows(parent, first, first + len(newItems) - 1)
+        items = [self._createItem(itemTyp, kwargs) for itemTyp, kwargs in newItems]
         self.endInsertRows()
-        itemIndex = self.index(item.row(), 0, parent)
-        self.undo.append(SetDataItem(index=QPersistentModelIndex(itemIndex), value=NOT_GIVEN, role=CLEAR_ROW_ROLE))
+
+        if any(isinstance(item.obj, Identifiable) for item in items):
+            # references to the new objects become links
+            self.clearCache()
+        indexes = [self.createIndex(item.row(), 0, item) for item in items]
+        if len(indexes) == 1:
+            undo = SetDataItem(index=QPersistentModelIndex(indexes[0]), value=NOT_GIVEN, role=CLEAR_ROW_ROLE)
+        else:
+            undo = SetDataItem(index=QPersistentModelIndex(indexes[0]), value=len(indexes), role=CLEAR_ROWS_ROLE)
+        self.undo.append(undo)
         self.redo.clear()
-        return itemIndex
+        return indexes
+
+    def _createItem(self, itemTyp, kwargs) -> StandardItem:
+        return itemTyp(**kwargs)
 
     def insertRows(self, row: int, count: int, parent: QModelIndex = ...) -> bool:
         self.beginInsertRows(parent, row, row + count - 1)
@@ -210,35 +574,72 @@ class StandardTable(QAbstractItemModel):
         return True
 
     def update(self, index: QModelIndex):
-        """Update item: remove all children rows, then add updated rows"""
+        """
+        Update item: children rows are compared with the children of the current object,
+        only rows of changed children are removed, inserted or changed
+        """
         if not index.isValid():
             return QVariant()
-        if self.hasChildren(index):
-            self.beginRemoveRows(index, 0, max(self.rowCount(index)-1, 0))
-            self.removeRows(0, self.rowCount(index), index)
-            self.endRemoveRows()
-            self.rowsRemoved.emit(index, 0, max(self.rowCount(index)-1, 0))
-            self.dataChanged.emit(index, index.child(self.rowCount(index) - 1,
-                                                     self.columnCount(index) - 1))
-
-        self.objByIndex(index).populate()
-        if self.hasChildren(index):
-            self.beginInsertRows(index, 0, max(self.rowCount(index)-1, 0))
-            self.endInsertRows()
-            self.rowsInserted.emit(index, 0, max(self.rowCount(index)-1, 0))
-            self.dataChanged.emit(index, index.child(self.rowCount(index)-1, self.columnCount(index)-1))
-        else:
-            self.dataChanged.emit(index, index)
+        item = self.objByIndex(index)
+        item.clearCache()
+        if item.populated:
+            # children are created with the current values when the item is fetched
+            self._reconcile(index, item, *item.newChildren())
+        self.notifyChanged(index)
         return True
 
+    def _reconcile(self, index: QModelIndex, item: StandardItem, newChildren: List[StandardItem],
+                   newPages: Optional[ChildPages] = None):
+        """
+        Change the children of the item to the new children, equivalent children and their rows are kept
+        :param newPages: pages of the new children not created yet, replace the pages of the item
+        """
+        oldChildren = list(item.children())
+        opcodes = _diffOpcodes([_itemKey(child) for child in oldChildren],
+                               [_itemKey(child) for child in newChildren])
+        # process from the last rows, so that rows of the not yet processed blocks stay valid
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                for row, oldChild, newChild in zip(range(i1, i2), oldChildren[i1:i2], newChildren[j1:j2]):
+                    changed = oldChild.adopt(newChild)
+                    childIndex = self.createIndex(row, 0, oldChild)
+                    if oldChild.populated:
+                        newChild.fetchLike(oldChild)
+                        self._reconcile(childIndex, oldChild, newChild.children(), newChild.pages)
+                    if changed:
+                        self.notifyChanged(childIndex)
+                continue
+            if i2 > i1:
+                self.beginRemoveRows(index, i1, i2 - 1)
+                item.removeChildren(i1, i2 - i1)
+                self.endRemoveRows()
+            if j2 > j1:
+                self.beginInsertRows(index, i1, i1 + j2 - j1 - 1)
+                item.insertChildren(i1, newChildren[j1:j2])
+                self.endInsertRows()
+        item.pages = newPages
+        self._addPagedItem(item)
+
+    def refresh(self):
+        """Update all items to the current state of their objects, e.g. after they were changed in another model"""
+        with self.transaction():
+            self._rootItem.clearCache()
+            self._reconcile(QModelIndex(), self._rootItem, *self._rootItem.newChildren())
+            items = list(self._rootItem.children())
+            while items:
+                item = items.pop()
+                item.clearCache()
+                self._changedItems[item] = None
+                items.extend(item.children())
+
     def data(self, index: QModelIndex, role: int = ...) -> Any:
         if role == Qt.ForegroundRole:
-            return self._getFgColor(index)
+            return self.objByIndex(index).cachedData((role, index.column()), lambda: self._getFgColor(index))
         if role == Qt.FontRole:
             return self._getFont(index)
         if role == Qt.SizeHintRole:
             fontSize = self.currFont.pointSize()
-            return QSize(-1, (fontSize+2)*1.9)
+            return QSize(-1, int((fontSize+2)*1.9))
         if role == Qt.TextAlignmentRole:
             return Qt.AlignLeft | Qt.AlignVCenter
         if role == DATA_CHANGE_FAILED_ROLE:
@@ -289,15 +690,60 @@ class StandardTable(QAbstractItemModel):
         return QVariant()
 
     def _getFont(self, index: QModelIndex):
-        font = QFont(self.currFont)
+        # only the kind is cached per item, so that the items need no update if the font size changes
+        kind = self.objByIndex(index).cachedData((Qt.FontRole, index.column()), lambda: self._getFontKind(index))
+        return self.sharedFont(kind)
+
+    @staticmethod
+    def _getFontKind(index: QModelIndex) -> FontKind:
         if index.data(IS_LINK_ROLE):
-            font.setUnderline(True)
+            return FontKind.LINK
         elif index.column() == ATTRIBUTE_COLUMN:
-            font.setBold(True)
-            font.setUnderline(True)
+            return FontKind.ATTRIBUTE
         elif index.column() not in (TYPE_COLUMN, TYPE_HINT_COLUMN):
-            font.setItalic(True)
-        return font
+            return FontKind.VALUE
+        return FontKind.PLAIN
+
+    def sharedFont(self, kind: FontKind) -> QFont:
+        """Return the font of the kind in the current font size, the same instance is returned for all items"""
+        key = (kind, self.currFont.family(), self.currFont.pointSize())
+        try:
+            return self._sharedFonts[key]
+        except KeyError:
+            font = QFont(self.currFont)
+            if kind == FontKind.LINK:
+                font.setUnderline(True)
+            elif kind == FontKind.ATTRIBUTE:
+                font.setBold(True)
+                font.setUnderline(True)
+            elif kind == FontKind.VALUE:
+                font.setItalic(True)
+            self._sharedFonts[key] = font
+            return font
+
+    def clearCache(self, parent: QModelIndex = QModelIndex()):
+        """Drop the cached data of the item and all its created descendants"""
+        items = [self.objByIndex(parent)]
+        while items:
+            item = items.pop()
+            item.clearCache()
+            items.extend(item.children())
+
+    def _onDataChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex, roles: Iterable[int] = ()):
+        """Drop the cached data of the changed rows"""
+        if not topLeft.isValid() or (roles and not set(roles) & self.CACHED_ROLES):
+            return
+        parentItem = self.objByIndex(topLeft.parent())
+        lastRow = bottomRight.row() if bottomRight.parent() == topLeft.parent() else topLeft.row()
+        changedItems = parentItem.children()[topLeft.row():lastRow + 1]
+        # e.g. item and its children
+        if bottomRight.isValid() and bottomRight.parent() != topLeft.parent():
+            changedItems += self.objByIndex(bottomRight.parent()).children()[:bottomRight.row() + 1]
+        for item in changedItems:
+            item.clearCache()
+            if item in self._indexedKeys:
+                # e.g. object or name of the item changed
+                self._indexItem(item)
 
     def getLinkedItem(self, index: QModelIndex) -> QModelIndex:
         if not index.data(IS_LINK_ROLE):
@@ -312,9 +758,14 @@ class StandardTable(QAbstractItemModel):
             return QModelIndex()
 
     def setData(self, index: QModelIndex, value: Any, role: int = ...) -> bool:
+        # changes of one call, e.g. of an undo step, are emitted together
+        with self.transaction():
+            return self._setData(index, value, role)
+
+    def _setData(self, index: QModelIndex, value: Any, role: int = ...) -> bool:
         if isinstance(index, QPersistentModelIndex):
             index = QModelIndex(index)
-        if not index.isValid() and role not in (Qt.FontRole, ADD_ITEM_ROLE, UNDO_ROLE, REDO_ROLE):
+        if not index.isValid() and role not in (Qt.FontRole, ADD_ITEM_ROLE, ADD_ITEMS_ROLE, UNDO_ROLE, REDO_ROLE):
             return QVariant()
         elif role == Qt.FontRole:
             if isinstance(value, QFont):
@@ -324,18 +775,37 @@ class StandardTable(QAbstractItemModel):
                 return True
         elif role == ADD_ITEM_ROLE:
             try:
+                self.setPackObjAboutToChange(index)
                 self.addItem(value, index)
+                self.setPackObjChanged(index)
                 return True
             except Exception as e:
                 tb = traceback.format_exc()
                 self.lastErrorMsg = f"Error occurred while adding item to {index.data(NAME_ROLE)}: {e}\n\n{tb}"
                 print(self.lastErrorMsg)
                 self.dataChanged.emit(index, index, [DATA_CHANGE_FAILED_ROLE])
-        elif role == CLEAR_ROW_ROLE:
+        elif role == ADD_ITEMS_ROLE:
+            try:
+                self.setPackObjAboutToChange(index)
+                self.addItems(value, index)
+                self.setPackObjChanged(index)
+                return True
+            except Exception as e:
+                tb = traceback.format_exc()
+                self.lastErrorMsg = f"Error occurred while adding items to {index.data(NAME_ROLE)}: {e}\n\n{tb}"
+                print(self.lastErrorMsg)
+                self.dataChanged.emit(index, index, [DATA_CHANGE_FAILED_ROLE])
+        elif role in (CLEAR_ROW_ROLE, CLEAR_ROWS_ROLE):
             try:
                 parent = index.parent()
-                self.clearRow(index.row(), parent, value)
-                self.dataChanged.emit(parent, parent)
+                self.setPackObjAboutToChange(parent)
+                self.setPackObjChanged(index)
+                if role == CLEAR_ROWS_ROLE:
+                    # value is the number of rows to delete
+                    self.clearRows(index.row(), value, parent)
+                else:
+                    self.clearRow(index.row(), parent, value)
+                self.notifyChanged(parent)
                 return True
             except Exception as e:
                 tb = traceback.format_exc()
@@ -343,10 +813,16 @@ class StandardTable(QAbstractItemModel):
                 self.dataChanged.emit(index, index, [DATA_CHANGE_FAILED_ROLE])
         elif role == Qt.EditRole:
             try:
+                self.setPackObjAboutToChange(index)
+                oldIdentifier = self.packObjIdentifierOf(index)
                 newValue, oldValue = self.editItem(index, value)
                 self.setChanged(index)
+                self.setPackObjChanged(index)
+                self.setIdentifierChanged(index, oldIdentifier)
                 self.update(index)
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=oldValue, role=role))
+                # rapid edits of the same item are undone in one step, but not edits replaying the history
+                self.undo.append(SetDataItem(index=QPersistentModelIndex(index), value=oldValue, role=role),
+                                 merge=not self._replaying, shared=newValue)
                 self.redo.clear()
                 return True
             except Exception as e:
@@ -357,24 +833,24 @@ class StandardTable(QAbstractItemModel):
             if value == NOT_GIVEN and self.undo:
                 lastUndo: SetDataItem = self.undo.pop()
                 tempRedoList = self.redo
-                self.redo = []
-                if self.setData(*lastUndo):
+                self.redo = self._newHistory()
+                if self._replay(lastUndo):
                     self.redo = tempRedoList
                     self.redo.append(self.undo.pop())
                     return True
             elif isIterable(value):
-                self.undo = deque(value)
+                self.undo = self._newHistory(value)
                 return True
         elif role == REDO_ROLE:
             if value == NOT_GIVEN and self.redo:
                 lastRedo: SetDataItem = self.redo.pop()
                 tempRedoList = self.redo
-                self.redo = []
-                if self.setData(*lastRedo):
+                self.redo = self._newHistory()
+                if self._replay(lastRedo):
                     self.redo = tempRedoList
                     return True
             elif isIterable(value):
-                self.redo = list(value)
+                self.redo = self._newHistory(value)
                 return True
         elif role == UPDATE_ROLE:
             self.update(index)
@@ -382,6 +858,32 @@ class StandardTable(QAbstractItemModel):
             raise ValueError(f"Unknown role: {role}")
         return False
 
+    def _newHistory(self, entries: Iterable[SetDataItem] = ()) -> UndoHistory:
+        return UndoHistory(entries, maxSize=MAX_UNDO_SIZE, mergeInterval=UNDO_MERGE_INTERVAL, isLive=self.isLive)
+
+    def livePackages(self) -> List[Package]:
+        """Return the opened packages whose objects are shown by the model"""
+        return [item.obj for item in self._rootItem.children() if isinstance(item.obj, Package)]
+
+    def isLive(self, obj) -> bool:
+        """
+        Return True if the object is kept alive by an opened package of the model: the package itself,
+        its file store or one of its identifiables. Undo entries referencing it don't count its size.
+        """
+        for package in self.livePackages():
+            if obj is package or obj is package.fileStore \
+                    or (isinstance(obj, Identifiable) and obj in package.objStore):
+                return True
+        return False
+
+    def _replay(self, entry: SetDataItem) -> bool:
+        """Set data of the undo or redo entry, which records the reverting change in the undo history"""
+        self._replaying = True
+        try:
+            return self.setData(*entry)
+        finally:
+            self._replaying = False
+
     def editItem(self, index: QModelIndex, value):
         newValue = None if str(value) == "None" else value
         item = self.objByIndex(index)
@@ -413,7 +915,9 @@ class StandardTable(QAbstractItemModel):
             except TypeError as e:
                 # FIXME: Warning:pyi40aas specific code part for setting Property.value
                 try:
-                    valueTypeItem = self.match(QModelIndex(), Qt.DisplayRole, "value_type", 1)[0]
+                    # value_type is a sibling of the value
+                    self.ensureFetched(index.parent())
+                    valueTypeItem = self.match(index.parent(), Qt.DisplayRole, "value_type", 1)[0]
                     self.setData(valueTypeItem, type(newValue), Qt.EditRole)
                 except IndexError:
                     raise e
@@ -424,25 +928,79 @@ class StandardTable(QAbstractItemModel):
     def setChanged(self, topLeft: QModelIndex, bottomRight: QModelIndex = None):
         """Set the item and all parents as changed"""
         bottomRight = topLeft if bottomRight is None else bottomRight
-        if topLeft.isValid() and bottomRight.isValid():
-            selection = QItemSelection(topLeft, bottomRight)
-            for index in selection.indexes():
-                self.objByIndex(index).changed = True
-                if index.parent().isValid():
-                    self.setChanged(index.parent())
+        if not topLeft.isValid() or not bottomRight.isValid():
+            return
+        for row in range(topLeft.row(), bottomRight.row() + 1):
+            index = topLeft.sibling(row, 0)
+            while index.isValid():
+                item = self.objByIndex(index)
+                item.changed = True
+                self.notifyChanged(index)
+                if not index.parent().isValid():
+                    break
+                index = index.parent()
+
+            packItem: QModelIndex = index.data(PACK_ITEM_ROLE)
+            if packItem and packItem.isValid():
+                packModel = packItem.model()
+                if hasattr(packModel, "notifyChanged"):
+                    packModel.notifyChanged(packItem)
                 else:
-                    packItem: QModelIndex = index.data(PACK_ITEM_ROLE)
-                    if packItem and packItem.isValid():
-                        packItem.model().dataChanged.emit(packItem, packItem)
+                    packModel.dataChanged.emit(packItem, packItem)
+
+    def packObjOf(self, index: QModelIndex) -> Tuple[Optional[Identifiable], Optional[Package]]:
+        """Return the identifiable containing the item and its package"""
+        item = self.objByIndex(index)
+        while item is not None:
+            if isinstance(item.obj, Identifiable):
+                return item.obj, item.data(PACKAGE_ROLE)
+            item = item.parent()
+
+        # item of a detailed info table: continue with the parents of the pack item
+        packItem = self.data(index, PACK_ITEM_ROLE)
+        while isinstance(packItem, QModelIndex) and packItem.isValid():
+            obj = packItem.data(OBJECT_ROLE)
+            if isinstance(obj, Identifiable):
+                return obj, packItem.data(PACKAGE_ROLE)
+            packItem = packItem.parent()
+        return None, None
+
+    def setPackObjAboutToChange(self, index: QModelIndex):
+        """Let the package keep the identifiable containing the item for snapshots being written"""
+        obj, package = self.packObjOf(index)
+        if obj is not None and isinstance(package, Package):
+            package.aboutToChange(obj)
+
+    def setPackObjChanged(self, index: QModelIndex):
+        """Mark the identifiable containing the item as changed in its package"""
+        obj, package = self.packObjOf(index)
+        if obj is not None and isinstance(package, Package):
+            package.setChanged(obj)
+
+    def packObjIdentifierOf(self, index: QModelIndex) -> Optional[Identifier]:
+        """Return a copy of the identification of the identifiable containing the item, it may be edited in place"""
+        obj, package = self.packObjOf(index)
+        if obj is None or not isinstance(package, Package) or obj.identification is None:
+            return None
+        return Identifier(obj.identification.id, obj.identification.id_type)
+
+    def setIdentifierChanged(self, index: QModelIndex, oldIdentifier: Optional[Identifier]):
+        """
+        Record the change in the package if the identification of the identifiable containing the item
+        was edited, either as a whole or via its id or id_type
+        :param oldIdentifier: identification before the edit, see packObjIdentifierOf()
+        """
+        obj, package = self.packObjOf(index)
+        if oldIdentifier is None or not isinstance(package, Package) or obj.identification == oldIdentifier:
+            return
+        package.setIdentifierChanged(obj, oldIdentifier)
+        IDENTIFIER_COMPLETIONS.updateIdentifiers(package)
 
     def removeRows(self, row: int, count: int, parent: QModelIndex = ...) -> bool:
         parentItem = self.objByIndex(parent)
 
         self.beginRemoveRows(parent, row, row+count-1)
-        for n in range(count):
-            child = parentItem.children()[row]
-            child.setParent(None)
-            # child.deleteLater()
+        parentItem.removeChildren(row, count)
         self.endRemoveRows()
         return True
 
@@ -461,37 +1019,53 @@ class StandardTable(QAbstractItemModel):
             except AttributeError:
                 pass
 
-        for currRow in range(row+count-1, row-1, -1):
-            child = parentItem.children()[currRow]
-            if isinstance(parentObj, (list, dict, AbstractSet)):
+        if isinstance(parentObj, (list, dict, AbstractSet)):
+            oldValues = []
+            for currRow in range(row+count-1, row-1, -1):
+                child = parentItem.children()[currRow]
                 if isinstance(parentObj, list):
                     oldValue = parentObj.pop(currRow)
                 elif isinstance(parentObj, dict):
                     oldValue: DictItem = child.data(OBJECT_ROLE)
                     parentObj.pop(oldValue.key)
-                elif isinstance(parentObj, AbstractSet):
+                else:
                     parentObj.discard(child.obj)
                     oldValue = child.obj
+                    if isinstance(oldValue, Identifiable):
+                        IDENTIFIER_COMPLETIONS.removeObject(child.data(PACKAGE_ROLE), oldValue)
+                oldValues.append(oldValue)
+            oldValues.reverse()
+            self.removeRows(row, count, parent)
+            if any(isinstance(oldValue, Identifiable) for oldValue in oldValues):
+                self.clearCache()
+            # removed rows are restored with one undo step
+            if len(oldValues) == 1:
+                undo = SetDataItem(index=QPersistentModelIndex(parent), value=oldValues[0], role=ADD_ITEM_ROLE)
+            else:
+                undo = SetDataItem(index=QPersistentModelIndex(parent), value=oldValues, role=ADD_ITEMS_ROLE)
+            self.undo.append(undo)
+            self.redo.clear()
+            return True
+
+        for currRow in range(row+count-1, row-1, -1):
+            child = parentItem.children()[currRow]
+            if not defaultVal == NOT_GIVEN:
+                index = self.index(currRow, 0, parent)
+                self.setData(index, defaultVal, Qt.EditRole)
+            elif isinstance(child.obj, Package):
+                # close package
+                oldValue = child.obj
                 self.removeRow(currRow, parent)
-                self.undo.append(SetDataItem(index=QPersistentModelIndex(parent), value=oldValue, role=ADD_ITEM_ROLE))
+                IDENTIFIER_COMPLETIONS.removePackage(oldValue)
+                self.undo.append(
+                    SetDataItem(index=QPersistentModelIndex(parent), value=oldValue,
+                                role=ADD_ITEM_ROLE))
                 self.redo.clear()
             else:
-                if not defaultVal == NOT_GIVEN:
-                    index = self.index(currRow, 0, parent)
-                    self.setData(index, defaultVal, Qt.EditRole)
-                elif isinstance(child.obj, Package):
-                    # close package
-                    oldValue = child.obj
-                    self.removeRow(currRow, parent)
-                    self.undo.append(
-                        SetDataItem(index=QPersistentModelIndex(parent), value=oldValue,
-                                    role=ADD_ITEM_ROLE))
-                    self.redo.clear()
-                else:
-                    raise TypeError(
-                        f"Unknown parent object type: "
-                        f"object could not be deleted or set to default: "
-                        f"{type(parentObj)}")
+                raise TypeError(
+                    f"Unknown parent object type: "
+                    f"object could not be deleted or set to default: "
+                    f"{type(parentObj)}")
         return True
 
     def clearRow(self, row: int, parent: QModelIndex = ..., defaultVal=NOT_GIVEN) -> bool:
@@ -0,0 +1,156 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import sys
+import time
+from collections import deque, namedtuple
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Tuple
+
+from PyQt5.QtCore import Qt
+
+# delta recorded for undo/redo: setting value with role at index reverts the change,
+# e.g. old value of an edited attribute or the objects of removed rows
+SetDataItem = namedtuple("SetDataItem", ("index", "value", "role"))
+
+# memory of an entry without its value: entry, persistent index and bookkeeping
+ENTRY_SIZE = 200
+# attributes not followed when the size of a value is estimated, they reference the surrounding model
+IGNORED_ATTRS = frozenset(("parent",))
+
+
+def _notLive(obj) -> bool:
+    return False
+
+
+def estimateSize(obj, shared=None, isLive: Optional[Callable[[Any], bool]] = None) -> int:
+    """
+    Return estimated memory of the object and the objects it references, except of its parents,
+    of live objects and of the objects referenced by shared
+    :param shared: e.g. the new value of an edit, objects it references are not kept alive by the old value
+    :param isLive: returns True for objects which are kept alive anyway, e.g. identifiables of opened packages,
+                   the estimation doesn't enter them. Objects only referenced by the entry are always counted,
+                   e.g. removed submodels or closed packages
+    """
+    isLive = isLive or _notLive
+    seen = set()
+    if shared is not None:
+        _walk(shared, lambda sharedObj: 0, seen, isLive)
+    return _walk(obj, sys.getsizeof, seen, isLive)
+
+
+def _walk(root, getsizeof, seen: set, isLive: Callable[[Any], bool]) -> int:
+    """Return sum of the sizes of the objects reachable from root which are not seen yet"""
+    size = 0
+    objs = [root]
+    while objs:
+        obj = objs.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool, type)) or obj is None:
+            size += getsizeof(obj)
+            continue
+        if isLive(obj):
+            continue
+        try:
+            size += getsizeof(obj)
+        except TypeError:
+            continue
+        if isinstance(obj, dict):
+            objs.extend(obj.keys())
+            objs.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            objs.extend(obj)
+        objDict = getattr(obj, "__dict__", None)
+        if isinstance(objDict, dict):
+            objs.extend(value for attr, value in objDict.items() if attr not in IGNORED_ATTRS)
+    return size
+
+
+class UndoHistory:
+    """
+    Undo or redo stack of SetDataItem deltas, which is bounded by the estimated memory of its entries.
+    If the stack exceeds its maximum size, the oldest entries are evicted, the newest entry is always kept.
+    Consecutive edits of the same index within the merge interval are merged into one entry.
+    """
+
+    def __init__(self, entries: Iterable[SetDataItem] = (), maxSize: int = sys.maxsize,
+                 mergeInterval: float = 0, isLive: Optional[Callable[[Any], bool]] = None):
+        """:param isLive: objects not counted in the size of the entries, see estimateSize"""
+        self.maxSize = maxSize
+        self.mergeInterval = mergeInterval
+        self.isLive = isLive
+        # entry, estimated size, time of the last change recorded by the entry
+        self._entries: Deque[Tuple[SetDataItem, int, float]] = deque()
+        self._size = 0
+        self.extend(entries)
+
+    @property
+    def size(self) -> int:
+        """Estimated memory of the entries in bytes"""
+        return self._size
+
+    def append(self, entry: SetDataItem, merge: bool = False, shared=None):
+        """
+        Push the entry
+        :param merge: merge the entry into the last entry, if both are edits of the same index
+                      recorded within the merge interval, the last entry keeps the older value
+        :param shared: value sharing objects with the value of the entry, which are not counted, see estimateSize
+        """
+        now = time.monotonic()
+        if merge and self._entries:
+            lastEntry, lastSize, lastTime = self._entries[-1]
+            if entry.role == lastEntry.role == Qt.EditRole and entry.index == lastEntry.index \
+                    and now - lastTime <= self.mergeInterval:
+                self._entries[-1] = (lastEntry, lastSize, now)
+                return
+        size = ENTRY_SIZE + estimateSize(entry.value, shared, self.isLive)
+        self._entries.append((entry, size, now))
+        self._size += size
+        self._evict()
+
+    def extend(self, entries: Iterable[SetDataItem]):
+        for entry in entries:
+            self.append(entry)
+
+    def pop(self) -> SetDataItem:
+        entry, size, _ = self._entries.pop()
+        self._size -= size
+        return entry
+
+    def replaceLast(self, entry: SetDataItem):
+        """Replace the last entry, e.g. to record a different value for the last change"""
+        _, lastSize, lastTime = self._entries.pop()
+        self._size -= lastSize
+        size = ENTRY_SIZE + estimateSize(entry.value, isLive=self.isLive)
+        self._entries.append((entry, size, lastTime))
+        self._size += size
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def _evict(self):
+        while self._size > self.maxSize and len(self._entries) > 1:
+            _, size, _ = self._entries.popleft()
+            self._size -= size
+
+    def __getitem__(self, i: int) -> SetDataItem:
+        return self._entries[i][0]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[SetDataItem]:
+        return (entry for entry, _, _ in self._entries)
+
+    def __repr__(self):
+        return f"UndoHistory({len(self)} entries, {self._size} bytes)"
@@ -8,32 +8,237 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
+import copy
+import hashlib
 import io
+import logging
+import os
+import tempfile
+import threading
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Union, Iterable, Optional
+from typing import Union, Iterable, Optional, Callable, Dict, Tuple, List, NamedTuple, Set
 import mimetypes
 
 import pyecma376_2
 from basyx.aas.adapter import aasx
-from basyx.aas.adapter.aasx import DictSupplementaryFileContainer
+from basyx.aas.adapter.aasx import AbstractSupplementaryFileContainer
 from basyx.aas.model import AssetAdministrationShell, Asset, Submodel, ConceptDescription, \
-    DictObjectStore, Key, AASReference, concept
+    DictObjectStore, AASReference, concept, Identifiable, Identifier
 
-from aas_editor.settings import DEFAULT_COMPLETIONS, AppSettings
+from aas_editor.aasx_io import PartRecordingAASXReader, IncrementalAASXWriter, readAasXmlFileInto, \
+    readAasJsonFileInto, readArchivePart, supplementaryFilesOf, RawPart
+from aas_editor.file_container import ZipSupplementaryFileContainer, CHUNK_SIZE
+from aas_editor.package_cache import PackageCache, CachedPackage
+from aas_editor.settings import AppSettings
 from aas_editor.utils.util_classes import ClassesInfo
 
+logger = logging.getLogger(__name__)
+
+
+class LoadingCancelled(Exception):
+    """Raised if reading of a package was cancelled by the user"""
+
+
+class ProgressFile(io.RawIOBase):
+    """
+    Binary file wrapper which reports the number of read bytes and
+    raises LoadingCancelled on the next read after cancelling was requested.
+    Optionally the content is hashed while it is read.
+    """
+    def __init__(self, file: Union[str, Path],
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 isCancelled: Optional[Callable[[], bool]] = None,
+                 hashContent: bool = False):
+        """:param hashContent: hash the content while it is read, see contentHash()"""
+        super(ProgressFile, self).__init__()
+        self._file = open(file, "rb")
+        self.size = Path(file).stat().st_size
+        self.bytesRead = 0
+        self._progress = progress
+        self._isCancelled = isCancelled
+        self._sha = hashlib.sha256() if hashContent else None
+        # the content is hashed as far as it was read in order from the start
+        self._hashedSize = 0
+
+    def _hash(self, pos: int, data):
+        if self._sha is not None and pos <= self._hashedSize < pos + len(data):
+            self._sha.update(data[self._hashedSize - pos:])
+            self._hashedSize = pos + len(data)
+
+    def contentHash(self) -> str:
+        """
+        Return the sha256 hex digest of the file. Only the part which was not read in order
+        from the start is read again, e.g. the most of an XML or JSON file is hashed while it is parsed.
+        """
+        if self._sha is None:
+            raise ValueError("File was not opened with hashContent")
+        pos = self._file.tell()
+        self._file.seek(self._hashedSize)
+        for chunk in iter(lambda: self._file.read(CHUNK_SIZE), b""):
+            self._hash(self._hashedSize, chunk)
+        self._file.seek(pos)
+        return self._sha.hexdigest()
+
+    def _report(self, numOfBytes: int):
+        if self._isCancelled and self._isCancelled():
+            raise LoadingCancelled("Loading of the file was cancelled")
+        self.bytesRead = min(self.bytesRead + numOfBytes, self.size)
+        if self._progress:
+            self._progress(self.bytesRead, self.size)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        pos = self._file.tell()
+        numOfBytes = self._file.readinto(b)
+        self._hash(pos, memoryview(b)[:numOfBytes])
+        self._report(numOfBytes)
+        return numOfBytes
+
+    def read(self, size=-1) -> bytes:
+        pos = self._file.tell()
+        data = self._file.read(size)
+        self._hash(pos, data)
+        self._report(len(data))
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+        super(ProgressFile, self).close()
+
+
+class IdentifierChange(NamedTuple):
+    obj: Identifiable
+    oldIdentifier: Identifier
+    newIdentifier: Identifier
+
+
+class SourcePart(NamedTuple):
+    obj: Identifiable
+    # name of the archive part which contains only the object
+    partName: str
+
+
+class ChangeLog:
+    """Identifiables of a package marked as changed since the log was taken last, see Package.trackChanges()"""
+
+    def __init__(self):
+        self._changed: Dict[int, Identifiable] = {}
+
+    def add(self, obj: Identifiable):
+        self._changed[id(obj)] = obj
+
+    def take(self) -> List[Identifiable]:
+        """Return the changed identifiables and clear the log"""
+        changed = list(self._changed.values())
+        self._changed.clear()
+        return changed
+
+    def __len__(self) -> int:
+        return len(self._changed)
+
+
+class IndexedObjectStore(DictObjectStore):
+    """DictObjectStore which additionally indexes stored objects by their type"""
+
+    def __init__(self, objects: Iterable[Identifiable] = ()):
+        # type -> {id(obj): obj}
+        self._typeIndex: Dict[type, Dict[int, Identifiable]] = {}
+        # requested type -> stored types which are subclasses of it
+        self._subtypesCache: Dict[type, Tuple[type, ...]] = {}
+        super(IndexedObjectStore, self).__init__(objects)
+
+    @staticmethod
+    def _key(x: Identifiable) -> Identifier:
+        # objects are stored under a copy of their identifier, so that the key stays valid
+        # if the identifier is edited in place, until the object is rekeyed
+        return Identifier(x.identification.id, x.identification.id_type)
+
+    def add(self, x: Identifiable) -> None:
+        key = self._key(x)
+        if self._backend.get(key, x) is not x:
+            raise KeyError(f"Identifiable object with same identification {key} is already stored in this store")
+        self._backend[key] = x
+        typ = type(x)
+        if typ not in self._typeIndex:
+            self._typeIndex[typ] = {}
+            self._subtypesCache.clear()
+        self._typeIndex[typ][id(x)] = x
+
+    def discard(self, x: Identifiable) -> None:
+        # the backend keeps the object if it is stored under another key, e.g. after its identifier was changed
+        removed = self._backend.get(x.identification) is x
+        super(IndexedObjectStore, self).discard(x)
+        if removed:
+            self._typeIndex.get(type(x), {}).pop(id(x), None)
+
+    def rekey(self, x: Identifiable, oldIdentifier: Identifier) -> None:
+        """Store the object under its current identifier if it is stored under the old one"""
+        if self._backend.get(oldIdentifier) is x:
+            del self._backend[oldIdentifier]
+            self._backend[self._key(x)] = x
+
+    def _subtypes(self, objtype: type) -> Tuple[type, ...]:
+        try:
+            return self._subtypesCache[objtype]
+        except KeyError:
+            subtypes = tuple(typ for typ in self._typeIndex if issubclass(typ, objtype))
+            self._subtypesCache[objtype] = subtypes
+            return subtypes
+
+    def iterObjects(self, objtype: type) -> Tuple[Identifiable, ...]:
+        """Return stored objects of the given type"""
+        objects = []
+        for typ in self._subtypes(objtype):
+            objects.extend(self._typeIndex[typ].values())
+        return tuple(objects)
+
+    def numOfObjects(self, objtype: type) -> int:
+        return sum(len(self._typeIndex[typ]) for typ in self._subtypes(objtype))
+
 
 class Package:
-    def __init__(self, file: Union[str, Path] = ""):
-        """:raise TypeError if file has wrong file type"""
-        self.objStore = DictObjectStore()
-        self.fileStore = DictSupplementaryFileContainer()
+    def __init__(self, file: Union[str, Path] = "",
+                 progress: Optional[Callable[[int, int], None]] = None,
+                 isCancelled: Optional[Callable[[], bool]] = None,
+                 cache: Optional[PackageCache] = None):
+        """
+        :param progress: callback getting the number of read bytes and the file size
+        :param isCancelled: callback, reading is stopped with LoadingCancelled if it returns True
+        :param cache: cache to take the parsed package from, if the file is unchanged
+        :raise TypeError if file has wrong file type
+        :raise LoadingCancelled if reading was cancelled
+        """
+        self.objStore = IndexedObjectStore()
+        self.fileStore = ZipSupplementaryFileContainer()
+        # id(obj) -> archive part the obj was read from or written to, dropped when the obj is set changed
+        self._sourceParts: Dict[int, SourcePart] = {}
+        # snapshots taken but not committed yet, they collect the objects changed meanwhile
+        self._pendingSnapshots: 'weakref.WeakSet[PackageSnapshot]' = weakref.WeakSet()
+        # logs of the consumers of changes, e.g. validation reports
+        self._changeLogs: 'weakref.WeakSet[ChangeLog]' = weakref.WeakSet()
+        # number of the last change
+        self._changeId = 0
+        # log of identifier changes not yet taken by every consumer, the package itself rekeys objStore with them
+        self.identifierChanges: List[IdentifierChange] = []
+        # number of changes dropped from the log, consumer -> number of changes taken by the consumer
+        self._numOfDroppedChanges = 0
+        self._identifierChangesConsumers: Dict[object, int] = {self: 0}
         self.file = file
         if file:
-            self._read()
-        for obj in self.objStore:
-            DEFAULT_COMPLETIONS[Key]["value"].append(obj.identification.id)
+            self._read(progress, isCancelled, cache)
         self._changed = False
 
     @classmethod
@@ -56,6 +261,10 @@ class Package:
     def submodelSplitParts(self):
         return AppSettings.SUBMODEL_SPLIT_PARTS.value()
 
+    @property
+    def incrementalSave(self):
+        return AppSettings.INCREMENTAL_SAVE.value()
+
     @property
     def allSubmodelRefsToAas(self):
         return AppSettings.ALL_SUBMODEL_REFS_TO_AAS.value()
@@ -70,28 +279,157 @@ class Package:
     def __repr__(self):
         return self.file.as_posix()
 
-    def _read(self):
+    def _read(self, progress=None, isCancelled=None, cache: Optional[PackageCache] = None):
         fileType = self.file.suffix.lower().strip()
-        if fileType == ".xml":
-            self.objStore = aasx.read_aas_xml_file(self.file.as_posix())
-        elif fileType == ".json":
-            with open(self.file, "r") as f:  # TODO change if aas changes
-                self.objStore = aasx.read_aas_json_file(f)
-        elif fileType == ".aasx":
-            reader = aasx.AASXReader(self.file.as_posix())
-            reader.read_into(self.objStore, self.fileStore)
-        else:
+        if fileType not in (".xml", ".json", ".aasx"):
             raise TypeError("Wrong file type:", self.file.suffix)
 
+        if cache:
+            cached = cache.load(self.file, lambda: ProgressFile(self.file, progress, isCancelled))
+            if cached and self._readFromCache(cached, fileType):
+                return
+            stat = cache.stat(self.file)
+
+        # objStore and fileStore are replaced only after the whole file was read
+        objStore = IndexedObjectStore()
+        fileStore = ZipSupplementaryFileContainer(self.file) if fileType == ".aasx" else ZipSupplementaryFileContainer()
+        sourceParts = {}
+        sha = None
+        with ProgressFile(self.file, progress, isCancelled, hashContent=cache is not None) as f:
+            if fileType == ".xml":
+                readAasXmlFileInto(objStore, f)
+            elif fileType == ".json":
+                readAasJsonFileInto(objStore, f)  # TODO change if aas changes
+            elif fileType == ".aasx":
+                reader = PartRecordingAASXReader(f)
+                reader.read_into(objStore, fileStore)
+                for partName, objects in reader.objectsOfParts.items():
+                    if len(objects) == 1 and objStore._backend.get(objects[0].identification) is objects[0]:
+                        sourceParts[id(objects[0])] = SourcePart(objects[0], partName)
+            if cache:
+                sha = f.contentHash()
+        self.objStore = objStore
+        self.fileStore = fileStore
+        self._sourceParts = sourceParts
+
+        if cache:
+            objects = list(objStore)
+            indexes = {id(obj): i for i, obj in enumerate(objects)}
+            try:
+                cache.store(self.file, stat, objects, fileStore.fileIndex(),
+                            [(indexes[key], part.partName) for key, part in sourceParts.items()], sha)
+            except Exception as e:
+                logger.warning("Package %s couldn't be stored in cache: %s", self.file, e)
+
+    def _readFromCache(self, cached: CachedPackage, fileType: str) -> bool:
+        fileStore = ZipSupplementaryFileContainer(self.file) if fileType == ".aasx" else ZipSupplementaryFileContainer()
+        try:
+            fileStore.restoreFiles(cached.files)
+        except KeyError as e:
+            logger.warning("Cached files of %s don't fit the file: %s", self.file, e)
+            return False
+        self.objStore = IndexedObjectStore(cached.objects)
+        self.fileStore = fileStore
+        self._sourceParts = {}
+        for i, partName in cached.sourceParts:
+            obj = cached.objects[i]
+            self._sourceParts[id(obj)] = SourcePart(obj, partName)
+        return True
+
+    @property
+    def changeId(self) -> int:
+        """Number of the last change, it increases with every change of an object of the package"""
+        return self._changeId
+
+    def setChanged(self, obj: Identifiable):
+        """
+        Mark the object as changed, so that it is serialized anew on the next save.
+        Every change of an identifiable must be marked, unmarked changes are lost if its part is copied.
+        """
+        self._changeId += 1
+        self._sourceParts.pop(id(obj), None)
+        for snapshot in self._pendingSnapshots:
+            snapshot.changedObjs.add(id(obj))
+        for changeLog in self._changeLogs:
+            changeLog.add(obj)
+
+    def trackChanges(self) -> ChangeLog:
+        """
+        Return a new log collecting the identifiables marked as changed from now on.
+        The log is kept up to date as long as it is referenced by the consumer
+        """
+        changeLog = ChangeLog()
+        self._changeLogs.add(changeLog)
+        return changeLog
+
+    def aboutToChange(self, obj: Identifiable):
+        """
+        Must be called before the object is changed, so that snapshots not written yet
+        copy the object as it was when they were taken
+        """
+        for snapshot in self._pendingSnapshots:
+            snapshot.objStore.keep(obj)
+
+    def _sourcePartOf(self, obj: Identifiable) -> Optional[SourcePart]:
+        """Return the archive part the object was read from or written to, if it is unchanged since then"""
+        part = self._sourceParts.get(id(obj))
+        if part is None or part.obj is not obj:
+            return None
+        return part
+
+    def setIdentifierChanged(self, obj: Identifiable, oldIdentifier: Identifier):
+        """
+        Record that the identification of the object was changed. The log entry is available
+        to the consumers of takeIdentifierChanges(), the object is rekeyed in objStore before the next save.
+        """
+        self.identifierChanges.append(IdentifierChange(obj, oldIdentifier, obj.identification))
+
+    def addIdentifierChangesConsumer(self, consumer):
+        """Register a consumer of takeIdentifierChanges(), it takes the changes recorded from now on"""
+        self._identifierChangesConsumers[consumer] = self._numOfDroppedChanges + len(self.identifierChanges)
+
+    def removeIdentifierChangesConsumer(self, consumer):
+        self._identifierChangesConsumers.pop(consumer, None)
+        self._dropTakenIdentifierChanges()
+
+    def takeIdentifierChanges(self, consumer) -> List[IdentifierChange]:
+        """
+        Return changes recorded since the last call of the consumer.
+        Changes taken by every consumer are dropped from the log.
+        :raise KeyError if the consumer is not registered
+        """
+        start = self._identifierChangesConsumers[consumer] - self._numOfDroppedChanges
+        changes = self.identifierChanges[start:]
+        self._identifierChangesConsumers[consumer] = self._numOfDroppedChanges + len(self.identifierChanges)
+        self._dropTakenIdentifierChanges()
+        return changes
+
+    def _dropTakenIdentifierChanges(self):
+        numOfTakenByAll = min(self._identifierChangesConsumers.values()) - self._numOfDroppedChanges
+        if numOfTakenByAll > 0:
+            del self.identifierChanges[:numOfTakenByAll]
+            self._numOfDroppedChanges += numOfTakenByAll
+
     def _update_objstore(self):
-        old_identifiers = list(self.objStore._backend.keys())
-        for i in old_identifiers:
-            obj = self.objStore.get_identifiable(i)
-            if i != obj.identification:
-                self.objStore._backend[obj.identification] = obj
-                del self.objStore._backend[i]
+        """Rekey objects whose identification changed since the last update"""
+        for change in self.takeIdentifierChanges(self):
+            self.objStore.rekey(change.obj, change.oldIdentifier)
 
     def write(self, file: str = None):
+        """Write the package synchronously"""
+        snapshot = self.snapshot(file)
+        try:
+            snapshot.write()
+            self.commitSnapshot(snapshot)
+        finally:
+            snapshot.discard()
+
+    def snapshot(self, file: str = None) -> 'PackageSnapshot':
+        """
+        Prepare the package for writing and return a copy of it, which can be written
+        in another thread while the package is changed further
+        :raise TypeError if file has wrong file type
+        """
         self._update_objstore()
 
         if self.allSubmodelRefsToAas:
@@ -102,30 +440,25 @@ class Package:
             self.file: Path = file
 
         fileType = self.file.suffix.lower().strip()
-        if fileType == ".xml": #FIXME: if file in write_aas_xml_file() changes
-            with open(self.file.as_posix(), "w") as fileIO:
-                aasx.write_aas_xml_file(fileIO, self.objStore)
-        elif fileType == ".json": #FIXME: if file in write_aas_xml_file() changes
-            with open(self.file.as_posix(), "w") as fileIO:
-                aasx.write_aas_json_file(fileIO, self.objStore)
-        elif fileType == ".aasx":
-            with aasx.AASXWriter(self.file.as_posix()) as writer:
-                aas_ids = []
-                for obj in self.objStore:
-                    if isinstance(obj, AssetAdministrationShell):
-                        aas_ids.append(obj.identification)
-                for aas_id in aas_ids:
-                    writer.write_aas(aas_id, self.objStore, self.fileStore,
-                                     write_json=self.writeJsonInAasx,
-                                     submodel_split_parts=self.submodelSplitParts)
-                # Create OPC/AASX core properties
-                cp = pyecma376_2.OPCCoreProperties()
-                cp.created = datetime.now()
-                from aas_editor.settings.app_settings import AAS_CREATOR
-                cp.creator = AAS_CREATOR
-                writer.write_core_properties(cp)
-        else:
+        if fileType not in (".xml", ".json", ".aasx"):
             raise TypeError("Wrong file type:", self.file.suffix)
+        snapshot = PackageSnapshot(self)
+        self._pendingSnapshots.add(snapshot)
+        return snapshot
+
+    def commitSnapshot(self, snapshot: 'PackageSnapshot'):
+        """Replace the package file with the written snapshot. Must be called in the main thread"""
+        if snapshot.fileType == ".aasx" and isinstance(self.fileStore, ZipSupplementaryFileContainer):
+            # supplementary files are read from the new file from now on,
+            # the file store is switched only after the file was replaced
+            self.fileStore.rebase(snapshot.tempFile, snapshot.file)
+        else:
+            os.replace(snapshot.tempFile, snapshot.file)
+        self._pendingSnapshots.discard(snapshot)
+        if snapshot.fileType == ".aasx":
+            # objects changed while the snapshot was written differ from their written parts
+            self._sourceParts = {key: part for key, part in snapshot.writtenParts.items()
+                                 if key not in snapshot.changedObjs}
 
     def all_submodels_to_aas(self):
         """Add references of all existing submodels to submodel attribute of existing AAS."""
@@ -181,9 +514,7 @@ class Package:
     #             yield obj
 
     def _iter_objects(self, objtype):
-        for obj in self.objStore:
-            if isinstance(obj, objtype):
-                yield obj
+        yield from self.objStore.iterObjects(objtype)
 
     @property
     def files(self):
@@ -195,30 +526,231 @@ class Package:
             newName = self.fileStore.add_file(name=obj.name, file=obj.file(), content_type=obj.mime_type)
             obj.setFileStore(newName, self.fileStore)
         else:
+            self._update_objstore()
             self.objStore.add(obj)
+            self.setChanged(obj)
 
     def discard(self, obj):
+        self._update_objstore()
         self.objStore.discard(obj)
 
+    @property
+    def savedBytesByDeduplication(self) -> int:
+        """Number of bytes of added files which were not stored again, because their content was already stored"""
+        return self.fileStore.savedBytes
+
     @property
     def numOfShells(self) -> int:
-        return len(tuple(self.shells))
+        return self.objStore.numOfObjects(AssetAdministrationShell)
 
     @property
     def numOfAssets(self) -> int:
-        return len(tuple(self.assets))
+        return self.objStore.numOfObjects(Asset)
 
     @property
     def numOfSubmodels(self) -> int:
-        return len(tuple(self.submodels))
+        return self.objStore.numOfObjects(Submodel)
 
     @property
     def numOfConceptDescriptions(self) -> int:
-        return len(tuple(self.concept_descriptions))
+        return self.objStore.numOfObjects(ConceptDescription)
+
+
+class SnapshotObjectStore(IndexedObjectStore):
+    """
+    Object store of a package snapshot, which is filled on demand. Objects of the package are copied
+    when they are retrieved, or before they are changed in the package if that happens first (copy-on-write).
+    Unchanged submodels are not copied at all, only their archive parts are known.
+    They are parsed from their parts when they are retrieved.
+    """
+
+    def __init__(self, liveObjs: Dict[Identifier, Identifiable], sourceParts: Dict[Identifier, SourcePart],
+                 fileStore: Optional[ZipSupplementaryFileContainer]):
+        super(SnapshotObjectStore, self).__init__()
+        self.liveObjs = liveObjs
+        self.sourceParts = sourceParts
+        self.fileStore = fileStore
+        # id(live obj) -> identifier of the obj when the snapshot was taken
+        self._identifiers: Dict[int, Identifier] = {id(obj): identifier for identifier, obj in liveObjs.items()}
+        # identifier -> supplementary files of the unchanged submodel
+        self._supplementaryFiles: Dict[Identifier, Tuple[str, ...]] = {}
+        # live objects are read in the writing thread and changed in the main thread
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def keep(self, liveObj: Identifiable):
+        """Copy what is needed of the object of the package before it is changed, if it is not copied yet"""
+        identifier = self._identifiers.get(id(liveObj))
+        if identifier is None or self.liveObjs[identifier] is not liveObj:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            if identifier in self.sourceParts:
+                self._supplementaryFilesOf(identifier)
+            elif identifier not in self._backend:
+                self._copy(identifier)
+
+    def close(self):
+        """Stop copying objects of the package, e.g. after the snapshot was written"""
+        with self._lock:
+            self._closed = True
+
+    def _copy(self, identifier: Identifier) -> Identifiable:
+        obj = copy.deepcopy(self.liveObjs[identifier])
+        self.add(obj)
+        return obj
+
+    def _supplementaryFilesOf(self, identifier: Identifier) -> Tuple[str, ...]:
+        try:
+            return self._supplementaryFiles[identifier]
+        except KeyError:
+            files = tuple(supplementaryFilesOf(self.liveObjs[identifier]))
+            self._supplementaryFiles[identifier] = files
+            return files
+
+    def rawPartOf(self, identifier: Identifier) -> Optional[RawPart]:
+        """Return raw part and supplementary files of the unchanged submodel"""
+        if identifier not in self.sourceParts:
+            return None
+        with self._lock:
+            return RawPart(self.sourceParts[identifier].partName, self._supplementaryFilesOf(identifier))
+
+    def retrieveAll(self):
+        """Copy or read every object of the snapshot, so that the store can be iterated"""
+        for identifier in self.liveObjs:
+            self.get_identifiable(identifier)
+
+    def get_identifiable(self, identifier: Identifier) -> Identifiable:
+        with self._lock:
+            try:
+                return super(SnapshotObjectStore, self).get_identifiable(identifier)
+            except KeyError:
+                if identifier not in self.sourceParts:
+                    return self._copy(identifier)
+        obj = self._readSourcePart(self.sourceParts[identifier])
+        with self._lock:
+            self.add(obj)
+        return obj
+
+    def _readSourcePart(self, part: SourcePart) -> Identifiable:
+        """:raise ValueError if the part doesn't contain the object as it was when the snapshot was taken"""
+        objects = list(readArchivePart(self.fileStore, part.partName))
+        if len(objects) != 1 or objects[0].identification != part.obj.identification:
+            raise ValueError(f"Part {part.partName} doesn't contain the unchanged object {part.obj}")
+        return objects[0]
+
+
+class PackageSnapshot:
+    """
+    Copy of the package content and write settings at the moment of its creation.
+    The snapshot is written into a temporary file next to the package file,
+    which replaces the package file in Package.commitSnapshot().
+    Objects are copied lazily, see SnapshotObjectStore, so taking a snapshot doesn't
+    copy the package in the main thread. If unchanged submodels can be copied
+    from the source archive, only their part names are kept.
+    """
+
+    def __init__(self, package: Package):
+        self.file: Path = package.file
+        self.fileType = self.file.suffix.lower().strip()
+        self.writeJsonInAasx = package.writeJsonInAasx
+        self.submodelSplitParts = package.submodelSplitParts
+        self.incrementalSave = package.incrementalSave
+        self.changeId = package._changeId
+
+        if isinstance(package.fileStore, ZipSupplementaryFileContainer):
+            self.fileStore = package.fileStore.snapshot()
+        else:
+            self.fileStore = package.fileStore
+
+        self._liveObjs: Dict[Identifier, Identifiable] = {obj.identification: obj for obj in package.objStore}
+        self.numOfObjects = len(self._liveObjs)
+        # identifier -> archive part of the unchanged submodel, which is not copied
+        self._sourceParts: Dict[Identifier, SourcePart] = {}
+        if self._partsCopyable():
+            extension = ".json" if self.writeJsonInAasx else ".xml"
+            for liveObj in package.objStore.iterObjects(Submodel):
+                part = package._sourcePartOf(liveObj)
+                if part and part.partName.lower().endswith(extension):
+                    self._sourceParts[liveObj.identification] = part
+        self.objStore = SnapshotObjectStore(self._liveObjs, self._sourceParts, self.fileStore)
+
+        self.tempFile: Optional[str] = None
+        # id(live obj) -> split part the live obj was written to
+        self.writtenParts: Dict[int, SourcePart] = {}
+        # id(live obj) of objects set changed after the snapshot was taken
+        self.changedObjs: Set[int] = set()
+
+    def _partsCopyable(self) -> bool:
+        """Return True if parts of the source archive can be copied to the written file"""
+        return self.incrementalSave and self.submodelSplitParts and self.fileType == ".aasx" \
+            and isinstance(self.fileStore, ZipSupplementaryFileContainer) and self.fileStore.archive is not None
+
+    def write(self, progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Write the snapshot into a temporary file
+        :param progress: callback getting the number of written objects and the number of all objects
+        """
+        fd, self.tempFile = tempfile.mkstemp(suffix=self.fileType, dir=self.file.parent)
+        os.close(fd)
+        try:
+            if self.fileType in (".xml", ".json"):
+                self.objStore.retrieveAll()
+            if self.fileType == ".xml": #FIXME: if file in write_aas_xml_file() changes
+                with open(self.tempFile, "w") as fileIO:
+                    aasx.write_aas_xml_file(fileIO, self.objStore)
+            elif self.fileType == ".json": #FIXME: if file in write_aas_xml_file() changes
+                with open(self.tempFile, "w") as fileIO:
+                    aasx.write_aas_json_file(fileIO, self.objStore)
+            elif self.fileType == ".aasx":
+                self._writeAasx(self.tempFile, progress)
+            else:
+                raise TypeError("Wrong file type:", self.file.suffix)
+        finally:
+            self.objStore.close()
+            if isinstance(self.fileStore, ZipSupplementaryFileContainer):
+                self.fileStore.close()
+        if progress:
+            progress(self.numOfObjects, self.numOfObjects)
+
+    def _writeAasx(self, file: str, progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Write the package as AASX. In the incremental save mode unchanged submodel
+        parts and supplementary files are copied as they are from the read archive.
+        """
+        if self.incrementalSave:
+            writer = IncrementalAASXWriter(
+                file, self.objStore.rawPartOf,
+                progress=(lambda written: progress(written, self.numOfObjects)) if progress else None)
+        else:
+            writer = aasx.AASXWriter(file)
+        with writer:
+            aas_ids = [identifier for identifier, obj in self._liveObjs.items()
+                       if isinstance(obj, AssetAdministrationShell)]
+            for aas_id in aas_ids:
+                writer.write_aas(aas_id, self.objStore, self.fileStore,
+                                 write_json=self.writeJsonInAasx,
+                                 submodel_split_parts=self.submodelSplitParts)
+            # Create OPC/AASX core properties
+            cp = pyecma376_2.OPCCoreProperties()
+            cp.created = datetime.now()
+            from aas_editor.settings.app_settings import AAS_CREATOR
+            cp.creator = AAS_CREATOR
+            writer.write_core_properties(cp)
+        if self.incrementalSave:
+            for partName, identifier in writer.splitParts.items():
+                liveObj = self._liveObjs[identifier]
+                self.writtenParts[id(liveObj)] = SourcePart(liveObj, partName)
+
+    def discard(self):
+        """Remove the temporary file if it was not committed"""
+        if self.tempFile and os.path.exists(self.tempFile):
+            os.remove(self.tempFile)
 
 
 class StoredFile:
-    def __init__(self, name: Optional[str] = None, fileStore: Optional[DictSupplementaryFileContainer] = None,
+    def __init__(self, name: Optional[str] = None, fileStore: Optional[AbstractSupplementaryFileContainer] = None,
                  filePath: Optional[str] = None):
         if filePath:
             self._filePath = Path(filePath).absolute()
@@ -228,7 +760,7 @@ class StoredFile:
         self.setFileStore(name, fileStore)
 
     def savedInStore(self) -> bool:
-        return True if isinstance(self._fileStore, DictSupplementaryFileContainer) else False
+        return True if isinstance(self._fileStore, AbstractSupplementaryFileContainer) else False
 
     @property
     def name(self):
@@ -261,13 +793,13 @@ class StoredFile:
                 file_content = io.BytesIO(f.read())
         return file_content
 
-    def setFileStore(self, name: str, fileStore: DictSupplementaryFileContainer):
+    def setFileStore(self, name: str, fileStore: AbstractSupplementaryFileContainer):
         if name is None or isinstance(name, str):
             self._name = name
         else:
             raise TypeError("arg 1 must be of type str or None")
 
-        if fileStore is None or isinstance(fileStore, DictSupplementaryFileContainer):
+        if fileStore is None or isinstance(fileStore, AbstractSupplementaryFileContainer):
             self._fileStore = fileStore
         else:
-            raise TypeError("arg 2 must be of type DictSupplementaryFileContainer or None")
+            raise TypeError("arg 2 must be of type AbstractSupplementaryFileContainer or None")
@@ -0,0 +1,199 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, IO, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from PyQt5.QtCore import QStandardPaths
+from basyx.aas.model import Identifiable
+
+from aas_editor.file_container import CHUNK_SIZE, FileIndexEntry
+from aas_editor.settings.app_settings import PACKAGE_CACHE_DIR_NAME, MAX_PACKAGE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class CacheKey(NamedTuple):
+    path: str
+    size: int
+    mtime: int
+    hash: str
+
+
+class CachedPackage(NamedTuple):
+    objects: List[Identifiable]
+    files: List[FileIndexEntry]
+    # index of the object in objects, name of the archive part the object was read from
+    sourceParts: List[Tuple[int, str]]
+
+
+class PackageCache:
+    """
+    On-disk cache of parsed packages, which is used instead of parsing a file again.
+    An entry is only used if path, size, modification time and content hash of the file
+    are unchanged. The content is only hashed if the other properties match.
+    If the cache exceeds its maximum size, least recently used entries are removed.
+    """
+    VERSION = 2
+    SUFFIX = ".pkgcache"
+
+    def __init__(self, directory: Union[str, Path, None], maxSize: int):
+        """:param directory: directory of the cache, if None a directory in the cache location of the user"""
+        self._directory = Path(directory) if directory else None
+        self.maxSize = maxSize
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        # resolved on first use, as the cache location depends on the name of the application
+        if self._directory is None:
+            location = QStandardPaths.writableLocation(QStandardPaths.CacheLocation)
+            self._directory = Path(location).joinpath(PACKAGE_CACHE_DIR_NAME)
+        return self._directory
+
+    def _entryFile(self, path: str) -> Path:
+        return self.directory.joinpath(hashlib.sha256(path.encode()).hexdigest() + self.SUFFIX)
+
+    @staticmethod
+    def stat(file: Union[str, Path]) -> Tuple[int, int]:
+        """Return size and modification time of the file"""
+        stat = os.stat(file)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def hash(fileIO: IO[bytes]) -> str:
+        sha = hashlib.sha256()
+        for chunk in iter(lambda: fileIO.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+        return sha.hexdigest()
+
+    @classmethod
+    def key(cls, file: Union[str, Path], sha: Optional[str] = None) -> CacheKey:
+        """
+        Return the cache key of the file
+        :param sha: content hash of the file, e.g. computed while the file was read, if None the file is hashed
+        """
+        file = Path(file).absolute()
+        size, mtime = cls.stat(file)
+        if sha is None:
+            with open(file, "rb") as f:
+                sha = cls.hash(f)
+        return CacheKey(file.as_posix(), size, mtime, sha)
+
+    def load(self, file: Union[str, Path], openFile: Optional[Callable[[], IO[bytes]]] = None) \
+            -> Optional[CachedPackage]:
+        """
+        Return the cached package if there is an up-to-date entry for the file
+        :param openFile: callback opening the file for hashing, e.g. as a ProgressFile
+        """
+        path = Path(file).absolute().as_posix()
+        entryFile = self._entryFile(path)
+        try:
+            with open(entryFile, "rb") as f:
+                version, entryKey = pickle.load(f)
+                entryKey = CacheKey(*entryKey)
+            if version != self.VERSION or entryKey.path != path \
+                    or (entryKey.size, entryKey.mtime) != self.stat(path):
+                return None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self._removeBroken(entryFile, e)
+            return None
+
+        # size and modification time match, only now the content is compared
+        with (openFile() if openFile else open(path, "rb")) as fileIO:
+            if self.hash(fileIO) != entryKey.hash:
+                return None
+
+        try:
+            with open(entryFile, "rb") as f:
+                pickle.load(f)
+                cached = CachedPackage(*pickle.load(f))
+        except Exception as e:
+            self._removeBroken(entryFile, e)
+            return None
+        # mark entry as recently used
+        try:
+            os.utime(entryFile)
+        except OSError:
+            pass
+        return cached
+
+    def store(self, file: Union[str, Path], stat: Tuple[int, int], objects: Iterable[Identifiable],
+              files: List[FileIndexEntry], sourceParts: Iterable[Tuple[int, str]], sha: Optional[str] = None):
+        """
+        Store the parsed package, if the file was not changed since it was read
+        :param stat: size and modification time of the file before it was read
+        :param sha: content hash of the file computed while it was read, if None the file is hashed again
+        """
+        if self.stat(file) != stat:
+            return
+        key = self.key(file, sha)
+        if self.stat(file) != stat:
+            return
+        objects = list(objects)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tempFile = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                # key is stored separately, so that it can be checked without loading the objects
+                pickle.dump((self.VERSION, tuple(key)), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(tuple(CachedPackage(objects, files, list(sourceParts))), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tempFile, self._entryFile(key.path))
+        finally:
+            if os.path.exists(tempFile):
+                os.remove(tempFile)
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its maximum size"""
+        with self._lock:
+            entries = []
+            for entryFile in self.directory.glob(f"*{self.SUFFIX}"):
+                try:
+                    stat = entryFile.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entryFile))
+            entries.sort()
+            size = sum(entry[1] for entry in entries)
+            for _, entrySize, entryFile in entries:
+                if size <= self.maxSize:
+                    break
+                self._remove(entryFile)
+                size -= entrySize
+
+    def _removeBroken(self, entryFile: Path, error: Exception):
+        logger.warning("Cache entry %s couldn't be read and is removed: %s", entryFile, error)
+        self._remove(entryFile)
+
+    @staticmethod
+    def _remove(entryFile: Path):
+        try:
+            os.remove(entryFile)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove all entries of the cache"""
+        with self._lock:
+            for entryFile in self.directory.glob(f"*{self.SUFFIX}"):
+                self._remove(entryFile)
+
+
+PACKAGE_CACHE = PackageCache(None, MAX_PACKAGE_CACHE_SIZE)
@@ -394,6 +394,9 @@ ATTR_ORDER = (
 )
 PREFERED_LANGS_ORDER = ("en-us", "en", "de")
 
+# Queries of ClassesInfo are cached per class. If CLASSES_INFO or one of its entries is changed in place,
+# ClassesInfo.invalidate() must be called afterwards, otherwise the old entries are still used.
+# Replacing CLASSES_INFO as a whole, e.g. by a settings reload, invalidates the caches itself.
 CLASSES_INFO = {
     object: {
         HIDDEN_ATTRS: ("namespace_element_sets", "parent", "security", "source"),
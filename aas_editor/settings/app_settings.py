@@ -39,10 +39,22 @@ DEFAULT_FONT = QFont()
 DEFAULT_FONT.setWeight(40)
 DEFAULT_FONT.setPointSize(12)
 
-MAX_UNDOS = 10
+# estimated memory of the undo and of the redo history, consecutive edits of an item within the interval are merged
+MAX_UNDO_SIZE = 200 * 1024 * 1024
+UNDO_MERGE_INTERVAL = 1.0
 MAX_RECENT_FILES = 10
+# number of detailed info tables kept for fast reopening after no view shows them anymore
+MAX_UNUSED_DETAILED_TABLES = 20
 MAX_SIGNS_TO_SHOW = 1000
 MAX_SIGNS_TO_SHOW_IN_TREE = 150
+# children of large collections are created in pages of this size as the view scrolls
+CHILDREN_PAGE_SIZE = 500
+# interval in ms in which an open type validation report checks the package for changes to validate
+VALIDATION_INTERVAL = 1000
+
+# Cache of parsed packages for fast reopening, the directory is created in the cache location of the user
+PACKAGE_CACHE_DIR_NAME = "packages"
+MAX_PACKAGE_CACHE_SIZE = 500 * 1024 * 1024
 
 # Custom roles
 PACKAGE_ROLE = 1010
@@ -59,7 +71,9 @@ MEDIA_CONTENT_ROLE = 1100
 OPENED_PACKS_ROLE = 1110
 OPENED_FILES_ROLE = 1120
 ADD_ITEM_ROLE = 1130
+ADD_ITEMS_ROLE = 1135
 CLEAR_ROW_ROLE = 1140
+CLEAR_ROWS_ROLE = 1145
 UPDATE_ROLE = 1150
 COPY_ROLE = 1155
 UNDO_ROLE = 1160
@@ -134,5 +148,11 @@ class AppSettings:
     # If True, submodels are written to separate AASX parts
     # instead of being included in the AAS part with in the AASX package.
     SUBMODEL_SPLIT_PARTS = Setting('submodelSplitParts', False, bool)
+    # If True, unchanged submodel parts and supplementary files are copied
+    # as they are from the opened AASX file instead of being written anew.
+    # Submodels are written anew only if they were changed in the editor.
+    INCREMENTAL_SAVE = Setting('incrementalSave', True, bool)
+    # If True, parsed packages are cached and taken from the cache when they are reopened unchanged.
+    PACKAGE_CACHE_ENABLED = Setting('packageCacheEnabled', True, bool)
     ALL_SUBMODEL_REFS_TO_AAS = Setting('allSubmodelRefsToAas', True, bool)
     ALL_CD_REFS_TO_AAS = Setting('allConceptDescriptionRefsToAas', True, bool)
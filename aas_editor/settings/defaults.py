@@ -89,10 +89,8 @@ DEFAULTS = {
     },
 }
 
+# identifier completions of the opened packages are served by aas_editor.completions
 DEFAULT_COMPLETIONS = {
-    Key: {
-        "value": []
-    },
     File: {
         "mime_type": MIME_TYPES
     },
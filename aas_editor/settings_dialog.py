@@ -9,9 +9,11 @@
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 from typing import Dict
 
-from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QRadioButton
+from PyQt5.QtWidgets import QDialog, QDialogButtonBox, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, \
+    QRadioButton, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
 
+from aas_editor.package_cache import PACKAGE_CACHE
 from aas_editor.settings import FILE_TYPE_FILTERS, AppSettings, Setting
 
 
@@ -84,6 +86,12 @@ class SettingsDialog(QDialog):
             RadioBtnsGroupBox(self, title="Save submodels in separate files within AASX file",
                               options={"Yes": True, "No": False},
                               appSetting=AppSettings.SUBMODEL_SPLIT_PARTS),
+            RadioBtnsGroupBox(self, title="Copy unchanged submodels and files from the opened AASX file when saving",
+                              options={"Yes": True, "No": False},
+                              appSetting=AppSettings.INCREMENTAL_SAVE),
+            RadioBtnsGroupBox(self, title="Cache opened files for faster reopening",
+                              options={"Yes": True, "No": False},
+                              appSetting=AppSettings.PACKAGE_CACHE_ENABLED),
             RadioBtnsGroupBox(self, title="Automatically add references of existing submodels to the first AAS when saving file",
                               options={"Yes": True, "No": False},
                               appSetting=AppSettings.ALL_SUBMODEL_REFS_TO_AAS),
@@ -98,6 +106,8 @@ class SettingsDialog(QDialog):
         self.layout.addWidget(message)
         for groupbox in self.optionGroupBoxes:
             self.layout.addWidget(groupbox)
+        self.clearCacheButton = QPushButton("Clear cache of opened files", self, clicked=self.clearPackageCache)
+        self.layout.addWidget(self.clearCacheButton, alignment=Qt.AlignLeft)
         self.layout.addWidget(self.buttonBox)
         self.setLayout(self.layout)
 
@@ -105,6 +115,10 @@ class SettingsDialog(QDialog):
         self.applySettings()
         super(SettingsDialog, self).accept()
 
+    def clearPackageCache(self):
+        PACKAGE_CACHE.clear()
+        QMessageBox.information(self, "Cache cleared", f"Cache in {PACKAGE_CACHE.directory} was cleared")
+
     def applySettings(self) -> None:
         for optionGroupBox in self.optionGroupBoxes:
             optionGroupBox.applyNewOption()
@@ -20,7 +20,8 @@ import inspect
 import re
 from abc import ABCMeta
 from enum import Enum
-from typing import List, Dict, Type, Set, Any, Tuple
+from types import MappingProxyType
+from typing import List, Dict, Type, Set, Any, Tuple, Mapping
 
 import basyx.aas.model
 from PyQt5.QtCore import Qt, QFile, QTextStream, QModelIndex
@@ -137,7 +138,7 @@ def getDefaultVal(objType: Type, param: str, default=settings.NOT_GIVEN):
     :raise AttributeError if no default value found and default is not given
     :return: default value for the given attribute for type init
     """
-    paramsTypehints, paramsDefaults = getParams4init(objType)
+    paramsTypehints, paramsDefaults = _params4init(objType)
     try:
         return paramsDefaults[param]
     except KeyError:
@@ -147,8 +148,48 @@ def getDefaultVal(objType: Type, param: str, default=settings.NOT_GIVEN):
             return default
 
 
+# introspected init params per type, types whose params can change (NamedTuple typehints) are not cached
+_params4initCache: Dict[Any, Tuple[Mapping[str, Any], Mapping[str, Any]]] = {}
+_reqParams4initCache: Dict[Tuple[Any, bool, bool], Mapping[str, Any]] = {}
+
+
+def clearParams4initCache():
+    """Clear cached init params, attribute typehints and type checks, e.g. after classes were changed at runtime"""
+    _params4initCache.clear()
+    _reqParams4initCache.clear()
+    util_type.clearAttrTypeHintCache()
+    util_type.clearTypeCheckCache()
+
+
+def hasCachedParams4init(objType) -> bool:
+    """Return True if init params of the type are cached, params of NamedTuples can be changed at runtime"""
+    origType = objType.__origin__ if getattr(objType, "__origin__", None) else objType
+    return not hasattr(origType, "_field_types")
+
+
 def getParams4init(objType: Type, withDefaults=True):
-    """Return params for init with their type and default values"""
+    """Return params for init with their type and default values, the results are copies of cached values"""
+    paramsTypehints, paramsDefaults = _params4init(objType)
+    if withDefaults:
+        return dict(paramsTypehints), dict(paramsDefaults)
+    else:
+        return dict(paramsTypehints)
+
+
+def _params4init(objType: Type) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
+    if not hasCachedParams4init(objType):
+        return _computeParams4init(objType)
+    try:
+        return _params4initCache[objType]
+    except KeyError:
+        params = _params4initCache[objType] = _computeParams4init(objType)
+        return params
+    except TypeError:
+        # unhashable typehint
+        return _computeParams4init(objType)
+
+
+def _computeParams4init(objType: Type) -> Tuple[Mapping[str, Any], Mapping[str, Any]]:
     if hasattr(objType, "__origin__") and objType.__origin__:
         objType = objType.__origin__
 
@@ -175,11 +216,8 @@ def getParams4init(objType: Type, withDefaults=True):
     except KeyError:
         pass
 
-    if withDefaults:
-        paramsDefaults = _getParamsDefaults(paramsTypehints, defaults)
-        return paramsTypehints, paramsDefaults
-    else:
-        return paramsTypehints
+    paramsDefaults = _getParamsDefaults(paramsTypehints, defaults)
+    return MappingProxyType(paramsTypehints), MappingProxyType(paramsDefaults)
 
 
 def _getParamsDefaults(paramsTypehints: Dict[str, Any], defaults: Tuple[Any]) -> Dict[str, Any]:
@@ -193,7 +231,34 @@ def _getParamsDefaults(paramsTypehints: Dict[str, Any], defaults: Tuple[Any]) ->
 
 def getReqParams4init(objType: Type, rmDefParams=True,
                       attrsToHide = None, delOptional=True) -> Dict[str, Type]:
-    """Return required params for init with their type"""
+    """Return required params for init with their type, the result is a copy of a cached value"""
+    paramsTypehints = dict(_reqParams4init(objType, rmDefParams, delOptional))
+
+    if attrsToHide:
+        for attr in attrsToHide:
+            try:
+                paramsTypehints.pop(attr)
+            except KeyError:
+                continue
+
+    return paramsTypehints
+
+
+def _reqParams4init(objType: Type, rmDefParams: bool, delOptional: bool) -> Mapping[str, Type]:
+    if not hasCachedParams4init(objType):
+        return _computeReqParams4init(objType, rmDefParams, delOptional)
+    key = (objType, rmDefParams, delOptional)
+    try:
+        return _reqParams4initCache[key]
+    except KeyError:
+        params = _reqParams4initCache[key] = _computeReqParams4init(objType, rmDefParams, delOptional)
+        return params
+    except TypeError:
+        # unhashable typehint
+        return _computeReqParams4init(objType, rmDefParams, delOptional)
+
+
+def _computeReqParams4init(objType: Type, rmDefParams: bool, delOptional: bool) -> Mapping[str, Type]:
     paramsTypehints, paramasDefaults = getParams4init(objType)
 
     if rmDefParams and paramasDefaults:
@@ -205,14 +270,7 @@ def getReqParams4init(objType: Type, rmDefParams=True,
             typeHint = paramsTypehints[param]
             paramsTypehints[param] = util_type.removeOptional(typeHint)
 
-    if attrsToHide:
-        for attr in attrsToHide:
-            try:
-                paramsTypehints.pop(attr)
-            except KeyError:
-                continue
-
-    return paramsTypehints
+    return MappingProxyType(paramsTypehints)
 
 
 def _delRecursivlyParent(aasObj, iter_num=0):
@@ -221,7 +279,7 @@ def _delRecursivlyParent(aasObj, iter_num=0):
     if hasattr(aasObj, "parent"):
         aasObj.parent = None
     if iter_num == 0 or util_type.isIterable(aasObj) or isinstance(aasObj, basyx.aas.model.Referable):
-        params = getParams4init(type(aasObj), withDefaults=False).keys()
+        params = _params4init(type(aasObj))[0].keys()
         for param in params:
             if hasattr(aasObj, param.rstrip("_")):
                 lowerObj = getattr(aasObj, param.rstrip("_"))
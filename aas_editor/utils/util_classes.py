@@ -16,6 +16,7 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
+import functools
 from typing import Type, Tuple, Optional, List, Dict
 
 from aas_editor.settings.util_constants import *
@@ -23,7 +24,7 @@ from aas_editor.settings import aas_settings as s
 
 
 # DictItem = NamedTuple("DictItem", key=Any, value=Any)
-from aas_editor.utils.util_type import issubtype, getTypeName
+from aas_editor.utils.util_type import issubtype, getTypeName, getOrigin
 
 
 class PreObject:
@@ -97,127 +98,165 @@ class PreObject:
             return self.objType(*args, **kwargs)
 
 
+# lookup tables of the classes: class -> {query: result}, compiled from CLASSES_INFO on first query
+_CLASSES_TABLES: Dict[object, Dict[object, object]] = {}
+# CLASSES_INFO the tables were compiled from, a reloaded CLASSES_INFO invalidates the tables
+_compiledClassesInfo: Optional[dict] = None
+# key of the CLASSES_INFO entries matching the class in its lookup table
+MATCHING_INFOS = "matching_infos"
+
+
+def _mroPosition(cls, typ) -> int:
+    """Return position of typ in the MRO of cls, types not in the MRO (e.g. registered ABCs) are placed last"""
+    mro = getattr(getOrigin(cls), "__mro__", ())
+    try:
+        return mro.index(typ)
+    except ValueError:
+        return len(mro)
+
+
+def _matchingInfos(cls) -> Tuple[dict, ...]:
+    """
+    Return infos of CLASSES_INFO entries cls is a subtype of, ordered from the most specific to the most general
+    :raise TypeError if cls is not a type or typehint
+    """
+    types = [typ for typ in s.CLASSES_INFO if issubtype(cls, typ)]
+    types.sort(key=lambda typ: _mroPosition(cls, typ))
+    return tuple(s.CLASSES_INFO[typ] for typ in types)
+
+
+def _compiled(query):
+    """Decorator caching results of the query function per class in the lookup table of the class"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(cls, *args):
+            global _compiledClassesInfo
+            if _compiledClassesInfo is not s.CLASSES_INFO:
+                ClassesInfo.invalidate()
+                _compiledClassesInfo = s.CLASSES_INFO
+            key = (query, *args)
+            try:
+                table = _CLASSES_TABLES.get(cls)
+            except TypeError:  # unhashable typehint
+                return func(_matchingInfos(cls), *args)
+            if table is None:
+                table = _CLASSES_TABLES[cls] = {MATCHING_INFOS: _matchingInfos(cls)}
+            try:
+                return table[key]
+            except KeyError:
+                res = table[key] = func(table[MATCHING_INFOS], *args)
+                return res
+        return wrapper
+    return decorator
+
+
 class ClassesInfo:
+    """
+    Information about classes from CLASSES_INFO. Entries of the class and its base classes are merged,
+    entries of more specific classes take precedence. Results are cached in lookup tables per class,
+    which must be invalidated with ClassesInfo.invalidate() if CLASSES_INFO is changed in place.
+    """
+
+    @staticmethod
+    def invalidate():
+        """Drop the lookup tables, must be called after CLASSES_INFO or one of its entries was changed in place"""
+        _CLASSES_TABLES.clear()
+
     @staticmethod
-    def hasPackViewAttrs(cls) -> bool:
-        for typ in s.CLASSES_INFO:
-            if issubclass(cls, typ) and PACKVIEW_ATTRS_INFO in s.CLASSES_INFO[typ]:
-                return True
-        return False
+    @_compiled("has_" + PACKVIEW_ATTRS_INFO)
+    def hasPackViewAttrs(infos: Tuple[dict, ...]) -> bool:
+        return any(PACKVIEW_ATTRS_INFO in info for info in infos)
 
     @staticmethod
     def packViewAttrs(cls) -> List[str]:
+        return list(ClassesInfo._packViewAttrs(cls))
+
+    @staticmethod
+    @_compiled(PACKVIEW_ATTRS_INFO)
+    def _packViewAttrs(infos: Tuple[dict, ...]) -> Tuple[str]:
         attrs = set()
-        for typ in s.CLASSES_INFO:
-            if issubclass(cls, typ) and PACKVIEW_ATTRS_INFO in s.CLASSES_INFO[typ]:
-                attrs.update(s.CLASSES_INFO[typ][PACKVIEW_ATTRS_INFO].keys())
-        return list(attrs)
+        for info in infos:
+            attrs.update(info.get(PACKVIEW_ATTRS_INFO, {}).keys())
+        return tuple(attrs)
 
     @staticmethod
-    def hiddenAttrs(cls) -> Tuple[str]:
+    @_compiled(HIDDEN_ATTRS)
+    def hiddenAttrs(infos: Tuple[dict, ...]) -> Tuple[str]:
         res = set()
-        for typ in s.CLASSES_INFO:
-            if issubtype(cls, typ):
-                try:
-                    res.update(s.CLASSES_INFO[typ][HIDDEN_ATTRS])
-                except KeyError:
-                    continue
+        for info in infos:
+            res.update(info.get(HIDDEN_ATTRS, ()))
         return tuple(res)
 
     @staticmethod
-    def iterAttrs(cls) -> Tuple[str]:
+    @_compiled(ITERABLE_ATTRS)
+    def iterAttrs(infos: Tuple[dict, ...]) -> Tuple[str]:
         res = set()
-        for typ in s.CLASSES_INFO:
-            if issubtype(cls, typ):
-                try:
-                    res.update(s.CLASSES_INFO[typ][ITERABLE_ATTRS])
-                except KeyError:
-                    continue
+        for info in infos:
+            res.update(info.get(ITERABLE_ATTRS, ()))
         return tuple(res)
 
     @staticmethod
     def default_params_to_hide(cls) -> Dict[str, str]:
+        return dict(ClassesInfo._defaultParamsToHide(cls))
+
+    @staticmethod
+    @_compiled(DEFAULT_PARAMS_TO_HIDE)
+    def _defaultParamsToHide(infos: Tuple[dict, ...]) -> Dict[str, str]:
         res = dict()
-        for typ in s.CLASSES_INFO:
-            if issubtype(cls, typ):
-                try:
-                    res.update(s.CLASSES_INFO[typ][DEFAULT_PARAMS_TO_HIDE])
-                except KeyError:
-                    continue
+        for info in reversed(infos):
+            res.update(info.get(DEFAULT_PARAMS_TO_HIDE, {}))
         return res
 
     @staticmethod
     def params_to_attrs(cls) -> Dict[str, str]:
+        try:
+            return dict(ClassesInfo._paramsToAttrs(cls))
+        except TypeError:  # cls is not a type or typehint
+            return dict()
+
+    @staticmethod
+    @_compiled(PARAMS_TO_ATTRS)
+    def _paramsToAttrs(infos: Tuple[dict, ...]) -> Dict[str, str]:
         res = dict()
-        for typ in s.CLASSES_INFO:
-            try:
-                if issubtype(cls, typ):
-                    try:
-                        res.update(s.CLASSES_INFO[typ][PARAMS_TO_ATTRS])
-                    except KeyError:
-                        continue
-            except TypeError:
-                print(f"Error in the function params_to_attrs")
+        for info in reversed(infos):
+            res.update(info.get(PARAMS_TO_ATTRS, {}))
         return res
 
     @staticmethod
-    def addActText(cls, attr: Optional[str] = None) -> str:
-        clsInfo = s.CLASSES_INFO.get(cls, {})
-
-        if attr is None:
-            res = clsInfo.get(ADD_ACT_AAS_TXT, "")
-        else:
-            attrsInfo = clsInfo.get(PACKVIEW_ATTRS_INFO, {})
-            attrInfo = attrsInfo.get(attr, {})
-            res = attrInfo.get(ADD_ACT_AAS_TXT, "")
-
-        if not res:
-            for typ in s.CLASSES_INFO:
-                if issubtype(cls, typ):
-                    try:
-                        clsInfo = s.CLASSES_INFO[typ]
-                        if attr is None:
-                            return clsInfo[ADD_ACT_AAS_TXT]
-                        else:
-                            return clsInfo[PACKVIEW_ATTRS_INFO][attr][ADD_ACT_AAS_TXT]
-                    except KeyError:
-                        continue
-        return res
+    @_compiled(ADD_ACT_AAS_TXT)
+    def addActText(infos: Tuple[dict, ...], attr: Optional[str] = None) -> str:
+        for info in infos:
+            try:
+                if attr is None:
+                    res = info[ADD_ACT_AAS_TXT]
+                else:
+                    res = info[PACKVIEW_ATTRS_INFO][attr][ADD_ACT_AAS_TXT]
+            except KeyError:
+                continue
+            if res:
+                return res
+        return ""
 
     @staticmethod
-    def changedParentObject(cls) -> str:
-        clsInfo = s.CLASSES_INFO.get(cls, {})
-        res = clsInfo.get(CHANGED_PARENT_OBJ, "")
-        if not res:
-            for typ in s.CLASSES_INFO:
-                if issubtype(cls, typ):
-                    try:
-                        res = s.CLASSES_INFO[typ][CHANGED_PARENT_OBJ]
-                        if cls is typ:
-                            return res
-                    except KeyError:
-                        continue
-        return res
+    @_compiled(CHANGED_PARENT_OBJ)
+    def changedParentObject(infos: Tuple[dict, ...]) -> str:
+        for info in infos:
+            res = info.get(CHANGED_PARENT_OBJ)
+            if res:
+                return res
+        return ""
 
     @staticmethod
-    def addType(cls, attr: Optional[str] = None) -> Type:
-        clsInfo = s.CLASSES_INFO.get(cls, {})
-        if attr is None:
-            res = clsInfo.get(ADD_TYPE, None)
-        else:
-            attrsInfo = clsInfo.get(PACKVIEW_ATTRS_INFO, {})
-            attrInfo = attrsInfo.get(attr, {})
-            res = attrInfo.get(ADD_TYPE, None)
-
-        if not res:
-            for typ in s.CLASSES_INFO:
-                if issubtype(cls, typ):
-                    try:
-                        clsInfo = s.CLASSES_INFO[typ]
-                        if attr is None:
-                            return clsInfo[ADD_TYPE]
-                        else:
-                            return clsInfo[PACKVIEW_ATTRS_INFO][attr][ADD_TYPE]
-                    except KeyError:
-                        continue
-        return res
\ No newline at end of file
+    @_compiled(ADD_TYPE)
+    def addType(infos: Tuple[dict, ...], attr: Optional[str] = None) -> Type:
+        for info in infos:
+            try:
+                if attr is None:
+                    res = info[ADD_TYPE]
+                else:
+                    res = info[PACKVIEW_ATTRS_INFO][attr][ADD_TYPE]
+            except KeyError:
+                continue
+            if res:
+                return res
+        return None
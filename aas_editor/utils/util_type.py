@@ -35,6 +35,35 @@ TYPING_TYPES = {typing.AbstractSet, typing.Callable, typing.Dict, typing.List, t
                 typing.NoReturn, typing.Set, typing.Sequence, typing.Tuple, typing.Type,
                 typing.TypeVar, typing.Union}
 
+# results of issubtype per (type, typehint), isoftype per (type of object, typehint) and
+# checkType per (type of object, typehint), see clearTypeCheckCache()
+_subtypeCache = {}
+_oftypeCache = {}
+_checkTypeCache = {}
+
+
+def clearTypeCheckCache():
+    """Clear cached type checks, e.g. after classes were registered as virtual subclasses"""
+    _subtypeCache.clear()
+    _oftypeCache.clear()
+    _checkTypeCache.clear()
+
+
+def _isPlainClass(obj) -> bool:
+    """Return True if obj is a class and not a typehint with args, e.g. List[int]"""
+    return isinstance(obj, type) and getattr(obj, "__origin__", None) is None
+
+
+def _cached(cache: dict, key, compute, *args):
+    """Return cached result for the key, compute and cache it if missing, unhashable keys are not cached"""
+    try:
+        res = cache.get(key)
+    except TypeError:
+        return compute(*args)
+    if res is None:
+        res = cache[key] = compute(*args)
+    return res
+
 
 def getOrigin(obj) -> typing.Type:
     """Return obj.__origin__ if it has it else return obj"""
@@ -56,8 +85,8 @@ def isTypehint(obj) -> bool:
     try:
         if obj in TYPING_TYPES or type(obj) is typing.TypeVar:
             return True
-    except TypeError as e:
-        print(e)
+    except TypeError:  # unhashable object
+        pass
     return inspect.isclass(obj)
 
 
@@ -88,7 +117,15 @@ def removeOptional(typehint):
 def checkType(obj, typeHint):
     if typeHint is None:
         return True
+    if isinstance(obj, AASReference):
+        # result depends on the referenced type
+        return _checkType(obj, typeHint)
+    if _isPlainClass(typeHint) and typeHint is not abc.Iterable:
+        return isinstance(obj, typeHint)
+    return _cached(_checkTypeCache, (type(obj), typeHint), _checkType, obj, typeHint)
 
+
+def _checkType(obj, typeHint):
     origin = getOrigin(typeHint)
     args = getArgs(typeHint)
     objType = type(obj)
@@ -130,8 +167,7 @@ def checkTypeAASRef(aasref, typehint):
                 return getTypeName(aasref.type) == arg
             try:
                 return issubclass(aasref.type, args)
-            except TypeError as e:
-                print(f"Error occured while checking: {aasref.type} and {args}", e)
+            except TypeError:
                 return False
         else:
             return True
@@ -154,8 +190,7 @@ def getTypeName(objType) -> str:
                 res = getattr(objType, nameAttr)
             if res:
                 break
-        except (AttributeError, TypeError) as e:
-            print(e)
+        except (AttributeError, TypeError):
             pass
     else:
         name = str(objType)
@@ -198,6 +233,14 @@ def issubtype(typ, types: Union[type, Tuple[Union[type, tuple], ...]]) -> bool:
     :param types: class or type annotation or tuple of classes or type annotations
     :raise TypeError if arg 1 or arg2 are not types or typehints:"
     """
+    if _isPlainClass(typ) and _isPlainClass(types):
+        if type(None) in (typ, types):
+            return typ is types
+        return issubclass(typ, types)
+    return _cached(_subtypeCache, (typ, types), _issubtypeOf, typ, types)
+
+
+def _issubtypeOf(typ, types) -> bool:
     if not isTypehint(typ):
         raise TypeError("Arg 1 must be type or typehint:", typ)
     try:
@@ -265,6 +308,15 @@ def _issubtype(typ1, typ2: type) -> bool:
 
 
 def isoftype(obj, types) -> bool:
+    if _isPlainClass(types):
+        return isinstance(obj, types)
+    if isinstance(obj, type):
+        # result can depend on the class itself, e.g. for Type[...]
+        return _isoftypeOf(obj, types)
+    return _cached(_oftypeCache, (type(obj), types), _isoftypeOf, obj, types)
+
+
+def _isoftypeOf(obj, types) -> bool:
     try:
         for tp in types:
             if not isTypehint(tp):
@@ -276,16 +328,15 @@ def isoftype(obj, types) -> bool:
     try:
         if issubclass(types, Enum):
             return _isoftype(obj, types)
-    except TypeError as e:
-        print(e)
+    except TypeError:  # types is not a class
+        pass
 
     try:
         for tp in types:
             if _isoftype(obj, tp):
                 return True
         return False
-    except TypeError as e:
-        print(e)
+    except TypeError:  # types is not a tuple
         return _isoftype(obj, types)
 
 
@@ -335,7 +386,40 @@ def isIterable(obj):
     return isIterableType(type(obj))
 
 
+# typehints of attributes per (type, attribute, delOptional), failed lookups are stored as _NO_TYPEHINT
+_attrTypeHintCache = {}
+_NO_TYPEHINT = object()
+
+
+def clearAttrTypeHintCache():
+    _attrTypeHintCache.clear()
+
+
 def getAttrTypeHint(objType, attr, delOptional=True):
+    """
+    Return typehint of the attribute of the type, typehints are cached per type and attribute
+    :raise KeyError if no typehint found
+    """
+    if not util.hasCachedParams4init(objType):
+        return _computeAttrTypeHint(objType, attr, delOptional)
+    key = (objType, attr, delOptional)
+    try:
+        typeHint = _attrTypeHintCache[key]
+    except KeyError:
+        try:
+            typeHint = _computeAttrTypeHint(objType, attr, delOptional)
+        except KeyError:
+            typeHint = _NO_TYPEHINT
+        _attrTypeHintCache[key] = typeHint
+    except TypeError:
+        # unhashable typehint
+        return _computeAttrTypeHint(objType, attr, delOptional)
+    if typeHint is _NO_TYPEHINT:
+        raise KeyError(attr)
+    return typeHint
+
+
+def _computeAttrTypeHint(objType, attr, delOptional=True):
     params = util.getReqParams4init(objType, rmDefParams=False, delOptional=delOptional)
     if attr in params or f"{attr}_" in params:
         try:
@@ -0,0 +1,217 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from basyx.aas.model import Identifiable, Identifier, Referable
+
+from aas_editor.additional.classes import DictItem
+from aas_editor.package import Package
+from aas_editor.settings import TYPES_NOT_TO_POPULATE, TYPES_WITH_INSTANCES_NOT_TO_POPULATE
+from aas_editor.utils.util import getAttrs4detailInfo
+from aas_editor.utils.util_classes import ClassesInfo
+from aas_editor.utils.util_type import checkType, getAttrTypeHint, getIterItemTypeHint, getTypeName, \
+    getTypeHintName, isSimpleIterable, removeOptional, getArgs, issubtype
+
+
+class TypeViolation(NamedTuple):
+    # object of the pack view containing the value: identifiable or one of its submodel elements
+    obj: Referable
+    # names of the items from the object to the value, as shown in the detailed view of the object
+    path: Tuple[str, ...]
+    value: Any
+    typehint: Any
+
+    @property
+    def objName(self) -> str:
+        if self.obj.id_short:
+            return self.obj.id_short
+        if isinstance(self.obj, Identifiable):
+            return str(self.obj.identification.id)
+        return getTypeName(type(self.obj))
+
+    @property
+    def typehintName(self) -> str:
+        try:
+            return getTypeHintName(self.typehint)
+        except TypeError:
+            return str(self.typehint)
+
+    @property
+    def valueTypeName(self) -> str:
+        return getTypeName(type(self.value))
+
+
+def _populatable(obj) -> bool:
+    """Return True if the detailed view shows children of the object, see DetailedInfoItem"""
+    return obj is not None and not isinstance(obj, TYPES_WITH_INSTANCES_NOT_TO_POPULATE) \
+           and type(obj) not in TYPES_NOT_TO_POPULATE
+
+
+def _attrTypehint(objType, attr):
+    try:
+        return getAttrTypeHint(objType, attr, delOptional=False)
+    except (KeyError, TypeError):
+        return None
+
+
+def _itemTypehint(iterable, typehint):
+    """Return typehint of the items of the iterable like StandardItem.getTypeHint()"""
+    itemTypehint = ClassesInfo.addType(type(iterable))
+    if not itemTypehint and typehint is not None:
+        try:
+            itemTypehint = getIterItemTypeHint(typehint)
+        except (KeyError, TypeError):
+            itemTypehint = None
+    return itemTypehint
+
+
+def _dictTypehints(typehint) -> Tuple[Any, Any]:
+    """Return typehints of the keys and the values of the dict typehint"""
+    if typehint is None:
+        return None, None
+    typehint = removeOptional(typehint)
+    args = getArgs(typehint)
+    try:
+        if len(args) == 2 and issubtype(typehint, dict):
+            return args
+    except TypeError:
+        pass
+    return None, None
+
+
+def _children(obj, typehint, attrsCache: Dict[type, List[Tuple[str, Any]]]) -> Iterator[Tuple[str, Any, Any]]:
+    """
+    Yield name, object and typehint of the children of the object shown in the detailed view
+    :param attrsCache: attributes and their typehints per type, filled on first use
+    """
+    if isSimpleIterable(obj):
+        itemTypehint = _itemTypehint(obj, typehint)
+        for i, item in enumerate(obj):
+            yield f"{getTypeName(item.__class__)} {i}", item, itemTypehint
+    else:
+        attrs = attrsCache.get(type(obj))
+        if attrs is None:
+            attrs = attrsCache[type(obj)] = [(attr, _attrTypehint(type(obj), attr))
+                                             for attr in getAttrs4detailInfo(obj)]
+        for attr, attrTypehint in attrs:
+            yield attr, getattr(obj, attr), attrTypehint
+
+
+def _iterAttrsChildren(obj) -> Iterator[Tuple[Any, Any]]:
+    """Yield objects and typehints of the items of the iterable attributes, e.g. the submodel elements"""
+    for attr in ClassesInfo.iterAttrs(type(obj)):
+        iterable = getattr(obj, attr, None)
+        if iterable is None:
+            continue
+        itemTypehint = _itemTypehint(iterable, _attrTypehint(type(obj), attr))
+        for item in iterable:
+            yield item, itemTypehint
+
+
+def validateObject(root: Identifiable) -> List[TypeViolation]:
+    """
+    Return type violations in the identifiable: values of its attributes and of the attributes,
+    items and dict entries of the contained objects which do not match their typehints.
+    Items of iterable attributes, e.g. submodel elements, are validated as objects of their own,
+    contained identifiables are not entered, they are validated on their own.
+    """
+    violations = []
+    seen = set()
+    attrsCache = {}
+    # object, pack view object containing it, path from the pack view object, typehint
+    stack: List[Tuple[Any, Referable, Tuple[str, ...], Any]] = [(root, root, (), None)]
+    while stack:
+        obj, packObj, path, typehint = stack.pop()
+        if typehint is not None and not checkType(obj, typehint):
+            violations.append(TypeViolation(packObj, path, obj, typehint))
+        if id(obj) in seen or not _populatable(obj) or (obj is not root and isinstance(obj, Identifiable)):
+            continue
+        seen.add(id(obj))
+
+        if isinstance(obj, dict):
+            # dict entries are shown as DictItems without children
+            keyTypehint, valueTypehint = _dictTypehints(typehint)
+            for i, (key, value) in enumerate(obj.items()):
+                itemPath = path + (f"{getTypeName(DictItem)} {i}",)
+                if keyTypehint is not None and not checkType(key, keyTypehint):
+                    violations.append(TypeViolation(packObj, itemPath, key, keyTypehint))
+                if valueTypehint is not None and not checkType(value, valueTypehint):
+                    violations.append(TypeViolation(packObj, itemPath, value, valueTypehint))
+            continue
+
+        # reversed, so that children are validated in the order of the views
+        children = [(child, packObj, path + (name,), childTypehint)
+                    for name, child, childTypehint in _children(obj, typehint, attrsCache)]
+        if obj is packObj:
+            children.extend((item, item, (), itemTypehint) for item, itemTypehint in _iterAttrsChildren(obj))
+        stack.extend(reversed(children))
+    return violations
+
+
+class ValidationResult(NamedTuple):
+    obj: Identifiable
+    # None if the object was changed during its validation and must be validated anew
+    violations: Optional[List[TypeViolation]]
+
+
+class ValidationReport:
+    """
+    Type violations of the identifiables of a package. The report is updated incrementally:
+    only identifiables added or marked as changed in the package since their last validation
+    are validated anew, see Package.trackChanges().
+    """
+
+    def __init__(self, package: Package):
+        self.package = package
+        self.changeLog = package.trackChanges()
+        # number of objects of the package the report corresponds to
+        self.numOfObjects = 0
+        # id(obj) -> identifiable to validate, kept until its result is taken
+        self._pending: Dict[int, Identifiable] = {}
+        self._results: Dict[Identifier, ValidationResult] = {}
+
+    def isOutdated(self) -> bool:
+        return bool(self.changeLog) or bool(self._pending) or self.numOfObjects != len(self.package.objStore)
+
+    def objectsToValidate(self) -> List[Identifiable]:
+        """Return identifiables of the package not validated yet or changed since their last validation"""
+        for obj in self.changeLog.take():
+            self._pending[id(obj)] = obj
+        objStore = self.package.objStore
+        if self.numOfObjects != len(objStore):
+            for obj in objStore:
+                result = self._results.get(obj.identification)
+                if result is None or result.obj is not obj:
+                    self._pending[id(obj)] = obj
+        return [obj for obj in self._pending.values() if obj in objStore]
+
+    def update(self, results: Iterable[ValidationResult]):
+        """
+        Take the results of a validation. Objects without violations in the results
+        keep their previous violations and are validated anew on the next update.
+        Results of identifiables removed from the package are dropped.
+        """
+        for result in results:
+            if result.violations is not None:
+                self._pending.pop(id(result.obj), None)
+                self._results[result.obj.identification] = result
+        objStore = self.package.objStore
+        self._results = {identifier: result for identifier, result in self._results.items()
+                         if identifier == result.obj.identification and result.obj in objStore}
+        self._pending = {key: obj for key, obj in self._pending.items() if obj in objStore}
+        self.numOfObjects = len(objStore)
+
+    @property
+    def violations(self) -> List[TypeViolation]:
+        return [violation for result in self._results.values() for violation in result.violations]
+
+    def __len__(self) -> int:
+        return sum(len(result.violations) for result in self._results.values())
@@ -626,11 +626,10 @@ class TreeView(BasicTreeView):
             result = self.model().setData(index, value, Qt.EditRole)
         elif role == ADD_ITEM_ROLE:
             if isinstance(value, dict):
-                for key, value in value.items():
-                    result = self.model().setData(index, DictItem(key, value), ADD_ITEM_ROLE)
+                items = [DictItem(key, value) for key, value in value.items()]
+                result = self.model().setData(index, items, ADD_ITEMS_ROLE)
             elif isSimpleIterable(value):
-                for i in value:
-                    result = self.model().setData(index, i, ADD_ITEM_ROLE)
+                result = self.model().setData(index, list(value), ADD_ITEMS_ROLE)
             else:
                 result = self.model().setData(index, value, ADD_ITEM_ROLE)
         else:
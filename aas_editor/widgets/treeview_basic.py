@@ -16,10 +16,13 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
+import math
+from typing import List
+
 from PyQt5 import QtCore
-from PyQt5.QtCore import Qt, pyqtSignal, QRect
+from PyQt5.QtCore import Qt, pyqtSignal, QRect, QPoint
 from PyQt5.QtGui import QMouseEvent, QPaintEvent, QPainter, QWheelEvent
-from PyQt5.QtWidgets import QTreeView
+from PyQt5.QtWidgets import QTreeView, QAbstractItemView
 
 from aas_editor.models.search_proxy_model import SearchProxyModel
 from aas_editor.settings.app_settings import *
@@ -38,6 +41,10 @@ class BasicTreeView(QTreeView):
         self.emptyViewMsg = emptyViewMsg
         self.emptyViewIcon = emptyViewIcon
         self.setMouseTracking(True)
+        # maximum of the vertical scroll bar for the fetched rows, the scroll bar also covers rows not fetched yet
+        self.fetchedScrollMaximum = 0
+        self._extendingScrollRange = False
+        self.verticalScrollBar().rangeChanged.connect(self._onScrollRangeChanged)
 
     def setModel(self, model: QtCore.QAbstractItemModel) -> None:
         super(BasicTreeView, self).setModel(model)
@@ -77,6 +84,104 @@ class BasicTreeView(QTreeView):
         else:
             super(BasicTreeView, self).wheelEvent(a0)
 
+    def updateGeometries(self) -> None:
+        # the range is set anew for the fetched rows, also if it equals the extended range
+        self._extendingScrollRange = True
+        try:
+            super(BasicTreeView, self).updateGeometries()
+        finally:
+            self._extendingScrollRange = False
+        self._extendScrollRange()
+
+    def _onScrollRangeChanged(self, minimum: int, maximum: int):
+        if not self._extendingScrollRange:
+            self._extendScrollRange()
+
+    def _extendScrollRange(self):
+        """Extend the range set by the view for the fetched rows by the rows not fetched yet"""
+        scrollBar = self.verticalScrollBar()
+        self.fetchedScrollMaximum = scrollBar.maximum()
+        unfetchedRows = sum(self.unfetchedRowCount(parent) for parent in self.pagedParents())
+        if unfetchedRows:
+            self._extendingScrollRange = True
+            try:
+                scrollBar.setMaximum(self.fetchedScrollMaximum + unfetchedRows * self.scrollStepPerRow())
+            finally:
+                self._extendingScrollRange = False
+
+    def scrollStepPerRow(self) -> int:
+        if self.verticalScrollMode() == QAbstractItemView.ScrollPerItem:
+            return 1
+        index = self.model().index(0, 0) if self.model() else QtCore.QModelIndex()
+        return self.rowHeight(index) if index.isValid() else self.fontMetrics().height()
+
+    def pagedParents(self) -> List[QtCore.QModelIndex]:
+        """Return indexes of the shown items with rows not fetched yet, in order of their position in the view"""
+        try:
+            sourceParents = self.sourceModel().pagedParents()
+        except AttributeError:
+            return []
+        parents = []
+        for sourceParent in sourceParents:
+            try:
+                parent = self.model().mapFromSource(sourceParent)
+            except AttributeError:
+                parent = sourceParent
+            if sourceParent.isValid() and not parent.isValid():
+                # filtered out by the proxy model
+                continue
+            if self.isShownExpanded(parent):
+                parents.append(parent)
+        parents.sort(key=lambda parent: self.visualRect(parent).top() if parent.isValid() else -1)
+        return parents
+
+    def isShownExpanded(self, index: QtCore.QModelIndex) -> bool:
+        """Return True if the item and all its ancestors are expanded, the root is always expanded"""
+        while index.isValid():
+            if not self.isExpanded(index):
+                return False
+            index = index.parent()
+        return True
+
+    def unfetchedRowCount(self, parent: QtCore.QModelIndex) -> int:
+        """Return number of rows of the item which are not fetched yet"""
+        try:
+            sourceParent = self.model().mapToSource(parent)
+        except AttributeError:
+            sourceParent = parent
+        sourceModel = self.sourceModel()
+        return sourceModel.totalRowCount(sourceParent) - sourceModel.rowCount(sourceParent)
+
+    def verticalScrollbarValueChanged(self, value: int) -> None:
+        super(BasicTreeView, self).verticalScrollbarValueChanged(value)
+        if value > self.fetchedScrollMaximum:
+            self.fetchMoreRows(math.ceil((value - self.fetchedScrollMaximum) / self.scrollStepPerRow()))
+        self.fetchMoreOfVisibleItems()
+
+    def fetchMoreRows(self, count: int):
+        """Fetch pages of the shown items with rows not fetched yet until at least count rows are fetched"""
+        model = self.model()
+        for parent in self.pagedParents():
+            while count > 0 and model.canFetchMore(parent):
+                numOfRows = model.rowCount(parent)
+                model.fetchMore(parent)
+                count -= model.rowCount(parent) - numOfRows
+            if count <= 0:
+                break
+
+    def fetchMoreOfVisibleItems(self):
+        """Fetch next rows of the items whose last fetched row is visible, e.g. next page of a large collection"""
+        model = self.model()
+        if model is None:
+            return
+        bottom = self.viewport().height()
+        index = self.indexAt(QPoint(0, 0))
+        while index.isValid() and self.visualRect(index).top() < bottom:
+            parent = index.parent()
+            if parent.isValid() and index.row() == model.rowCount(parent) - 1 and model.canFetchMore(parent):
+                model.fetchMore(parent)
+            index = self.indexBelow(index)
+
     def paintEvent(self, e: QPaintEvent) -> None:
         if (self.model() and self.model().rowCount()) \
                 or not (self.emptyViewMsg or self.emptyViewIcon):
@@ -16,11 +16,13 @@
 #
 #  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
 
+from functools import partial
+
 from PyQt5 import QtCore
 from PyQt5.QtCore import Qt, QModelIndex
 from PyQt5.QtWidgets import QAbstractScrollArea
 
-from aas_editor.models import DetailedInfoTable
+from aas_editor.models import DetailedInfoTable, DETAILED_INFO_TABLES
 from aas_editor.delegates import EditDelegate
 from aas_editor.settings.app_settings import ATTR_COLUMN_WIDTH, NAME_ROLE, ATTRIBUTE_COLUMN, \
     VALUE_COLUMN, LINKED_ITEM_ROLE, IS_LINK_ROLE, PARENT_OBJ_ROLE
@@ -33,6 +35,14 @@ class AttrsTreeView(TreeView):
     def __init__(self, parent=None, treeModel = DetailedInfoTable, **kwargs):
         super(AttrsTreeView, self).__init__(parent, **kwargs)
         self.treeModel = treeModel
+        # shown table, which is released if another pack item is opened or the view is destroyed
+        self._shownTable = []
+        self.destroyed.connect(partial(self._releaseTable, self._shownTable))
+
+    @staticmethod
+    def _releaseTable(shownTable: list, *args):
+        while shownTable:
+            DETAILED_INFO_TABLES.release(shownTable.pop())
 
     # noinspection PyUnresolvedReferences
     def newPackItem(self, packItem):
@@ -44,7 +54,11 @@ class AttrsTreeView(TreeView):
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         self.setSizeAdjustPolicy(QAbstractScrollArea.AdjustToContents)
         self.setObjectName("attrsTreeView")
-        self.setModelWithProxy(self.treeModel(packItem))
+        # tables are shared with other views showing the pack item
+        table = DETAILED_INFO_TABLES.acquire(packItem, self.treeModel)
+        self._releaseTable(self._shownTable)
+        self._shownTable.append(table)
+        self.setModelWithProxy(table)
         self.setColumnWidth(ATTRIBUTE_COLUMN, ATTR_COLUMN_WIDTH)
         self.setItemDelegate(EditDelegate(self))
 
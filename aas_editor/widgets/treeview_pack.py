@@ -20,9 +20,9 @@ from pathlib import Path
 from typing import Optional
 
 from PyQt5 import QtCore
-from PyQt5.QtCore import Qt, QModelIndex, QSettings, QPoint
+from PyQt5.QtCore import Qt, QModelIndex, QSettings, QPoint, QCoreApplication, QEventLoop
 from PyQt5.QtGui import QDropEvent, QDragEnterEvent, QKeyEvent
-from PyQt5.QtWidgets import QAction, QMessageBox, QFileDialog, QMenu, QWidget
+from PyQt5.QtWidgets import QAction, QMessageBox, QFileDialog, QMenu, QWidget, QProgressDialog
 from basyx.aas.model import AssetAdministrationShell
 
 from aas_editor.delegates import EditDelegate
@@ -41,6 +41,7 @@ from aas_editor.utils.util import getDefaultVal, getReqParams4init
 from aas_editor.utils.util_classes import ClassesInfo
 from aas_editor.widgets import TreeView
 from aas_editor.widgets.treeview import HeaderView
+from aas_editor.workers import PackageLoader, PackageSaver
 from aas_editor import dialogs
 
 
@@ -114,6 +115,11 @@ class PackTreeView(TreeView):
                                            emptyViewIcon=self.EMPTY_VIEW_ICON, **kwargs)
         PackTreeView.__instance = self
         self.recentFilesSeparator = None
+        # files which are currently being read in background
+        self.packLoaders: typing.Dict[Path, PackageLoader] = {}
+        self.packSavers: typing.Dict[Package, PackageSaver] = {}
+        # packages to save again after the running save, with the file to save to
+        self.pendingSaves: typing.Dict[Package, Optional[str]] = {}
         self.setAcceptDrops(True)
         self.setExpandsOnDoubleClick(False)
         self.setSelectionBehavior(self.SelectItems)
@@ -155,7 +161,7 @@ class PackTreeView(TreeView):
 
         self.saveAct = QAction(SAVE_ICON, "Save", self,
                                statusTip="Save current file",
-                               triggered=lambda: self.savePack(),
+                               triggered=lambda: self.savePackInBackground(),
                                enabled=False)
 
         self.saveAsAct = QAction("Save As...", self,
@@ -238,8 +244,9 @@ class PackTreeView(TreeView):
 
         packs = self.sourceModel().match(QModelIndex(), TYPE_ROLE, Package)
         if checked:
+            CLASSES_INFO[AssetAdministrationShell][PACKVIEW_ATTRS_INFO] = {"asset": {}, "submodel": {}}
+            ClassesInfo.invalidate()
             for pack in packs:
-                CLASSES_INFO[AssetAdministrationShell][PACKVIEW_ATTRS_INFO] = {"asset": {}, "submodel": {}}
                 self.sourceModel().update(pack)
 
             rowsToHide = []
@@ -249,6 +256,7 @@ class PackTreeView(TreeView):
                 self.setRowHidden(row.row(), row.parent(), True)
         else:
             CLASSES_INFO[AssetAdministrationShell][PACKVIEW_ATTRS_INFO] = {}
+            ClassesInfo.invalidate()
             for pack in packs:
                 self.sourceModel().update(pack)
 
@@ -406,25 +414,70 @@ class PackTreeView(TreeView):
                 # cancel pressed
                 return
 
-    def openPack(self, file: str) -> typing.Union[bool, Package]:
-        try:
-            pack = Package(file)
-            absFile = pack.file.absolute().as_posix()
-            self.updateRecentFiles(absFile)
-        except Exception as e:
-            self.removeFromRecentFiles(file)
-            dialogs.ErrorMessageBox.withTraceback(self, f"Package {file} couldn't be opened: {e}").exec()
+    def openPack(self, file: str, undoable: bool = True, wait: bool = False) -> typing.Union[bool, PackageLoader]:
+        """
+        Start reading of the package in background, the package is added to the model after reading
+        :param undoable: record adding of the package as undo step, False e.g. for packages opened at startup
+        :param wait: wait until the package is read, a modal progress dialog blocks the application meanwhile
+        """
+        absFile = Path(file).absolute()
+        openedPacks = self.model().data(QModelIndex(), OPENED_FILES_ROLE)
+        if absFile in openedPacks or absFile in self.packLoaders:
+            QMessageBox.critical(self, "Error", f"Package {file} is already opened")
+            return False
+
+        loader = PackageLoader(absFile)
+        progressDialog = QProgressDialog(f"Opening {absFile.name}...", "Cancel", 0, 100, self)
+        progressDialog.setWindowTitle("Open AAS file")
+        progressDialog.setWindowModality(Qt.ApplicationModal if wait else Qt.NonModal)
+        progressDialog.setMinimumDuration(500)
+        progressDialog.setAutoClose(False)
+        progressDialog.setAutoReset(False)
+        progressDialog.canceled.connect(loader.cancel)
+
+        def onFinished():
+            self.packLoaders.pop(absFile, None)
+            # ends exec_() of a waiting call
+            progressDialog.done(0)
+            progressDialog.deleteLater()
+
+        loader.signals.progress.connect(progressDialog.setValue)
+        loader.signals.loaded.connect(lambda pack: self._onPackLoaded(pack, undoable))
+        loader.signals.failed.connect(lambda error, tb: self._onPackLoadFailed(file, error, tb))
+        loader.signals.loaded.connect(onFinished)
+        loader.signals.failed.connect(onFinished)
+        loader.signals.cancelled.connect(onFinished)
+
+        self.packLoaders[absFile] = loader
+        loader.start()
+        if wait:
+            progressDialog.exec_()
+        return loader
+
+    def openPackAndWait(self, file: str) -> Optional[Package]:
+        """Open the package and return it after it is read, None if it couldn't be opened"""
+        loader = self.openPack(file, wait=True)
+        return loader.package if loader else None
+
+    def _onPackLoaded(self, pack: Package, undoable: bool = True):
+        self.updateRecentFiles(pack.file.absolute().as_posix())
+        if undoable:
+            self.model().setData(QModelIndex(), pack, ADD_ITEM_ROLE)
         else:
-            openedPacks = self.model().data(QModelIndex(), OPENED_FILES_ROLE)
-            if Path(file).absolute() in openedPacks:
-                QMessageBox.critical(self, "Error", f"Package {file} is already opened")
-            else:
-                self.model().setData(QModelIndex(), pack, ADD_ITEM_ROLE)
-                return pack
-        return False
+            self.model().addPackWithoutUndo(pack)
+
+    def _onPackLoadFailed(self, file: str, error: str, tb: str):
+        self.removeFromRecentFiles(file)
+        dialogs.ErrorMessageBox.withDetailedText(self, f"Package {file} couldn't be opened: {error}\n\n{tb}").exec()
+
+    def cancelLoading(self):
+        for loader in self.packLoaders.values():
+            loader.cancel()
 
     def savePack(self, pack: Package = None, file: str = None) -> bool:
+        """Save the package and wait until it is written"""
         pack = self.currentIndex().data(PACKAGE_ROLE) if pack is None else pack
+        self.waitForSaving()
         try:
             pack.write(file)
             self.updateRecentFiles(pack.file.absolute().as_posix())
@@ -435,6 +488,69 @@ class PackTreeView(TreeView):
             QMessageBox.critical(self, "Error", f"No chosen package to save: {e}")
         return False
 
+    def savePackInBackground(self, pack: Package = None, file: str = None) -> typing.Union[bool, PackageSaver]:
+        """
+        Take a snapshot of the package and write it in background, so that the package can be edited further.
+        Errors occurred while writing are shown when the saving is finished.
+        """
+        pack = self.currentIndex().data(PACKAGE_ROLE) if pack is None else pack
+        if pack in self.packSavers:
+            # save the current state after the running save is finished
+            self.pendingSaves[pack] = file
+            return self.packSavers[pack]
+
+        try:
+            snapshot = pack.snapshot(file)
+        except (TypeError, ValueError, KeyError) as e:
+            dialogs.ErrorMessageBox.withTraceback(self, f"Package couldn't be saved: {file}: {e}").exec()
+            return False
+        except AttributeError as e:
+            QMessageBox.critical(self, "Error", f"No chosen package to save: {e}")
+            return False
+
+        saver = PackageSaver(snapshot)
+        progressDialog = QProgressDialog(f"Saving {snapshot.file.name}...", "", 0, 100, self)
+        progressDialog.setWindowTitle("Save AAS file")
+        progressDialog.setWindowModality(Qt.NonModal)
+        progressDialog.setCancelButton(None)
+        progressDialog.setMinimumDuration(500)
+        progressDialog.setAutoClose(False)
+        progressDialog.setAutoReset(False)
+
+        def onFinished():
+            self.packSavers.pop(pack, None)
+            progressDialog.deleteLater()
+            if pack in self.pendingSaves:
+                self.savePackInBackground(pack, self.pendingSaves.pop(pack))
+
+        saver.signals.progress.connect(progressDialog.setValue)
+        saver.signals.written.connect(lambda snapshot: self._onPackWritten(pack, snapshot))
+        saver.signals.failed.connect(lambda error, tb: self._onPackSaveFailed(snapshot.file, error, tb))
+        saver.signals.written.connect(onFinished)
+        saver.signals.failed.connect(onFinished)
+
+        self.packSavers[pack] = saver
+        saver.start()
+        return saver
+
+    def _onPackWritten(self, pack: Package, snapshot):
+        try:
+            pack.commitSnapshot(snapshot)
+        except OSError as e:
+            dialogs.ErrorMessageBox.withTraceback(self, f"Package couldn't be saved: {snapshot.file}: {e}").exec()
+        else:
+            self.updateRecentFiles(snapshot.file.as_posix())
+        finally:
+            snapshot.discard()
+
+    def _onPackSaveFailed(self, file: Path, error: str, tb: str):
+        dialogs.ErrorMessageBox.withDetailedText(self, f"Package {file} couldn't be saved: {error}\n\n{tb}").exec()
+
+    def waitForSaving(self):
+        """Wait until all packages saving in background are written"""
+        while self.packSavers:
+            QCoreApplication.processEvents(QEventLoop.WaitForMoreEvents)
+
     def savePackAsWithDialog(self, pack: Package = None, filter=FILTER_AAS_FILES) -> bool:
         pack = self.currentIndex().data(PACKAGE_ROLE) if pack is None else pack
         saved = False
@@ -447,14 +563,15 @@ class PackTreeView(TreeView):
                 QMessageBox.critical(self, "Error", f"No chosen package to save: {e}")
             else:
                 if file:
-                    saved = self.savePack(pack, file)
+                    saved = self.savePackInBackground(pack, file)
                 else:
                     # cancel pressed
                     return
 
     def saveAll(self):
+        """Save all packages in parallel in background"""
         for pack in self.model().data(QModelIndex(), OPENED_PACKS_ROLE):
-            self.savePack(pack)
+            self.savePackInBackground(pack)
 
     def closeFileWithDialog(self):
         pack = self.currentIndex().data(PACKAGE_ROLE)
@@ -491,8 +608,8 @@ class PackTreeView(TreeView):
         dialog.button(QMessageBox.Save).setText("&Save and Close All")
         res = dialog.exec()
         if res == QMessageBox.Save:
-            for pack in self.model().data(QModelIndex(), OPENED_PACKS_ROLE):
-                self.savePack(pack)
+            self.saveAll()
+            self.waitForSaving()
             self.closeAllFiles()
         elif res == QMessageBox.Discard:
             self.closeAllFiles()
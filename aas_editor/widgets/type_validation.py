@@ -0,0 +1,161 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from typing import Optional
+
+from PyQt5.QtCore import Qt, QModelIndex, QTimer
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, \
+    QProgressBar, QMessageBox
+
+from aas_editor.package import Package
+from aas_editor.settings.app_settings import NAME_ROLE, OBJECT_ROLE, ATTRIBUTE_COLUMN, VALIDATION_INTERVAL, \
+    MAX_SIGNS_TO_SHOW_IN_TREE
+from aas_editor.validation import ValidationReport, TypeViolation
+from aas_editor.workers import PackageValidator
+from aas_editor import dialogs
+
+
+class TypeValidationDialog(QDialog):
+    """
+    Report of the type violations in a package. The package is validated in background and
+    changed identifiables are validated anew while the dialog is open.
+    Double click on a violation opens its item in the detailed view.
+    """
+    COLUMNS = ("Object", "Path", "Value", "Value type", "Expected type")
+
+    def __init__(self, package: Package, packTreeView, tabWidget, parent=None):
+        super(TypeValidationDialog, self).__init__(parent)
+        self.setWindowTitle(f"Type validation: {package.name}")
+        self.setWindowModality(Qt.NonModal)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setMinimumSize(700, 400)
+
+        self.packTreeView = packTreeView
+        self.tabWidget = tabWidget
+        self.report = ValidationReport(package)
+        self.validator: Optional[PackageValidator] = None
+        # change id of the package at a failed validation, validated again after the next change
+        self.failedChangeId: Optional[int] = None
+
+        self.descrLabel = QLabel(self)
+        self.violationsWidget = QTreeWidget(self)
+        self.violationsWidget.setHeaderLabels(self.COLUMNS)
+        self.violationsWidget.setRootIsDecorated(False)
+        self.violationsWidget.itemDoubleClicked.connect(self.openViolation)
+        self.progressBar = QProgressBar(self)
+        self.progressBar.hide()
+        self.validateButton = QPushButton("Validate all", self,
+                                          toolTip="Validate all objects of the package anew",
+                                          clicked=self.validateAll)
+        self._initLayout()
+
+        # the change log of the package is polled, so that rapid edits are validated together
+        self.timer = QTimer(self, interval=VALIDATION_INTERVAL, timeout=self.validateChanged)
+        self.timer.start()
+        self.validateChanged()
+
+    def _initLayout(self):
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.descrLabel)
+        layout.addWidget(self.violationsWidget)
+        layout.addWidget(self.progressBar)
+        layout.addWidget(self.validateButton)
+        self.setLayout(layout)
+
+    def validateAll(self):
+        self.report = ValidationReport(self.report.package)
+        self.failedChangeId = None
+        self.validateChanged(force=True)
+
+    def validateChanged(self, force: bool = False):
+        """Validate identifiables added or changed since the last validation"""
+        if self.validator is not None:
+            if not force:
+                return
+            self.validator.cancel()
+        package = self.report.package
+        if not force and (not self.report.isOutdated() or self.failedChangeId == package.changeId):
+            return
+
+        objs = self.report.objectsToValidate()
+        validator = self.validator = PackageValidator(objs, package.changeId)
+        validator.signals.progress.connect(self.progressBar.setValue)
+        validator.signals.validated.connect(lambda results: self._onValidated(validator, results))
+        validator.signals.failed.connect(lambda error, tb: self._onValidationFailed(validator, error, tb))
+        validator.signals.cancelled.connect(lambda: self._onFinished(validator))
+        self.progressBar.setValue(0)
+        self.progressBar.setVisible(bool(objs))
+        validator.start()
+
+    def _onFinished(self, validator: PackageValidator) -> bool:
+        """Return True if the validator is the current one"""
+        if validator is not self.validator:
+            return False
+        self.validator = None
+        self.progressBar.hide()
+        return True
+
+    def _onValidated(self, validator: PackageValidator, results):
+        if self._onFinished(validator):
+            self.failedChangeId = None
+            self.report.update(results)
+            self.updateViolations()
+
+    def _onValidationFailed(self, validator: PackageValidator, error: str, tb: str):
+        if self._onFinished(validator):
+            # the timer keeps running, the package is validated again after its next change
+            self.failedChangeId = validator.changeId
+            dialogs.ErrorMessageBox.withDetailedText(self, f"Package couldn't be validated: {error}\n\n{tb}").exec()
+
+    def updateViolations(self):
+        self.violationsWidget.clear()
+        items = []
+        for violation in self.report.violations:
+            item = QTreeWidgetItem([violation.objName,
+                                    "/".join(violation.path),
+                                    str(violation.value)[:MAX_SIGNS_TO_SHOW_IN_TREE],
+                                    violation.valueTypeName,
+                                    violation.typehintName])
+            item.setData(0, Qt.UserRole, violation)
+            items.append(item)
+        self.violationsWidget.addTopLevelItems(items)
+        self.descrLabel.setText(f"{len(items)} type violations found in {self.report.numOfObjects} objects")
+
+    def openViolation(self, item: QTreeWidgetItem):
+        """Open the object of the violation in the current tab and select the violating item"""
+        violation: TypeViolation = item.data(0, Qt.UserRole)
+        packItems = self.packTreeView.sourceModel().match(QModelIndex(), OBJECT_ROLE, violation.obj, hits=1)
+        if not packItems:
+            QMessageBox.critical(self, "Error", f"Item not found: {violation.obj}")
+            return
+        self.tabWidget.openItem(packItems[0])
+
+        view = self.tabWidget.currentWidget().attrsTreeView
+        model = view.model()
+        index = QModelIndex()
+        for name in violation.path:
+            while model.canFetchMore(index):
+                model.fetchMore(index)
+            children = (model.index(row, ATTRIBUTE_COLUMN, index) for row in range(model.rowCount(index)))
+            child = next((child for child in children if child.data(NAME_ROLE) == name), None)
+            if child is None:
+                break
+            if index.isValid():
+                view.expand(index)
+            index = child
+        view.setCurrentIndex(index)
+        view.scrollTo(index)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        if self.validator is not None:
+            self.validator.cancel()
+            self.validator = None
+        super(TypeValidationDialog, self).closeEvent(event)
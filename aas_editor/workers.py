@@ -0,0 +1,187 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import traceback
+from pathlib import Path
+from typing import List, Optional, Union
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from basyx.aas.model import Identifiable
+
+from aas_editor.package import Package, LoadingCancelled, PackageSnapshot
+from aas_editor.package_cache import PACKAGE_CACHE
+from aas_editor.settings import AppSettings
+from aas_editor.validation import validateObject, ValidationResult
+
+
+class PackageLoaderSignals(QObject):
+    # percent of the read file
+    progress = pyqtSignal(int)
+    loaded = pyqtSignal(object)
+    # error message, traceback
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal()
+
+
+class PackageLoader(QRunnable):
+    """Read a package in a thread of the global thread pool, unchanged packages are taken from the package cache"""
+
+    def __init__(self, file: Union[str, Path]):
+        super(PackageLoader, self).__init__()
+        self.file = file
+        self.signals = PackageLoaderSignals()
+        # settings are read in the main thread
+        self.cache = PACKAGE_CACHE if AppSettings.PACKAGE_CACHE_ENABLED.value() else None
+        # read package, set before loaded is emitted
+        self.package: Optional[Package] = None
+        self._cancelled = False
+        self._percent = -1
+
+    def cancel(self):
+        self._cancelled = True
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def onProgress(self, bytesRead: int, size: int):
+        # emit only if percent changed, so that the event loop is not flooded
+        percent = int(bytesRead * 100 / size) if size else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(percent)
+
+    def run(self):
+        if self._cancelled:
+            self.signals.cancelled.emit()
+            return
+        try:
+            pack = Package(self.file, progress=self.onProgress, isCancelled=self.isCancelled, cache=self.cache)
+        except Exception as e:
+            # readers of the SDK may wrap LoadingCancelled in their own errors
+            if self._cancelled or isinstance(e, LoadingCancelled):
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e), traceback.format_exc())
+        else:
+            # parts not needed for parsing, e.g. supplementary files, are not read
+            self.onProgress(1, 1)
+            self.package = pack
+            self.signals.loaded.emit(pack)
+
+
+class PackageSaverSignals(QObject):
+    # percent of the written objects
+    progress = pyqtSignal(int)
+    written = pyqtSignal(object)
+    # error message, traceback
+    failed = pyqtSignal(str, str)
+
+
+class PackageSaver(QRunnable):
+    """
+    Write a snapshot of a package in a thread of the global thread pool.
+    The written snapshot must be committed to the package in the main thread.
+    """
+
+    def __init__(self, snapshot: PackageSnapshot):
+        super(PackageSaver, self).__init__()
+        self.snapshot = snapshot
+        self.signals = PackageSaverSignals()
+        self._percent = -1
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def onProgress(self, numOfWritten: int, numOfAll: int):
+        percent = int(numOfWritten * 100 / numOfAll) if numOfAll else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(percent)
+
+    def run(self):
+        try:
+            self.snapshot.write(progress=self.onProgress)
+        except Exception as e:
+            self.snapshot.discard()
+            self.signals.failed.emit(str(e), traceback.format_exc())
+        else:
+            self.signals.written.emit(self.snapshot)
+
+
+class PackageValidatorSignals(QObject):
+    # percent of the validated objects
+    progress = pyqtSignal(int)
+    # list of ValidationResult of the validated identifiables
+    validated = pyqtSignal(object)
+    # error message, traceback
+    failed = pyqtSignal(str, str)
+    cancelled = pyqtSignal()
+
+
+class PackageValidator(QRunnable):
+    """
+    Validate types of identifiables of a package in a thread of the global thread pool.
+    The identifiables are validated one after another in one runnable: the walk holds the GIL,
+    so runnables per identifiable would not finish sooner.
+    The results must be taken into the ValidationReport of the package in the main thread.
+    """
+
+    def __init__(self, objs: List[Identifiable], changeId: int):
+        """
+        :param objs: identifiables to validate
+        :param changeId: change id of the package
+        """
+        super(PackageValidator, self).__init__()
+        self.objs = objs
+        self.changeId = changeId
+        self.signals = PackageValidatorSignals()
+        self._cancelled = False
+        self._percent = -1
+
+    def cancel(self):
+        self._cancelled = True
+
+    def isCancelled(self) -> bool:
+        return self._cancelled
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def onProgress(self, numOfValidated: int, numOfAll: int):
+        percent = int(numOfValidated * 100 / numOfAll) if numOfAll else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(percent)
+
+    @staticmethod
+    def validate(obj: Identifiable) -> ValidationResult:
+        """Return result of the validation of the object, without violations if the object was changed meanwhile"""
+        try:
+            return ValidationResult(obj, validateObject(obj))
+        except RuntimeError:
+            # a collection of the object was changed meanwhile in the main thread
+            return ValidationResult(obj, None)
+
+    def run(self):
+        results = []
+        try:
+            for i, obj in enumerate(self.objs):
+                if self._cancelled:
+                    self.signals.cancelled.emit()
+                    return
+                results.append(self.validate(obj))
+                self.onProgress(i + 1, len(self.objs))
+        except Exception as e:
+            self.signals.failed.emit(str(e), traceback.format_exc())
+        else:
+            self.signals.validated.emit(results)
@@ -0,0 +1,91 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from pathlib import Path
+from unittest import TestCase
+
+# settings are imported first, they are needed by the imports of the package module
+import aas_editor.settings
+from basyx.aas.model import Identifier, IdentifierType, Key, Submodel
+
+from aas_editor.completions import CompletionModel, IdentifierCompletions, IDENTIFIER_COMPLETIONS, completionsFor
+from aas_editor.package import Package
+
+TEST_PACKAGE = Path(__file__).parent.joinpath("aas_files", "TestPackage.aasx")
+
+
+def completionsOf(model: CompletionModel) -> list:
+    return [model.index(row).data() for row in range(model.rowCount())]
+
+
+class TestCompletionModel(TestCase):
+    def setUp(self) -> None:
+        self.model = CompletionModel()
+
+    def test_sortedAndUnique(self):
+        self.model.add(["b", "C", "a", "b"])
+        self.model.add(["B"])
+        self.assertEqual(["a", "B", "b", "C"], completionsOf(self.model))
+
+    def test_removeCounted(self):
+        """Completions are removed after they were removed as often as they were added"""
+        self.model.add(["a", "a", "b"])
+        self.model.remove(["a", "b", "unknown"])
+        self.assertEqual(["a"], completionsOf(self.model))
+        self.model.remove(["a"])
+        self.assertEqual([], completionsOf(self.model))
+        self.assertNotIn("a", self.model)
+
+    def test_bulkChanges(self):
+        """Changes of more than BULK_SIZE completions rebuild the model with the same result"""
+        completions = [f"id{i}" for i in range(CompletionModel.BULK_SIZE * 2)]
+        self.model.add(["x"])
+        self.model.add(reversed(completions))
+        self.assertEqual(sorted(completions + ["x"], key=str.lower), completionsOf(self.model))
+        self.model.remove(completions)
+        self.assertEqual(["x"], completionsOf(self.model))
+
+
+class TestIdentifierCompletions(TestCase):
+    def setUp(self) -> None:
+        self.completions = IdentifierCompletions()
+        self.pack = Package(TEST_PACKAGE)
+        self.ids = {obj.identification.id for obj in self.pack.objStore}
+
+    def test_packages(self):
+        """Identifiers shared by opened packages are completed until the last of the packages is closed"""
+        other = Package(TEST_PACKAGE)
+        self.completions.addPackage(self.pack)
+        self.completions.addPackage(other)
+        self.assertEqual(sorted(self.ids, key=str.lower), completionsOf(self.completions.model))
+        self.completions.removePackage(self.pack)
+        self.assertEqual(len(self.ids), self.completions.model.rowCount())
+        self.completions.removePackage(other)
+        self.assertEqual(0, self.completions.model.rowCount())
+
+    def test_objectsAndIdentifierChanges(self):
+        self.completions.addPackage(self.pack)
+        submodel = Submodel(Identifier("urn:new", IdentifierType.IRI))
+        self.pack.add(submodel)
+        self.completions.addObject(self.pack, submodel)
+        self.assertIn("urn:new", self.completions.model)
+
+        oldIdentifier = submodel.identification
+        submodel.identification = Identifier("urn:renamed", IdentifierType.IRI)
+        self.pack.setIdentifierChanged(submodel, oldIdentifier)
+        self.completions.updateIdentifiers(self.pack)
+        self.assertNotIn("urn:new", self.completions.model)
+        self.assertIn("urn:renamed", self.completions.model)
+
+        self.completions.removeObject(self.pack, submodel)
+        self.assertEqual(sorted(self.ids, key=str.lower), completionsOf(self.completions.model))
+
+    def test_completionsForKeys(self):
+        self.assertIs(IDENTIFIER_COMPLETIONS.model, completionsFor(Key, "value"))
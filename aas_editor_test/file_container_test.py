@@ -0,0 +1,90 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import TestCase
+
+import aas_editor.settings
+from aas_editor.file_container import ZipSupplementaryFileContainer
+from aas_editor.package import Package
+
+AAS_FILES = Path(__file__).parent.joinpath("aas_files")
+TEST_PACKAGE = AAS_FILES.joinpath("TestPackage.aasx")
+
+
+class TestFileContainer(TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_readOnDemand(self):
+        fileStore = Package(TEST_PACKAGE).fileStore
+        self.assertIsInstance(fileStore, ZipSupplementaryFileContainer)
+        with zipfile.ZipFile(TEST_PACKAGE) as zipFile:
+            expected = zipFile.read("TestFile.pdf")
+        with fileStore.open_file("/TestFile.pdf") as file:
+            self.assertEqual(expected, file.read())
+        self.assertEqual(hashlib.sha256(expected).digest(), fileStore.get_sha256("/TestFile.pdf"))
+
+    def test_rebase(self):
+        fileStore = Package(TEST_PACKAGE).fileStore
+        with fileStore.open_file("/TestFile.pdf") as file:
+            expected = file.read()
+        # the new archive doesn't contain the file, it is kept in a temporary file
+        newArchive = os.path.join(self.dir, "new.aasx")
+        with zipfile.ZipFile(newArchive, "w") as zipFile:
+            zipFile.writestr("other.txt", "other")
+        movedArchive = os.path.join(self.dir, "moved.aasx")
+        fileStore.rebase(newArchive, movedArchive)
+
+        self.assertEqual(Path(movedArchive).absolute(), fileStore.archive)
+        self.assertFalse(os.path.exists(newArchive))
+        with fileStore.open_file("/TestFile.pdf") as file:
+            self.assertEqual(expected, file.read())
+
+
+class TestFileDeduplication(TestCase):
+    def test_deduplicateAndDelete(self):
+        fileStore = ZipSupplementaryFileContainer()
+        a = fileStore.add_file("/a.txt", io.BytesIO(b"hello"), "text/plain")
+        b = fileStore.add_file("/b.txt", io.BytesIO(b"hello"), "text/plain")
+        other = fileStore.add_file("/other.bin", io.BytesIO(b"hello"), "application/octet-stream")
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, other)
+        self.assertEqual(5, fileStore.savedBytes)
+
+        # the file is kept as long as it is referenced
+        fileStore.delete_file(b)
+        self.assertIn(a, fileStore)
+        fileStore.delete_file(a)
+        self.assertNotIn(a, fileStore)
+
+        # deleted content is not used for deduplication anymore
+        c = fileStore.add_file("/c.txt", io.BytesIO(b"hello"), "text/plain")
+        self.assertEqual("/c.txt", c)
+        with fileStore.open_file(c) as file:
+            self.assertEqual(b"hello", file.read())
+
+    def test_deduplicateArchiveFile(self):
+        fileStore = Package(TEST_PACKAGE).fileStore
+        with fileStore.open_file("/TestFile.pdf") as file:
+            data = file.read()
+        name = fileStore.add_file("/Copy.pdf", io.BytesIO(data), fileStore.get_content_type("/TestFile.pdf"))
+        self.assertEqual("/TestFile.pdf", name)
+        fileStore.delete_file(name)
+        self.assertIn("/TestFile.pdf", fileStore)
@@ -0,0 +1,84 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import datetime
+import decimal
+import hashlib
+from enum import Enum
+from typing import Dict, List
+
+from basyx.aas.model import Identifiable
+
+# attributes not followed, they reference the surrounding objects
+IGNORED_ATTRS = frozenset(("parent",))
+SCALAR_TYPES = (str, bytes, bytearray, int, float, complex, decimal.Decimal, datetime.date, datetime.time,
+                datetime.timedelta, Enum)
+# most common scalar types, checked without isinstance()
+_EXACT_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def fingerprint(root: Identifiable) -> bytes:
+    """
+    Return a hash of the content of the identifiable: the values of its attributes and of all contained objects.
+    Two identifiables with the same fingerprint are serialized the same way, so the tests compare objects
+    read from different files by their fingerprints. Contained identifiables are represented by their
+    identification only.
+    :raise RuntimeError if a collection of the identifiable is changed meanwhile, e.g. in another thread
+    """
+    tokens = []
+    _addTokens(root, root, tokens, {})
+    return hashlib.sha256("\x1f".join(tokens).encode("utf-8", "surrogatepass")).digest()
+
+
+def _addTokens(obj, root, tokens: List[str], visited: Dict[int, int]):
+    """Append tokens describing the object, objects visited before are referenced by their visit number"""
+    if type(obj) in _EXACT_SCALAR_TYPES or isinstance(obj, SCALAR_TYPES):
+        tokens.append(f"{type(obj).__name__}:{obj!r}")
+        return
+    if isinstance(obj, type):
+        tokens.append(f"type:{obj.__module__}.{obj.__qualname__}")
+        return
+    if obj is not root and isinstance(obj, Identifiable):
+        tokens.append(f"identifiable:{obj.identification!r}")
+        return
+    if id(obj) in visited:
+        tokens.append(f"visited:{visited[id(obj)]}")
+        return
+    visited[id(obj)] = len(visited)
+
+    tokens.append(f"{type(obj).__qualname__}(")
+    if isinstance(obj, dict):
+        for key, value in list(obj.items()):
+            _addTokens(key, root, tokens, visited)
+            _addTokens(value, root, tokens, visited)
+    elif isinstance(obj, (set, frozenset)):
+        # order of the set items depends on their hashes, so they are described separately and sorted
+        itemTokens = []
+        for item in list(obj):
+            itemTokens.append("\x1e".join(_itemTokens(item, root)))
+        tokens.extend(sorted(itemTokens))
+    elif isinstance(obj, (list, tuple)):
+        for item in list(obj):
+            _addTokens(item, root, tokens, visited)
+    elif hasattr(obj, "__dict__"):
+        for attr, value in sorted(vars(obj).items()):
+            if attr not in IGNORED_ATTRS:
+                tokens.append(attr)
+                _addTokens(value, root, tokens, visited)
+    else:
+        # repr of objects without attributes may contain their address, they are then never considered equal
+        tokens.append(repr(obj))
+    tokens.append(")")
+
+
+def _itemTokens(item, root) -> List[str]:
+    tokens = []
+    _addTokens(item, root, tokens, {})
+    return tokens
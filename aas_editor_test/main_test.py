@@ -12,7 +12,7 @@ import sys
 from time import sleep
 from unittest import TestCase
 
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QTimer, QThreadPool
 from PyQt5.QtWidgets import QApplication
 
 from aas_editor.editorApp import EditorApp
@@ -26,6 +26,9 @@ class TestUi(TestCase):
 
         self.window = EditorApp()
         self.window.mainTreeView.openPack("aas_files/TestPackage.aasx")
+        # package is read in background
+        QThreadPool.globalInstance().waitForDone()
+        self.app.processEvents()
         self.window.show()
 
         self.packTreeView: PackTreeView = self.window.mainTreeView
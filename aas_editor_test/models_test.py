@@ -0,0 +1,466 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import sys
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aas_editor.settings import NOT_GIVEN
+from aas_editor.settings.app_settings import NAME_ROLE, OBJECT_ROLE, ADD_ITEM_ROLE, ADD_ITEMS_ROLE, CLEAR_ROW_ROLE, \
+    UNDO_ROLE, DEFAULT_COLUMNS_IN_PACKS_TABLE, ATTRIBUTE_COLUMN, VALUE_COLUMN
+from PyQt5.QtCore import QModelIndex, QPersistentModelIndex, Qt
+from PyQt5.QtWidgets import QApplication
+from basyx.aas.model import Identifier, IdentifierType, Property, Submodel
+
+from aas_editor.models import PacksTable, DetailedInfoTable, StandardItem, PackTreeViewItem, DetailedInfoItem, \
+    DetailedInfoTableCache
+from aas_editor.models.undo_history import ENTRY_SIZE, estimateSize
+from aas_editor.package import Package
+
+TEST_PACKAGE = Path(__file__).parent.joinpath("aas_files", "TestPackage.aasx")
+
+
+class TestModelBase(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QApplication.instance() or QApplication(sys.argv)
+
+    def setUp(self) -> None:
+        self.model = PacksTable(DEFAULT_COLUMNS_IN_PACKS_TABLE)
+        self.pack = Package(TEST_PACKAGE)
+        self.model.setData(QModelIndex(), self.pack, ADD_ITEM_ROLE)
+        self.packIndex = self.model.index(0, 0, QModelIndex())
+
+    def childByName(self, parent: QModelIndex, name: str, model=None) -> QModelIndex:
+        model = model or (parent.model() if parent.isValid() else self.model)
+        if model.canFetchMore(parent):
+            model.fetchMore(parent)
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            if index.data(NAME_ROLE) == name:
+                return index
+        self.fail(f"No child {name} of {parent.data(NAME_ROLE)}")
+
+    def submodelIndex(self, idShort: str) -> QModelIndex:
+        return self.childByName(self.childByName(self.packIndex, "submodels"), idShort)
+
+
+class TestIdentifierChanges(TestModelBase):
+    def test_editIdOfIdentification(self):
+        """Editing the id of the identification rekeys the identifiable like editing the whole identification"""
+        submodel = Submodel(Identifier("urn:edited", IdentifierType.IRI), id_short="Edited")
+        self.pack.add(submodel)
+        self.model.update(self.packIndex)
+        submodelIndex = self.submodelIndex("Edited")
+        oldIdentifier = Identifier(submodel.identification.id, submodel.identification.id_type)
+        self.pack.addIdentifierChangesConsumer(self)
+
+        table = DetailedInfoTable(submodelIndex)
+        idIndex = self.childByName(self.childByName(QModelIndex(), "identification", table), "id")
+        # identifiers are edited in place with the SDK used by the editor
+        with mock.patch.object(Identifier, "__setattr__", object.__setattr__):
+            self.assertTrue(table.setData(idIndex, "urn:changed", Qt.EditRole))
+
+        changes = self.pack.takeIdentifierChanges(self)
+        self.assertEqual([(submodel, oldIdentifier)], [(change.obj, change.oldIdentifier) for change in changes])
+        self.pack.discard(submodel)
+        self.assertNotIn(submodel, self.pack.objStore)
+        self.assertNotIn(oldIdentifier, self.pack.objStore)
+
+
+class TestItemRows(TestCase):
+    def setUp(self) -> None:
+        self.parent = StandardItem(None)
+        self.children = [StandardItem(i, f"child{i}", parent=self.parent) for i in range(10)]
+
+    def assertRows(self):
+        self.assertEqual(list(range(len(self.parent.children()))), [child.row() for child in self.parent.children()])
+
+    def test_rowsAfterDetach(self):
+        self.assertEqual(list(range(10)), [child.row() for child in self.children])
+        for child in self.children[2:5]:
+            child.setParent(None)
+        self.assertRows()
+        self.assertEqual(2, self.children[5].row())
+        self.assertEqual(0, self.children[2].row())
+
+        StandardItem(None, "last", parent=self.parent)
+        self.assertRows()
+        self.children[0].setParent(None)
+        self.assertRows()
+        self.assertEqual(1, self.children[5].row())
+
+    def test_rowsAfterChanges(self):
+        self.assertEqual(list(range(10)), [child.row() for child in self.children])
+        self.parent.removeChildren(2, 3)
+        self.assertRows()
+        self.assertEqual(2, self.children[5].row())
+
+        self.parent.insertChildren(1, [StandardItem(None, "new1"), StandardItem(None, "new2")])
+        self.assertRows()
+        self.assertEqual(4, self.children[5].row())
+
+        self.children[0].setParent(None)
+        self.assertEqual(0, self.children[0].row())
+        self.assertRows()
+        StandardItem(None, "last", parent=self.parent)
+        self.assertRows()
+
+
+class TestModelRows(TestModelBase):
+    def test_rowsOfParentIndexes(self):
+        """Parent indexes created by the model have the current rows of the items"""
+        packs = [Package(), Package()]
+        for pack in packs:
+            self.model.setData(QModelIndex(), pack, ADD_ITEM_ROLE)
+        lastPackIndex = self.model.index(2, 0)
+        self.model.fetchMore(lastPackIndex)
+        groupIndex = self.model.index(0, 0, lastPackIndex)
+        self.assertTrue(self.model.clearRow(0, QModelIndex()))
+        self.assertEqual(1, self.model.parent(groupIndex).row())
+        self.assertIs(packs[1], self.model.parent(groupIndex).data(OBJECT_ROLE))
+
+
+class TestLazyFetch(TestModelBase):
+    def test_childrenCreatedOnFetch(self):
+        self.assertTrue(self.model.hasChildren(self.packIndex))
+        self.assertTrue(self.model.canFetchMore(self.packIndex))
+        self.assertEqual(0, self.model.rowCount(self.packIndex))
+
+        self.model.fetchMore(self.packIndex)
+        self.assertFalse(self.model.canFetchMore(self.packIndex))
+        self.assertTrue(self.model.rowCount(self.packIndex))
+
+        submodelIndex = self.submodelIndex("TestSubmodel")
+        self.assertTrue(self.model.hasChildren(submodelIndex))
+        self.assertTrue(self.model.canFetchMore(submodelIndex))
+        self.assertEqual(0, self.model.rowCount(submodelIndex))
+
+    def test_itemsWithoutChildren(self):
+        """Items of objects without children are not populated to find it out"""
+        submodel = Submodel(Identifier("urn:flat", IdentifierType.IRI), id_short="Flat")
+        submodel.submodel_element.add(Property("prop", str))
+        self.pack.add(submodel)
+        self.model.update(self.packIndex)
+        propertyIndex = self.childByName(self.submodelIndex("Flat"), "prop")
+        with mock.patch.object(PackTreeViewItem, "populate", side_effect=AssertionError("item was populated")):
+            self.assertFalse(self.model.hasChildren(propertyIndex))
+
+    def test_detailedInfoFetch(self):
+        table = DetailedInfoTable(self.submodelIndex("TestSubmodel"))
+        self.assertTrue(table.rowCount())
+        idIndex = self.childByName(QModelIndex(), "identification", table)
+        self.assertTrue(table.hasChildren(idIndex))
+        self.assertEqual(0, table.rowCount(idIndex))
+        self.assertTrue(self.childByName(idIndex, "id", table).isValid())
+
+    def test_iterItemsFetchesAll(self):
+        objs = [index.data(OBJECT_ROLE) for index in self.model.iterItems(self.packIndex)]
+        self.assertIn(next(iter(self.pack.submodels)), objs)
+        self.assertFalse(self.model.canFetchMore(self.packIndex))
+
+
+class TestItemNodes(TestModelBase):
+    def test_slots(self):
+        """Items only keep their slots, no instance dict"""
+        table = DetailedInfoTable(self.submodelIndex("TestSubmodel"))
+        items = [self.model.objByIndex(self.packIndex), table.objByIndex(table.index(0, 0)), StandardItem(None)]
+        self.assertEqual({PackTreeViewItem, DetailedInfoItem, StandardItem}, {type(item) for item in items})
+        for item in items:
+            self.assertFalse(hasattr(item, "__dict__"), type(item))
+
+    def test_typehintComputedOnFirstUse(self):
+        with mock.patch.object(StandardItem, "getTypeHint", return_value=str) as getTypeHint:
+            item = StandardItem("value", "id_short")
+            self.assertEqual(0, getTypeHint.call_count)
+            self.assertIs(str, item.typehint)
+            self.assertIs(str, item.typehint)
+        self.assertEqual(1, getTypeHint.call_count)
+
+    def test_sharedIcons(self):
+        """Icons are derived from the type of the object and shared by the items of the type"""
+        self.pack.add(Submodel(Identifier("urn:other", IdentifierType.IRI), id_short="Other"))
+        self.model.update(self.packIndex)
+        submodels = [self.model.objByIndex(index) for index in self.model.iterItems(self.packIndex)
+                     if isinstance(index.data(OBJECT_ROLE), Submodel)]
+        self.assertGreater(len(submodels), 1)
+        self.assertEqual(1, len({item.icon.cacheKey() for item in submodels}))
+
+
+class TestRoleCache(TestModelBase):
+    def setUp(self) -> None:
+        super(TestRoleCache, self).setUp()
+        self.submodel = self.submodelIndex("TestSubmodel").data(OBJECT_ROLE)
+        self.table = DetailedInfoTable(self.submodelIndex("TestSubmodel"))
+        self.idShortIndex = self.childByName(QModelIndex(), "id_short", self.table).siblingAtColumn(VALUE_COLUMN)
+
+    def test_displayDataCached(self):
+        displayed = self.table.data(self.idShortIndex, Qt.DisplayRole)
+        with mock.patch.object(DetailedInfoItem, "_data", side_effect=AssertionError("data was not cached")):
+            self.assertEqual(displayed, self.table.data(self.idShortIndex, Qt.DisplayRole))
+
+    def test_cacheDroppedOnChange(self):
+        self.table.data(self.idShortIndex, Qt.DisplayRole)
+        self.assertTrue(self.table.setData(self.idShortIndex, "Renamed", Qt.EditRole))
+        self.assertEqual("Renamed", self.table.data(self.idShortIndex, Qt.DisplayRole))
+
+        # changes made past the model are shown after the items are refreshed
+        self.submodel.id_short = "Changed"
+        self.table.refresh()
+        idShortIndex = self.childByName(QModelIndex(), "id_short", self.table).siblingAtColumn(VALUE_COLUMN)
+        self.assertEqual("Changed", self.table.data(idShortIndex, Qt.DisplayRole))
+
+    def test_sharedFonts(self):
+        idIndex = self.childByName(QModelIndex(), "identification", self.table)
+        font = self.table.data(self.idShortIndex.siblingAtColumn(ATTRIBUTE_COLUMN), Qt.FontRole)
+        self.assertIs(font, self.table.data(idIndex, Qt.FontRole))
+
+        # a changed font size needs no cache invalidation
+        pointSize = self.table.currFont.pointSize()
+        self.addCleanup(self.table.currFont.setPointSize, pointSize)
+        self.table.currFont.setPointSize(pointSize + 4)
+        self.assertEqual(pointSize + 4, self.table.data(idIndex, Qt.FontRole).pointSize())
+
+
+class TestElementsModelBase(TestModelBase):
+    """Model with a fetched submodel of a few properties"""
+    def setUp(self) -> None:
+        super(TestElementsModelBase, self).setUp()
+        self.submodel = Submodel(Identifier("urn:elements", IdentifierType.IRI), id_short="Elements")
+        self.elements = [Property(f"prop{i}", str) for i in range(5)]
+        for element in self.elements:
+            self.submodel.submodel_element.add(element)
+        self.pack.add(self.submodel)
+        self.model.update(self.packIndex)
+        self.elementsSubmodel = QPersistentModelIndex(self.submodelIndex("Elements"))
+        self.model.fetchMore(QModelIndex(self.elementsSubmodel))
+
+    def elementIndex(self, row: int) -> QModelIndex:
+        return self.model.index(row, 0, QModelIndex(self.elementsSubmodel))
+
+
+class TestReconcile(TestElementsModelBase):
+    def recordRowChanges(self) -> list:
+        changes = []
+        self.model.rowsInserted.connect(lambda parent, first, last: changes.append(("inserted", first, last)))
+        self.model.rowsRemoved.connect(lambda parent, first, last: changes.append(("removed", first, last)))
+        self.model.modelReset.connect(lambda: changes.append(("reset",)))
+        return changes
+
+    def test_onlyChangedRows(self):
+        """Items of kept objects are kept with their persistent indexes, only changed rows are signalled"""
+        kept = QPersistentModelIndex(self.childByName(QModelIndex(self.elementsSubmodel), "prop3"))
+        changes = self.recordRowChanges()
+        self.submodel.submodel_element.remove(self.elements[1])
+        self.submodel.submodel_element.add(Property("new", str))
+
+        self.model.update(QModelIndex(self.elementsSubmodel))
+        self.assertCountEqual([("removed", 1, 1), ("inserted", 5, 5)], changes)
+        self.assertTrue(kept.isValid())
+        self.assertEqual(2, kept.row())
+        self.assertIs(self.elements[3], kept.data(OBJECT_ROLE))
+        names = [self.model.index(row, 0, QModelIndex(self.elementsSubmodel)).data(NAME_ROLE)
+                 for row in range(self.model.rowCount(QModelIndex(self.elementsSubmodel)))]
+        self.assertEqual(["prop0", "prop2", "prop3", "prop4", "new"], names)
+
+    def test_unchangedUpdate(self):
+        packChildren = self.model.rowCount(self.packIndex)
+        changes = self.recordRowChanges()
+        self.model.update(self.packIndex)
+        self.assertEqual([], changes)
+        self.assertEqual(packChildren, self.model.rowCount(self.packIndex))
+        # fetched descendants stay fetched
+        self.assertFalse(self.model.canFetchMore(QModelIndex(self.elementsSubmodel)))
+
+
+class TestMatch(TestModelBase):
+    def test_matchUnfetchedObject(self):
+        """Items along the parents of a referable are fetched to find its item"""
+        submodel = next(submodel for submodel in self.pack.submodels if submodel.id_short == "TestSubmodel")
+        element = next(iter(submodel.submodel_element))
+        self.assertTrue(self.model.canFetchMore(self.packIndex))
+
+        found = self.model.match(QModelIndex(), OBJECT_ROLE, element, hits=1)
+        self.assertEqual(1, len(found))
+        self.assertIs(element, found[0].data(OBJECT_ROLE))
+        self.assertIs(submodel, found[0].parent().data(OBJECT_ROLE))
+
+    def test_matchNameOfCreatedItems(self):
+        """Names are only matched for created items, a miss doesn't fetch the tree"""
+        self.assertEqual([], self.model.match(QModelIndex(), Qt.DisplayRole, "TestSubmodel", hits=1))
+        self.assertTrue(self.model.canFetchMore(self.packIndex))
+
+        submodelIndex = self.submodelIndex("TestSubmodel")
+        found = self.model.match(QModelIndex(), Qt.DisplayRole, "TestSubmodel", hits=1)
+        self.assertEqual([submodelIndex], found)
+
+    def test_indexRenamedItem(self):
+        submodelIndex = self.submodelIndex("TestSubmodel")
+        table = DetailedInfoTable(submodelIndex)
+        idShortIndex = self.childByName(QModelIndex(), "id_short", table)
+        self.assertTrue(table.setData(idShortIndex, "Renamed", Qt.EditRole))
+        self.model.update(submodelIndex)
+        self.assertEqual([], self.model.match(QModelIndex(), Qt.DisplayRole, "TestSubmodel", hits=1))
+        self.assertEqual([submodelIndex], self.model.match(QModelIndex(), Qt.DisplayRole, "Renamed", hits=1))
+
+
+class TestAddItems(TestElementsModelBase):
+    def test_addItemsInOneStep(self):
+        """Added items are inserted as one row range and removed again with one undo step"""
+        inserted = []
+        self.model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        newElements = [Property(f"new{i}", str) for i in range(3)]
+        numOfUndos = len(self.model.undo)
+
+        self.assertTrue(self.model.setData(QModelIndex(self.elementsSubmodel), newElements, ADD_ITEMS_ROLE))
+        self.assertEqual([(5, 7)], inserted)
+        self.assertEqual(newElements, [self.elementIndex(row).data(OBJECT_ROLE) for row in range(5, 8)])
+        self.assertEqual(numOfUndos + 1, len(self.model.undo))
+
+        self.assertTrue(self.model.setData(QModelIndex(), NOT_GIVEN, UNDO_ROLE))
+        self.assertEqual(5, self.model.rowCount(QModelIndex(self.elementsSubmodel)))
+        self.assertEqual(self.elements, [element for element in self.submodel.submodel_element
+                                         if element in self.elements])
+
+
+class TestUndoSize(TestElementsModelBase):
+    def test_removedSubmodelCounted(self):
+        """Removed identifiables are only kept by the undo entry, so they are counted in its size"""
+        size = self.model.undo.size
+        self.assertTrue(self.model.setData(QModelIndex(self.elementsSubmodel), NOT_GIVEN, CLEAR_ROW_ROLE))
+        self.assertNotIn(self.submodel, self.pack.objStore)
+        self.assertEqual(ENTRY_SIZE + estimateSize(self.submodel), self.model.undo.size - size)
+        self.assertGreater(self.model.undo.size - size, len(self.elements) * estimateSize("prop0"))
+
+
+class TestTransactions(TestElementsModelBase):
+    def setUp(self) -> None:
+        super(TestTransactions, self).setUp()
+        self.changes = []
+        self.model.dataChanged.connect(
+            lambda topLeft, bottomRight, roles: self.changes.append((topLeft.row(), bottomRight.row())))
+
+    def test_mergedSignals(self):
+        """Changes are signalled when the outermost transaction is closed, one signal per range of rows"""
+        with self.model.transaction():
+            with self.model.transaction():
+                for row in (0, 1, 2, 4):
+                    self.model.notifyChanged(self.elementIndex(row))
+            self.assertEqual([], self.changes)
+        self.assertCountEqual([(0, 2), (4, 4)], self.changes)
+
+    def test_cacheDroppedInTransaction(self):
+        index = self.elementIndex(0)
+        self.assertEqual("prop0", index.data(Qt.DisplayRole))
+        with self.model.transaction():
+            self.elements[0].id_short = "renamed"
+            self.model.notifyChanged(index)
+            self.assertEqual("renamed", index.data(Qt.DisplayRole))
+
+    def test_removedRowsSkipped(self):
+        with self.model.transaction():
+            self.model.notifyChanged(self.elementIndex(3))
+            self.model.notifyChanged(self.elementIndex(4))
+            self.assertTrue(self.model.clearRow(4, QModelIndex(self.elementsSubmodel)))
+        self.assertNotIn((4, 4), self.changes)
+        self.assertIn((3, 3), self.changes)
+
+
+class TestDetailedInfoTableCache(TestElementsModelBase):
+    def setUp(self) -> None:
+        super(TestDetailedInfoTableCache, self).setUp()
+        self.tables = DetailedInfoTableCache(maxUnused=1)
+
+    def test_sharedTable(self):
+        table = self.tables.acquire(self.elementsSubmodel)
+        self.assertIs(table, self.tables.acquire(self.elementsSubmodel))
+        self.tables.release(table)
+        self.tables.release(table)
+        self.assertEqual(1, len(self.tables))
+        self.assertIs(table, self.tables.acquire(self.elementsSubmodel))
+
+    def test_leastRecentlyUsedEvicted(self):
+        table = self.tables.acquire(self.elementsSubmodel)
+        otherTable = self.tables.acquire(self.submodelIndex("TestSubmodel"))
+        self.tables.release(table)
+        self.tables.release(otherTable)
+        self.assertEqual(1, len(self.tables))
+        self.assertIsNot(table, self.tables.acquire(self.elementsSubmodel))
+        self.assertIs(otherTable, self.tables.acquire(self.submodelIndex("TestSubmodel")))
+
+    def test_tableOfRemovedItem(self):
+        table = self.tables.acquire(self.elementsSubmodel)
+        self.model.setData(QModelIndex(self.elementsSubmodel), NOT_GIVEN, CLEAR_ROW_ROLE)
+        self.assertFalse(self.elementsSubmodel.isValid())
+        self.tables.release(table)
+        self.assertEqual(0, len(self.tables))
+
+    def test_refreshedAfterChange(self):
+        table = self.tables.acquire(self.elementsSubmodel)
+        self.tables.release(table)
+        with mock.patch.object(table, "refresh") as refresh:
+            self.assertIs(table, self.tables.acquire(self.elementsSubmodel))
+            self.tables.release(table)
+            refresh.assert_not_called()
+            self.pack.setChanged(self.submodel)
+            self.assertIs(table, self.tables.acquire(self.elementsSubmodel))
+            refresh.assert_called_once()
+
+
+class TestPagedModelBase(TestModelBase):
+    """Model with a submodel of more elements than fit on one page of child items"""
+    PAGE_SIZE = 10
+    NUM_OF_ELEMENTS = 35
+
+    def setUp(self) -> None:
+        patcher = mock.patch.object(StandardItem, "PAGE_SIZE", self.PAGE_SIZE)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super(TestPagedModelBase, self).setUp()
+        self.submodel = Submodel(Identifier("urn:paged", IdentifierType.IRI), id_short="Paged")
+        for i in range(self.NUM_OF_ELEMENTS):
+            self.submodel.submodel_element.add(Property(f"prop{i:03d}", str, value=str(i)))
+        self.pack.add(self.submodel)
+        self.model.update(self.packIndex)
+        # elements are shown as children of the submodel
+        self.elementsIndex = self.submodelIndex("Paged")
+
+
+class TestPaging(TestPagedModelBase):
+    def test_totalRowCount(self):
+        """Rows of not fetched pages are counted in the total, their parent is reported until all are fetched"""
+        self.model.fetchMore(self.elementsIndex)
+        self.assertEqual(self.PAGE_SIZE, self.model.rowCount(self.elementsIndex))
+        self.assertEqual(self.NUM_OF_ELEMENTS, self.model.totalRowCount(self.elementsIndex))
+        self.assertIn(self.elementsIndex, self.model.pagedParents())
+
+        self.model.ensureFetched(self.elementsIndex)
+        self.assertEqual(self.NUM_OF_ELEMENTS, self.model.rowCount(self.elementsIndex))
+        self.assertNotIn(self.elementsIndex, self.model.pagedParents())
+
+    def test_addToPagedParent(self):
+        """New items are inserted after the created rows, not created pages stay not created"""
+        self.model.fetchMore(self.elementsIndex)
+        self.assertEqual(self.PAGE_SIZE, self.model.rowCount(self.elementsIndex))
+        newElements = [Property(f"new{i}", str) for i in range(3)]
+
+        indexes = self.model.addItems(newElements, self.elementsIndex)
+
+        self.assertEqual(self.PAGE_SIZE + 3, self.model.rowCount(self.elementsIndex))
+        self.assertEqual(list(range(self.PAGE_SIZE, self.PAGE_SIZE + 3)), [index.row() for index in indexes])
+        self.assertEqual(newElements, [index.data(OBJECT_ROLE) for index in indexes])
+        self.assertTrue(self.model.canFetchMore(self.elementsIndex))
+
+        # the rest is fetched without creating the new items twice
+        self.model.ensureFetched(self.elementsIndex)
+        objs = [self.model.index(row, 0, self.elementsIndex).data(OBJECT_ROLE)
+                for row in range(self.model.rowCount(self.elementsIndex))]
+        self.assertEqual(self.NUM_OF_ELEMENTS + 3, len(objs))
+        self.assertEqual(len(objs), len(set(map(id, objs))))
@@ -0,0 +1,289 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import copy
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+from aas_editor.settings import AppSettings
+from basyx.aas import model
+from basyx.aas.adapter import aasx, json, xml
+from basyx.aas.examples.data import example_aas
+
+from aas_editor import aasx_io
+from aas_editor_test.fingerprint import fingerprint
+from aas_editor.package import Package, ProgressFile, IndexedObjectStore
+from aas_editor.package_cache import PackageCache
+
+AAS_FILES = Path(__file__).parent.joinpath("aas_files")
+TEST_PACKAGE = AAS_FILES.joinpath("TestPackage.aasx")
+SAVE_SETTINGS = {"SUBMODEL_SPLIT_PARTS": True, "INCREMENTAL_SAVE": True, "WRITE_JSON_IN_AASX": False,
+                 "ALL_SUBMODEL_REFS_TO_AAS": False, "ALL_CD_REFS_TO_AAS": False}
+
+
+class FixedSetting:
+    """Setting with a fixed value, which is not written into the settings file"""
+    def __init__(self, value):
+        self._value = value
+
+    def value(self):
+        return self._value
+
+
+def fingerprints(objs) -> dict:
+    return {obj.identification: fingerprint(obj) for obj in objs}
+
+
+def archiveParts(file) -> dict:
+    with zipfile.ZipFile(file) as zipFile:
+        return {name: zipFile.read(name) for name in zipFile.namelist()}
+
+
+class TestPackageBase(TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        for name, value in SAVE_SETTINGS.items():
+            patcher = mock.patch.object(AppSettings, name, FixedSetting(value))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def copyOfTestPackage(self) -> str:
+        file = os.path.join(self.dir, TEST_PACKAGE.name)
+        shutil.copy(TEST_PACKAGE, file)
+        return file
+
+
+class TestIncrementalSave(TestPackageBase):
+    def setUp(self) -> None:
+        super(TestIncrementalSave, self).setUp()
+        # write the package once, so that every submodel has its own part
+        self.file = self.copyOfTestPackage()
+        Package(self.file).write()
+
+    def test_roundTrip(self):
+        pack = Package(self.file)
+        submodels = sorted(pack.submodels, key=lambda submodel: submodel.identification.id)
+        self.assertGreater(len(submodels), 1)
+        changed = submodels[0]
+        changed.description = {"en": "changed"}
+        pack.setChanged(changed)
+        expected = fingerprints(pack.objStore)
+        partsBefore = archiveParts(self.file)
+
+        pack.write()
+
+        reread = Package(self.file)
+        self.assertEqual(expected, fingerprints(reread.objStore))
+        self.assertEqual({"en": "changed"}, reread.objStore.get_identifiable(changed.identification).description)
+        # parts of the unchanged submodels are copied as they are
+        partsAfter = archiveParts(self.file)
+        copied = [name for name, data in partsAfter.items() if partsBefore.get(name) == data]
+        self.assertGreaterEqual(len(copied), len(submodels) - 1)
+        with reread.fileStore.open_file("/TestFile.pdf") as file, \
+                Package(TEST_PACKAGE).fileStore.open_file("/TestFile.pdf") as origFile:
+            self.assertEqual(origFile.read(), file.read())
+
+    def test_unmarkedChangesNotWritten(self):
+        """Parts of submodels which were not set changed are copied as they are"""
+        pack = Package(self.file)
+        submodel = next(iter(pack.submodels))
+        description = submodel.description
+        submodel.description = {"en": "not marked as changed"}
+        pack.write()
+        self.assertEqual(description, Package(self.file).objStore.get_identifiable(submodel.identification).description)
+
+    def test_writeWithoutInternals(self):
+        """Without the expected internals of zipfile and the SDK writer the package is written anew"""
+        pack = Package(self.file)
+        changed = next(iter(pack.submodels))
+        changed.description = {"en": "changed"}
+        pack.setChanged(changed)
+        expected = fingerprints(pack.objStore)
+        with mock.patch("aas_editor.file_container.rawCopySupported", return_value=False):
+            pack.write()
+        self.assertEqual(expected, fingerprints(Package(self.file).objStore))
+
+        with mock.patch.object(aasx_io.IncrementalAASXWriter, "WRITER_INTERNALS", ("_missing",)):
+            pack.write()
+        self.assertEqual(expected, fingerprints(Package(self.file).objStore))
+
+    def test_changeAfterSnapshot(self):
+        pack = Package(self.file)
+        unchanged, changed = sorted(pack.submodels, key=lambda submodel: submodel.identification.id)[:2]
+        # the changed submodel is copied, the unchanged one is copied from its part
+        changed.id_short = "changedBefore"
+        pack.setChanged(changed)
+        with mock.patch("aas_editor.package.copy.deepcopy", side_effect=copy.deepcopy) as deepcopy:
+            snapshot = pack.snapshot()
+        self.assertFalse(deepcopy.called, "objects were copied when the snapshot was taken")
+        for submodel in (unchanged, changed):
+            pack.aboutToChange(submodel)
+            submodel.description = {"en": "after snapshot"}
+            pack.setChanged(submodel)
+        snapshot.write()
+        pack.commitSnapshot(snapshot)
+        snapshot.discard()
+
+        written = Package(self.file).objStore
+        for submodel in (unchanged, changed):
+            self.assertNotEqual({"en": "after snapshot"}, written.get_identifiable(submodel.identification).description)
+        self.assertEqual("changedBefore", written.get_identifiable(changed.identification).id_short)
+        pack.write()
+        written = Package(self.file).objStore
+        for submodel in (unchanged, changed):
+            self.assertEqual({"en": "after snapshot"}, written.get_identifiable(submodel.identification).description)
+
+
+class TestIncrementalReading(TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.mkdtemp()
+        self.objs = example_aas.create_full_example()
+        submodel = model.Submodel(model.Identifier('urn:x\\"{[,', model.IdentifierType.IRI), id_short="Tricky")
+        submodel.description = {"en": 'quote " brace { bracket ] backslash \\ unicode äö€ 𝄞'}
+        self.objs.add(submodel)
+        self.chunkSize = aasx_io.CHUNK_SIZE
+
+    def tearDown(self) -> None:
+        aasx_io.CHUNK_SIZE = self.chunkSize
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _testReading(self, file: str, readFileInto, readFile):
+        """Objects read in chunks must match the objects read at once by the SDK"""
+        with open(file, "rb") as fileIO:
+            expected = fingerprints(readFile(fileIO))
+        self.assertEqual(len(self.objs), len(expected))
+        # small chunks split tokens and multi-byte characters
+        for chunkSize in (3, 7, 64, self.chunkSize):
+            aasx_io.CHUNK_SIZE = chunkSize
+            objStore = model.DictObjectStore()
+            with open(file, "rb") as fileIO:
+                readFileInto(objStore, fileIO)
+            self.assertEqual(expected, fingerprints(objStore), f"chunk size: {chunkSize}")
+
+    def test_readJson(self):
+        file = os.path.join(self.dir, "test.json")
+        with open(file, "w", encoding="utf-8") as fileIO:
+            aasx.write_aas_json_file(fileIO, self.objs, indent=1)
+        self._testReading(file, aasx_io.readAasJsonFileInto, json.read_aas_json_file)
+
+    def test_readXml(self):
+        file = os.path.join(self.dir, "test.xml")
+        with open(file, "wb") as fileIO:
+            aasx.write_aas_xml_file(fileIO, self.objs)
+        self._testReading(file, aasx_io.readAasXmlFileInto, xml.read_aas_xml_file)
+
+    def test_readPackage(self):
+        for file in (AAS_FILES.joinpath("testJson.json"), AAS_FILES.joinpath("1testXml.xml")):
+            progress = []
+            pack = Package(file, progress=lambda bytesRead, size: progress.append((bytesRead, size)))
+            self.assertTrue(len(pack.objStore))
+            self.assertEqual(progress[-1][0], progress[-1][1])
+
+
+class TestPackageCache(TestPackageBase):
+    def setUp(self) -> None:
+        super(TestPackageCache, self).setUp()
+        self.cache = PackageCache(os.path.join(self.dir, "cache"), 10 ** 9)
+        self.file = self.copyOfTestPackage()
+        self.numOfHashes = 0
+        hashFunc = PackageCache.hash
+
+        def countingHash(fileIO):
+            self.numOfHashes += 1
+            return hashFunc(fileIO)
+        patcher = mock.patch.object(PackageCache, "hash", staticmethod(countingHash))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cacheHit(self):
+        pack = Package(self.file, cache=self.cache)
+        with mock.patch.object(aasx_io.PartRecordingAASXReader, "read_into",
+                               side_effect=AssertionError("package was parsed")):
+            cached = Package(self.file, cache=self.cache)
+        self.assertEqual(fingerprints(pack.objStore), fingerprints(cached.objStore))
+        self.assertEqual(list(pack.fileStore), list(cached.fileStore))
+
+    def test_invalidation(self):
+        Package(self.file, cache=self.cache)
+        with zipfile.ZipFile(self.file, "a") as zipFile:
+            zipFile.writestr("/aasx/extra.txt", "changed")
+        with mock.patch.object(Package, "_readFromCache", side_effect=AssertionError("outdated entry was used")):
+            Package(self.file, cache=self.cache)
+
+    def test_hashOnlyIfStatMatches(self):
+        Package(self.file, cache=self.cache)
+        self.numOfHashes = 0
+        Package(self.file, cache=self.cache)
+        self.assertEqual(1, self.numOfHashes)
+
+        # same content with another modification time is parsed, it is hashed while it is read
+        self.numOfHashes = 0
+        os.utime(self.file, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        with mock.patch.object(Package, "_readFromCache", side_effect=AssertionError("outdated entry was used")):
+            Package(self.file, cache=self.cache)
+        self.assertEqual(0, self.numOfHashes)
+        Package(self.file, cache=self.cache)
+        self.assertEqual(1, self.numOfHashes)
+
+    def test_hashWhileReading(self):
+        for file in (self.file, AAS_FILES.joinpath("1testXml.xml")):
+            with open(file, "rb") as fileIO:
+                expected = hashlib.sha256(fileIO.read()).hexdigest()
+            with ProgressFile(file, hashContent=True) as f:
+                f.read(10)
+                f.seek(-10, os.SEEK_END)
+                f.read()
+                self.assertEqual(expected, f.contentHash())
+
+    def test_clear(self):
+        Package(self.file, cache=self.cache)
+        self.assertTrue(list(self.cache.directory.glob("*" + PackageCache.SUFFIX)))
+        self.cache.clear()
+        self.assertFalse(list(self.cache.directory.glob("*" + PackageCache.SUFFIX)))
+
+
+class TestIndexedObjectStore(TestCase):
+    def setUp(self) -> None:
+        self.submodels = [model.Submodel(model.Identifier(f"urn:submodel{i}", model.IdentifierType.IRI))
+                          for i in range(3)]
+        self.description = model.ConceptDescription(model.Identifier("urn:cd", model.IdentifierType.IRI))
+        self.store = IndexedObjectStore(self.submodels + [self.description])
+
+    def test_iterObjects(self):
+        self.assertCountEqual(self.submodels, self.store.iterObjects(model.Submodel))
+        self.assertEqual((self.description,), self.store.iterObjects(model.ConceptDescription))
+        self.assertEqual((), self.store.iterObjects(model.AssetAdministrationShell))
+        self.assertEqual(4, self.store.numOfObjects(model.Identifiable))
+
+    def test_subtypeAddedAfterQuery(self):
+        class SubSubmodel(model.Submodel):
+            pass
+        self.assertEqual(3, self.store.numOfObjects(model.Submodel))
+        subSubmodel = SubSubmodel(model.Identifier("urn:sub", model.IdentifierType.IRI))
+        self.store.add(subSubmodel)
+        self.assertEqual(4, self.store.numOfObjects(model.Submodel))
+        self.assertIn(subSubmodel, self.store.iterObjects(model.Submodel))
+
+    def test_discard(self):
+        self.store.discard(self.submodels[0])
+        self.assertCountEqual(self.submodels[1:], self.store.iterObjects(model.Submodel))
+        # another object with the identification of a stored one doesn't remove the stored one
+        self.store.discard(model.Submodel(self.submodels[1].identification))
+        self.assertCountEqual(self.submodels[1:], self.store.iterObjects(model.Submodel))
+        self.assertIn(self.submodels[1], self.store)
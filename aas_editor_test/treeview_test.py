@@ -0,0 +1,38 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from PyQt5.QtWidgets import QAbstractItemView
+
+from aas_editor.widgets.treeview_basic import BasicTreeView
+from aas_editor_test.models_test import TestPagedModelBase
+
+
+class TestPagedView(TestPagedModelBase):
+    def test_scrollRangeCoversUnfetchedRows(self):
+        """The scroll bar of the view covers all rows, scrolling to the end fetches the rows"""
+        view = BasicTreeView()
+        self.addCleanup(view.deleteLater)
+        view.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+        view.setModelWithProxy(self.model)
+        view.resize(300, 200)
+        index = view.model().mapFromSource(self.elementsIndex)
+        while index.isValid():
+            view.expand(index)
+            index = index.parent()
+        view.doItemsLayout()
+        scrollBar = view.verticalScrollBar()
+        unfetchedRows = self.NUM_OF_ELEMENTS - self.model.rowCount(self.elementsIndex)
+        self.assertGreater(unfetchedRows, 0)
+        self.assertEqual(view.fetchedScrollMaximum + unfetchedRows, scrollBar.maximum())
+
+        scrollBar.setValue(scrollBar.maximum())
+        self.assertEqual(self.NUM_OF_ELEMENTS, self.model.rowCount(self.elementsIndex))
+        view.doItemsLayout()
+        self.assertEqual(view.fetchedScrollMaximum, scrollBar.maximum())
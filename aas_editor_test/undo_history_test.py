@@ -0,0 +1,73 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from pathlib import Path
+from unittest import TestCase
+
+# settings are imported first, they are needed by the imports of the package module
+import aas_editor.settings
+from PyQt5.QtCore import Qt
+from basyx.aas import model
+
+from aas_editor.models.undo_history import SetDataItem, UndoHistory, estimateSize, ENTRY_SIZE
+from aas_editor.package import Package, StoredFile
+
+TEST_PACKAGE = Path(__file__).parent.joinpath("aas_files", "TestPackage.aasx")
+
+
+class TestUndoHistory(TestCase):
+    def test_eviction(self):
+        history = UndoHistory(maxSize=3 * (ENTRY_SIZE + estimateSize("x" * 1000)))
+        for i in range(10):
+            history.append(SetDataItem(index=i, value=str(i) * 1000, role=Qt.EditRole))
+        self.assertEqual(3, len(history))
+        self.assertEqual([7, 8, 9], [entry.index for entry in history])
+        self.assertLessEqual(history.size, history.maxSize)
+
+        # the newest entry is kept, even if it exceeds the maximum size
+        history.append(SetDataItem(index=10, value="x" * 10000, role=Qt.EditRole))
+        self.assertEqual([10], [entry.index for entry in history])
+
+        history.pop()
+        self.assertEqual(0, len(history))
+        self.assertEqual(0, history.size)
+
+    def test_merge(self):
+        history = UndoHistory(mergeInterval=60)
+        history.append(SetDataItem(index=1, value="first", role=Qt.EditRole), merge=True)
+        history.append(SetDataItem(index=1, value="second", role=Qt.EditRole), merge=True)
+        history.append(SetDataItem(index=2, value="third", role=Qt.EditRole), merge=True)
+        # the merged entry keeps the oldest value
+        self.assertEqual(["first", "third"], [entry.value for entry in history])
+
+    def test_estimateStopsAtLiveObjects(self):
+        pack = Package(TEST_PACKAGE)
+        storedFile = StoredFile(name="/TestFile.pdf", fileStore=pack.fileStore)
+        self.assertLess(estimateSize(storedFile, isLive=lambda obj: obj is pack.fileStore), 1000)
+
+        submodel = model.Submodel(model.Identifier("urn:test", model.IdentifierType.IRI), id_short="test")
+        prop = model.Property("prop", str, "x" * 1000)
+        submodel.submodel_element.add(prop)
+        # parent is not followed, the submodel is not estimated with its element
+        self.assertLess(estimateSize(prop), estimateSize(submodel))
+        # objects only referenced by the entry are counted however large they are, e.g. removed submodels
+        self.assertGreater(estimateSize([submodel]), 1000)
+        self.assertLess(estimateSize([submodel], isLive=lambda obj: obj is submodel), 1000)
+
+    def test_estimateClosedPackage(self):
+        """A closed package is only kept by its undo entry, so all of it is counted"""
+        pack = Package(TEST_PACKAGE)
+        self.assertGreater(estimateSize(pack), max(estimateSize(obj) for obj in pack.objStore))
+        self.assertLess(estimateSize(pack, isLive=lambda obj: obj is pack), 1000)
+
+    def test_estimateShared(self):
+        oldProp = model.Property("prop", str, "x" * 1000)
+        newProp = model.Property("prop", str, oldProp.value)
+        self.assertLess(estimateSize(oldProp, shared=newProp), estimateSize(oldProp) - 1000)
@@ -12,14 +12,15 @@ import datetime
 import decimal
 import typing
 from enum import Enum
-from typing import List, Optional, Set, Type, Union, Dict, TypeVar
+from typing import List, Optional, Set, Type, Union, Dict, TypeVar, Iterable
 from unittest import TestCase
 
 import basyx.aas as aas
 import dateutil
 from basyx.aas.model import AASReference, Reference, Submodel, IdentifierType, Referable
 
-from aas_editor.utils.util_type import checkType, issubtype, isoftype
+from aas_editor.utils.util import getParams4init, getReqParams4init, clearParams4initCache
+from aas_editor.utils.util_type import checkType, issubtype, isoftype, getAttrTypeHint, clearTypeCheckCache
 
 
 class TestUtilFuncs(TestCase):
@@ -88,4 +89,40 @@ class TestUtilFuncs(TestCase):
         for typ in test_set:
             typeHint = test_set[typ]
             print("Check", typeHint, type)
-            self.assertTrue(checkType(typ, typeHint))
\ No newline at end of file
+            self.assertTrue(checkType(typ, typeHint))
+
+    def test_typecheck_cache(self):
+        for _ in range(2):
+            self.assertFalse(issubtype(type(None), object))
+            self.assertTrue(issubtype(list, Optional[List[int]]))
+            self.assertFalse(issubtype(list, Set[str]))
+            self.assertTrue(isoftype([1, 2], List[int]))
+            self.assertFalse(isoftype("abc", Type[str]))
+            self.assertTrue(isoftype(str, Type[str]))
+            self.assertTrue(checkType(None, Optional[str]))
+            self.assertFalse(checkType(1, Optional[str]))
+            self.assertFalse(checkType("abc", Iterable))
+        with self.assertRaises(TypeError):
+            issubtype(1, int)
+        clearTypeCheckCache()
+        self.assertTrue(issubtype(list, Optional[List[int]]))
+
+    def test_params4init_cache(self):
+        params, defaults = getParams4init(Submodel)
+        params["id_short"] = int
+        defaults.clear()
+        self.assertIsNot(getParams4init(Submodel)[0]["id_short"], int)
+        self.assertTrue(getParams4init(Submodel)[1])
+
+        reqParams = getReqParams4init(Submodel, rmDefParams=True)
+        self.assertEqual(list(reqParams), ["identification"])
+        self.assertEqual(getReqParams4init(Submodel, rmDefParams=False, attrsToHide=["id_short"]).keys(),
+                         getParams4init(Submodel, withDefaults=False).keys() - {"id_short"})
+
+        self.assertIs(getAttrTypeHint(Submodel, "id_short"), getAttrTypeHint(Submodel, "id_short"))
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                getAttrTypeHint(Submodel, "no_such_attr")
+
+        clearParams4initCache()
+        self.assertEqual(getReqParams4init(Submodel, rmDefParams=True), reqParams)
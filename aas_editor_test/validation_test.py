@@ -0,0 +1,108 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+from pathlib import Path
+from unittest import TestCase, mock
+
+# settings are imported first, they are needed by the imports of the package module
+import aas_editor.settings
+from PyQt5.QtCore import QModelIndex, Qt
+from basyx.aas.model import Submodel
+
+from aas_editor.models import DetailedInfoTable
+from aas_editor.package import Package
+from aas_editor.settings.app_settings import OBJECT_ROLE
+from aas_editor.validation import ValidationReport, validateObject
+from aas_editor.workers import PackageValidator
+from aas_editor_test.models_test import TestModelBase
+
+TEST_PACKAGE = Path(__file__).parent.joinpath("aas_files", "TestPackage.aasx")
+
+
+class TestValidation(TestCase):
+    def setUp(self) -> None:
+        self.pack = Package(TEST_PACKAGE)
+        self.report = ValidationReport(self.pack)
+        self.submodel = next(iter(self.pack.submodels))
+
+    def validate(self) -> list:
+        """Validate the package like TypeValidationDialog and return the results of the validated objects"""
+        validator = PackageValidator(self.report.objectsToValidate(), self.pack.changeId)
+        validated = []
+        validator.signals.validated.connect(validated.append)
+        validator.run()
+        results = validated[0]
+        self.report.update(results)
+        return results
+
+    def test_knownViolation(self):
+        self.assertFalse([violation for violation in validateObject(self.submodel)
+                          if violation.path == ("category",)])
+        self.submodel.category = 5
+        violations = [violation for violation in validateObject(self.submodel) if violation.path == ("category",)]
+        self.assertEqual(1, len(violations))
+        self.assertIs(self.submodel, violations[0].obj)
+        self.assertEqual(5, violations[0].value)
+
+    def test_report(self):
+        self.assertEqual(len(self.pack.objStore), len(self.validate()))
+        numOfViolations = len(self.report)
+        self.assertFalse(self.report.isOutdated())
+        # unchanged objects are not validated again
+        self.assertEqual([], self.validate())
+
+        # only objects marked as changed are validated again
+        self.submodel.category = 5
+        self.assertFalse(self.report.isOutdated())
+        self.pack.setChanged(self.submodel)
+        self.assertTrue(self.report.isOutdated())
+        results = self.validate()
+        self.assertEqual([self.submodel], [result.obj for result in results])
+        self.assertEqual(numOfViolations + 1, len(self.report))
+        self.assertIn(("category",), [violation.path for violation in self.report.violations])
+
+        # violations of removed objects are dropped
+        self.pack.discard(self.submodel)
+        self.validate()
+        self.assertNotIn(self.submodel, [violation.obj for violation in self.report.violations])
+
+    def test_changedDuringValidation(self):
+        """Objects changed during their validation keep their violations and are validated on the next update"""
+        self.submodel.category = 5
+        self.validate()
+        numOfViolations = len(self.report)
+
+        self.pack.setChanged(self.submodel)
+        with mock.patch("aas_editor.workers.validateObject", side_effect=RuntimeError):
+            self.assertEqual([None], [result.violations for result in self.validate()])
+        self.assertEqual(numOfViolations, len(self.report))
+        self.assertTrue(self.report.isOutdated())
+
+        self.submodel.category = None
+        results = self.validate()
+        self.assertEqual([self.submodel], [result.obj for result in results])
+        self.assertEqual(numOfViolations - 1, len(self.report))
+        self.assertFalse(self.report.isOutdated())
+
+
+class TestValidationOfModelEdits(TestModelBase):
+    def test_editMarksObjectToValidate(self):
+        """Edits made in the views are logged for the report, only the edited identifiable is validated again"""
+        report = ValidationReport(self.pack)
+        report.update(PackageValidator.validate(obj) for obj in report.objectsToValidate())
+        self.assertFalse(report.isOutdated())
+
+        submodelIndex = self.submodelIndex("TestSubmodel")
+        table = DetailedInfoTable(submodelIndex)
+        categoryIndex = self.childByName(QModelIndex(), "category", table)
+        self.assertTrue(table.setData(categoryIndex, "PARAMETER", Qt.EditRole))
+
+        self.assertTrue(report.isOutdated())
+        self.assertEqual([submodelIndex.data(OBJECT_ROLE)], report.objectsToValidate())
@@ -0,0 +1,93 @@
+#  Copyright (C) 2021  Igor Garmaev, garmaev@gmx.net
+#
+#  This program is made available under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY;
+#  without even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+#  A copy of the GNU General Public License is available at http://www.gnu.org/licenses/
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase, mock
+
+# settings are imported first, they are needed by the imports of the package module
+import aas_editor.settings
+from aas_editor import aasx_io
+from aas_editor.package_cache import PackageCache
+from aas_editor.settings import AppSettings
+from aas_editor.workers import PackageLoader
+from aas_editor_test.package_test import FixedSetting
+
+TEST_PACKAGE = Path(__file__).parent.joinpath("aas_files", "TestPackage.aasx")
+
+
+class TestPackageLoader(TestCase):
+    def setUp(self) -> None:
+        # packages are cached in a temporary directory instead of the cache location of the user
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        self.cache = PackageCache(self.dir, 10 ** 9)
+        patcher = mock.patch("aas_editor.workers.PACKAGE_CACHE", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def load(self, loader: PackageLoader) -> dict:
+        """Run the loader in the current thread and return the emitted signals: signal name -> list of args"""
+        emitted = {"progress": [], "loaded": [], "failed": [], "cancelled": []}
+        for name, args in emitted.items():
+            getattr(loader.signals, name).connect(lambda *signalArgs, args=args: args.append(signalArgs))
+        loader.run()
+        return emitted
+
+    def test_load(self):
+        loader = PackageLoader(TEST_PACKAGE)
+        emitted = self.load(loader)
+        self.assertEqual([(loader.package,)], emitted["loaded"])
+        self.assertTrue(len(loader.package.objStore))
+        self.assertEqual((100,), emitted["progress"][-1])
+        percents = [args[0] for args in emitted["progress"]]
+        self.assertEqual(sorted(set(percents)), percents)
+        self.assertFalse(emitted["failed"] or emitted["cancelled"])
+
+    def test_cancel(self):
+        loader = PackageLoader(TEST_PACKAGE)
+        loader.cancel()
+        emitted = self.load(loader)
+        self.assertEqual([()], emitted["cancelled"])
+        self.assertIsNone(loader.package)
+        self.assertFalse(emitted["loaded"] or emitted["failed"])
+
+    def test_cancelWhileReading(self):
+        """Reading is stopped on the next read after cancel, also if the reader of the SDK wraps the error"""
+        loader = PackageLoader(TEST_PACKAGE)
+        loader.signals.progress.connect(lambda percent: percent > 0 and loader.cancel())
+        emitted = self.load(loader)
+        self.assertEqual([()], emitted["cancelled"])
+        self.assertIsNone(loader.package)
+        self.assertFalse(emitted["loaded"] or emitted["failed"])
+
+    def test_failed(self):
+        loader = PackageLoader(Path(__file__).with_name("missing.aasx"))
+        emitted = self.load(loader)
+        self.assertEqual(1, len(emitted["failed"]))
+        self.assertIsNone(loader.package)
+        self.assertFalse(emitted["loaded"] or emitted["cancelled"])
+
+    def test_loadFromCache(self):
+        self.load(PackageLoader(TEST_PACKAGE))
+        loader = PackageLoader(TEST_PACKAGE)
+        with mock.patch.object(aasx_io.PartRecordingAASXReader, "read_into",
+                               side_effect=AssertionError("package was parsed")):
+            emitted = self.load(loader)
+        self.assertEqual([(loader.package,)], emitted["loaded"])
+        self.assertTrue(len(loader.package.objStore))
+
+    def test_cacheDisabled(self):
+        with mock.patch.object(AppSettings, "PACKAGE_CACHE_ENABLED", FixedSetting(False)):
+            loader = PackageLoader(TEST_PACKAGE)
+        self.assertIsNone(loader.cache)
+        self.load(loader)
+        self.assertFalse(list(self.cache.directory.glob("*" + PackageCache.SUFFIX)))
@@ -15,6 +15,10 @@ from PyQt5 import QtWidgets
 
 def main():
     app = QtWidgets.QApplication(sys.argv)
+    from aas_editor.settings import ACPLT, APPLICATION_NAME
+    # name the directories of the application, e.g. the cache location
+    app.setOrganizationName(ACPLT)
+    app.setApplicationName(APPLICATION_NAME)
     from aas_editor.editorApp import EditorApp as CurrentApp
     from aas_editor.splash import Splash
     splash = Splash()